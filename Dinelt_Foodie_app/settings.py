@@ -32,17 +32,33 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework', 
     'corsheaders', 
     'foodie_app',  
     'rest_framework_simplejwt', 
 ]
 
+# EmailBackend also serves the admin login; a ModelBackend fallback would hash failed logins twice
 AUTHENTICATION_BACKENDS = [
     'foodie_app.emailBackends.EmailBackend',
-    'django.contrib.auth.backends.ModelBackend',
 ]
 
+# New passwords are hashed with the first hasher. Hashes made by the others, or by the first
+# with other parameters, are upgraded transparently on the next successful login.
+PASSWORD_HASHERS = [
+    hasher.strip() for hasher in os.environ.get(
+        'PASSWORD_HASHERS',
+        'foodie_app.hashers.TunedPBKDF2PasswordHasher,'
+        'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher,'
+        'django.contrib.auth.hashers.Argon2PasswordHasher,'
+        'django.contrib.auth.hashers.BCryptSHA256PasswordHasher,'
+        'django.contrib.auth.hashers.ScryptPasswordHasher',
+    ).split(',')
+]
+# Cost of one login. Defaults to Django 5.1's count; OWASP's minimum for PBKDF2-SHA256 is 600000
+PASSWORD_PBKDF2_ITERATIONS = int(os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 870000))
+
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
@@ -97,6 +113,50 @@ DATABASES = {
     'default': dj_database_url.config(default=LOCAL_DB_URL)
 }
 
+# Caches
+# The menu cache backend is pluggable, e.g. MENU_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+# with MENU_CACHE_LOCATION=redis://... in production. It defaults to a per-process locmem cache, which
+# only works with a single process, so menus are then served uncached and without ETags.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'menu': {
+        'BACKEND': os.environ.get('MENU_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('MENU_CACHE_LOCATION', 'menu'),
+    },
+}
+
+MENU_CACHE_ALIAS = 'menu'
+MENU_CACHE_TIMEOUT = 60 * 60
+# Versions are bumped in the process that saved a change: with a per-process cache every other
+# worker would keep serving, and answering 304 for, the old menus
+MENU_CACHE_ENABLED = not CACHES[MENU_CACHE_ALIAS]['BACKEND'].endswith('LocMemCache')
+
+# Cache alias for the per-user set of restaurants a user owns or manages. Leave unset unless the
+# alias points at a cache shared by all processes, since invalidation only reaches that cache.
+MANAGED_RESTAURANTS_CACHE_ALIAS = os.environ.get('MANAGED_RESTAURANTS_CACHE_ALIAS') or None
+MANAGED_RESTAURANTS_CACHE_TIMEOUT = 5 * 60
+
+# Home feed: entries kept per user, and the follower count above which an author's
+# posts are read from the author at read time instead of being written to every follower
+FEED_MAX_LENGTH = 500
+FEED_FANOUT_FOLLOWER_LIMIT = 5000
+
+# Newest posts embedded in a profile; the rest are paginated under profile/<username>/posts/
+PROFILE_RECENT_POSTS = 5
+
+# Expired stories are purged in batches by `manage.py purge_expired_stories`, or every
+# STORY_PURGE_INTERVAL seconds by an in-process scheduler when the interval is non-zero
+STORY_PURGE_BATCH_SIZE = 500
+STORY_PURGE_INTERVAL = int(os.environ.get('STORY_PURGE_INTERVAL', 0))
+
+# Likes are counted in LIKE_COUNTER_SHARDS rows per post or story and folded into
+# `likes` by `manage.py fold_like_counters`, or every LIKE_COUNTER_FOLD_INTERVAL seconds
+LIKE_COUNTER_SHARDS = 16
+LIKE_COUNTER_FOLD_INTERVAL = int(os.environ.get('LIKE_COUNTER_FOLD_INTERVAL', 0))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -143,10 +203,26 @@ REST_FRAMEWORK = {
        'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'foodie_app.authentication.ClaimsJWTAuthentication',
     ),
 }
 
+# Cache alias for each user's current token claims version, checked on every request instead of
+# loading the user. Invalidation only reaches this cache, so it must be shared by all processes:
+# while it is unset or a per-process LocMemCache, every request loads the user (foodie_app.W001).
+TOKEN_CLAIMS_CACHE_ALIAS = os.environ.get('TOKEN_CLAIMS_CACHE_ALIAS') or None
+TOKEN_CLAIMS_CACHE_TIMEOUT = 60
+
+# Revoked tokens are stored in RevokedToken and checked in memory: each process reloads a Bloom
+# filter of their JTIs every TOKEN_REVOCATION_SYNC_INTERVAL seconds, so a logout reaches other
+# processes within that time. Filter matches are confirmed with a query, remembered in an LRU.
+TOKEN_REVOCATION_SYNC_INTERVAL = int(os.environ.get('TOKEN_REVOCATION_SYNC_INTERVAL', 30))
+TOKEN_REVOCATION_BLOOM_BITS = 1 << 23
+TOKEN_REVOCATION_LRU_SIZE = 10000
+
+# Log a warning when a view using QueryBudgetMixin exceeds its query budget
+QUERY_BUDGET_CHECKS = os.environ.get('QUERY_BUDGET_CHECKS', 'False') == 'True'
+
 DEBUG = True
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 SIMPLE_JWT = {
@@ -154,12 +230,42 @@ SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=1),
 }
-MEDIA_URL = '/media/'
-MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
+# Django only serves MEDIA_ROOT itself with DEBUG on. In production point MEDIA_URL at the web server
+# or CDN that serves it (e.g. https://cdn.example.com/media/), caching content-addressed names
+# (renditions/ and any name containing a SHA-256) for MEDIA_CACHE_MAX_AGE as immutable.
+MEDIA_URL = os.environ.get('MEDIA_URL', '/media/')
+MEDIA_ROOT = os.environ.get('MEDIA_ROOT', os.path.join(BASE_DIR, 'media'))
+
+# Uploads are stored once per SHA-256 and hard-linked under their names; see foodie_app/storage.py
+STORAGES = {
+    'default': {'BACKEND': 'foodie_app.storage.ContentAddressedStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+# Content-addressed media URLs never change, so they are served as immutable for a year
+MEDIA_CACHE_MAX_AGE = 365 * 24 * 60 * 60
+
+# Threads that build image renditions after upload; 0 processes them inline
+IMAGE_WORKERS = int(os.environ.get('IMAGE_WORKERS', 2))
+# Threads that run other background tasks (foodie_app/tasks.py), e.g. welcome emails; 0 runs them inline
+TASK_WORKERS = int(os.environ.get('TASK_WORKERS', 2))
+
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'Dinelt <no-reply@dinelt.com>')
 
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 STATICFILES_DIR = (os.path.join(BASE_DIR, 'static'),)
 django_heroku.settings(locals())
 
+# Under ASGI (opt-in, see the Procfile) each request queries from a thread of its own and persistent
+# connections pile up one per thread, so set DB_CONN_MAX_AGE=0 there
+if 'DB_CONN_MAX_AGE' in os.environ:
+    for database in DATABASES.values():
+        database['CONN_MAX_AGE'] = int(os.environ['DB_CONN_MAX_AGE'])
+# django_heroku adds WhiteNoise's sync-only middleware, which would run every ASGI request in a thread
+MIDDLEWARE = [
+    'foodie_app.middleware.AsyncWhiteNoiseMiddleware' if middleware == 'whitenoise.middleware.WhiteNoiseMiddleware' else middleware
+    for middleware in MIDDLEWARE
+]
+
 AUTH_USER_MODEL = 'foodie_app.User'
 
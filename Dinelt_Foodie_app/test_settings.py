@@ -0,0 +1,28 @@
+"""
+Settings for running the test suite without a PostgreSQL server:
+
+    python manage.py test foodie_app --settings=Dinelt_Foodie_app.test_settings
+
+Set TEST_DATABASE_URL to run it against PostgreSQL instead.
+"""
+import dj_database_url
+from .settings import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': dj_database_url.config(env='TEST_DATABASE_URL', default=f'sqlite:///{BASE_DIR / "test.sqlite3"}'),
+}
+
+# Each test process is the only one, so per-process caches are shared by definition
+CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'menu': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'menu'},
+}
+MENU_CACHE_ENABLED = True
+SILENCED_SYSTEM_CHECKS = ['foodie_app.E001']
+
+# Background tasks and image processing run inline, inside the test
+TASK_WORKERS = 0
+IMAGE_WORKERS = 0
+
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
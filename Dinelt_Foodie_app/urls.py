@@ -1,7 +1,15 @@
+from django.conf import settings
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
+from foodie_app.views.media_views import serve_media
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/', include("foodie_app.urls"))
+    path('api/', include("foodie_app.urls")),
 ]
+
+# Development only: in production the web server or CDN at MEDIA_URL serves uploads
+if settings.DEBUG:
+    urlpatterns += [
+        re_path(rf'^{settings.MEDIA_URL.lstrip("/")}(?P<path>.*)$', serve_media, name='media'),
+    ]
@@ -1,18 +1,29 @@
 from django.contrib import admin
 from django.utils.html import format_html
 from foodie_app.models import User, Profile, Restaurant, Order, OrderItem, Reservation
+from foodie_app.revocation import revoke_user_tokens
+from foodie_app.services.search_service import search_filter, uses_postgres_search
 
 class UserAdmin(admin.ModelAdmin):
     list_display = ['username', 'email', 'full_name', 'phone_number']
     search_fields = ['username', 'email']
     list_filter = ['is_staff', 'is_active']
     ordering = ['username']
+    actions = ['sign_out_everywhere']
+
+    @admin.action(description='Sign out selected users everywhere')
+    def sign_out_everywhere(self, request, queryset):
+        user_ids = list(queryset.values_list('id', flat=True))
+        for user_id in user_ids:
+            revoke_user_tokens(user_id)
+        self.message_user(request, f"Signed out {len(user_ids)} user(s).")
 
 class ProfileAdmin(admin.ModelAdmin):
     list_display = ('get_full_name', 'bio', 'profile_image', 'get_followers_count', 'get_following_count')
     list_editable = ('bio',)
     search_fields = ('user__username', 'bio')
     ordering = ('user',)
+    list_select_related = ('user',)
 
     def get_full_name(self, obj):
         return obj.user.full_name
@@ -25,12 +36,14 @@ class ProfileAdmin(admin.ModelAdmin):
     profile_image.short_description = 'Profile Image'
 
     def get_followers_count(self, obj):
-        return obj.followers.count()
+        return obj.followers_count
     get_followers_count.short_description = 'Followers Count'
+    get_followers_count.admin_order_field = 'followers_count'
 
     def get_following_count(self, obj):
-        return obj.following.count()
+        return obj.following_count
     get_following_count.short_description = 'Following Count'
+    get_following_count.admin_order_field = 'following_count'
 
 class RestaurantAdmin(admin.ModelAdmin):
     list_display = ('name', 'address', 'city', 'country', 'phone_number')
@@ -38,6 +51,12 @@ class RestaurantAdmin(admin.ModelAdmin):
     list_filter = ('city', 'country')
     ordering = ('name',)
 
+    def get_search_results(self, request, queryset, search_term):
+        # Use the indexed full-text/trigram search instead of icontains scans where available
+        if search_term and uses_postgres_search():
+            return queryset.filter(search_filter(Restaurant, search_term)), False
+        return super().get_search_results(request, queryset, search_term)
+
 
 class ReservationAdmin(admin.ModelAdmin):
     list_display = ('user', 'restaurant', 'reservation_date', 'number_of_people')
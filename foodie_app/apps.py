@@ -6,4 +6,7 @@ class FoodieAppConfig(AppConfig):
     name = 'foodie_app'
 
     def ready(self):
+        import foodie_app.checks
         import foodie_app.signals
+        from foodie_app.scheduler import start_scheduler
+        start_scheduler()
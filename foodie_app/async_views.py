@@ -0,0 +1,75 @@
+import inspect
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from rest_framework import generics
+from rest_framework.response import Response
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncAPIViewMixin:
+    """
+    Serves a DRF view as a Django async view. Its handlers are coroutines
+    that read through the async ORM, so under ASGI a request waiting on the
+    database or on a slow client does not hold a worker.
+
+    Authentication and permission checks keep using the sync ORM, in the
+    request's own thread.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            # OPTIONS and 405s come from DRF's sync handlers
+            if inspect.isawaitable(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncListAPIView(AsyncAPIViewMixin, generics.ListAPIView):
+    """``ListAPIView`` reading through the async ORM. Needs an ``AsyncCursorPagination`` or no pagination."""
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator is not None:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            if page is not None:
+                return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer([obj async for obj in queryset], many=True).data)
+
+
+class AsyncListCreateAPIView(AsyncListAPIView, generics.ListCreateAPIView):
+    async def post(self, request, *args, **kwargs):
+        # Writes stay on the sync ORM, in the request's thread
+        return await sync_to_async(self.create)(request, *args, **kwargs)
+
+
+class AsyncRetrieveAPIView(AsyncAPIViewMixin, generics.RetrieveAPIView):
+    async def aget_object(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            obj = await queryset.aget(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        except (queryset.model.DoesNotExist, ValueError, TypeError):
+            raise Http404
+        self.check_object_permissions(self.request, obj)
+        return obj
+
+    async def get(self, request, *args, **kwargs):
+        return Response(self.get_serializer(await self.aget_object()).data)
@@ -0,0 +1,111 @@
+import hashlib
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import router, transaction
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from foodie_app.models import User
+from foodie_app.permissions import load_managed_restaurant_ids
+from foodie_app.revocation import is_revoked
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Columns a claims user starts with; every other column is loaded on first access
+CLAIMED_FIELDS = ('id', 'is_active', 'is_business_owner')
+
+
+def _claims_cache():
+    # Claims are only trusted while invalidations reach every process, so never with a per-process cache
+    alias = getattr(settings, 'TOKEN_CLAIMS_CACHE_ALIAS', None)
+    if not alias or isinstance(caches[alias], LocMemCache):
+        return None
+    return caches[alias]
+
+
+def _cache_key(user_id):
+    return f'token-claims:{user_id}'
+
+
+def claims_version(password, is_active, is_business_owner, restaurant_ids):
+    """
+    Fingerprint of the state a token's claims describe. It changes with the
+    password, the active flag, the business owner flag or the managed
+    restaurants, and a token whose version no longer matches is not trusted.
+    """
+    state = f"{password}|{is_active}|{is_business_owner}|{','.join(map(str, sorted(restaurant_ids)))}"
+    return hashlib.sha256(state.encode()).hexdigest()[:16]
+
+
+def token_claims(user):
+    """Claims ``MyTokenObtainPairSerializer`` embeds in the tokens it issues to ``user``."""
+    restaurant_ids = load_managed_restaurant_ids(user.pk)
+    return {
+        'is_business_owner': user.is_business_owner,
+        'managed_restaurants': sorted(restaurant_ids),
+        'claims_version': claims_version(user.password, user.is_active, user.is_business_owner, restaurant_ids),
+    }
+
+
+def current_claims_version(user_id):
+    """
+    ``claims_version`` of ``user_id`` as it is now, or ``''`` for missing and
+    inactive users. Cached for ``TOKEN_CLAIMS_CACHE_TIMEOUT`` seconds and
+    invalidated by ``invalidate_token_claims``.
+    """
+    cache = _claims_cache()
+    version = cache.get(_cache_key(user_id))
+    if version is None:
+        user = User.objects.filter(pk=user_id, is_active=True).values('password', 'is_business_owner').first()
+        version = '' if user is None else claims_version(
+            user['password'], True, user['is_business_owner'], load_managed_restaurant_ids(user_id)
+        )
+        cache.set(_cache_key(user_id), version, timeout=settings.TOKEN_CLAIMS_CACHE_TIMEOUT)
+    return version
+
+
+def invalidate_token_claims(*user_ids):
+    cache = _claims_cache()
+    if cache is None:
+        return
+    # After commit, so a concurrent request cannot re-cache the old version
+    transaction.on_commit(lambda: cache.delete_many([_cache_key(user_id) for user_id in user_ids]))
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    ``JWTAuthentication`` that trusts the claims of tokens whose
+    ``claims_version`` is current instead of loading the user row.
+
+    ``request.user`` is then a ``User`` holding only ``CLAIMED_FIELDS``; its
+    other columns are loaded, in one query, the first time a view touches one.
+    Tokens without claims or with an outdated version fall back to loading
+    the user from the database, as do all tokens unless
+    ``TOKEN_CLAIMS_CACHE_ALIAS`` names a shared cache. Revoked tokens are
+    rejected.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if is_revoked(validated_token):
+            raise InvalidToken("Token has been revoked")
+        return validated_token
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        version = validated_token.get('claims_version')
+        if not version or _claims_cache() is None or version != current_claims_version(user_id):
+            return super().get_user(validated_token)
+
+        user = User.from_db(
+            router.db_for_read(User), CLAIMED_FIELDS, (user_id, True, validated_token['is_business_owner'])
+        )
+        user.from_token_claims = True
+        user.claimed_restaurant_ids = frozenset(validated_token['managed_restaurants'])
+        return user
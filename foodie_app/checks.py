@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+
+@register(Tags.caches, deploy=False)
+def check_menu_cache_is_shared(app_configs, **kwargs):
+    # Menu versions are bumped in the process that saved the change; a per-process cache leaves
+    # every other process serving, and answering 304 for, the old version. DEBUG makes no difference:
+    # the dev server is one process, but gunicorn runs several whatever DEBUG says
+    backend = settings.CACHES.get(settings.MENU_CACHE_ALIAS, {}).get('BACKEND', '')
+    if not settings.MENU_CACHE_ENABLED or not backend.endswith('LocMemCache'):
+        return []
+    return [Error(
+        f"MENU_CACHE_ENABLED is on but the menu cache '{settings.MENU_CACHE_ALIAS}' uses a per-process LocMemCache.",
+        hint='Set MENU_CACHE_BACKEND and MENU_CACHE_LOCATION to a cache shared by all processes, e.g. Redis.',
+        id='foodie_app.E001',
+    )]
+
+
+@register(Tags.caches)
+def check_token_claims_cache_is_shared(app_configs, **kwargs):
+    alias = getattr(settings, 'TOKEN_CLAIMS_CACHE_ALIAS', None)
+    if not alias or not settings.CACHES.get(alias, {}).get('BACKEND', '').endswith('LocMemCache'):
+        return []
+    return [Warning(
+        f"TOKEN_CLAIMS_CACHE_ALIAS '{alias}' is a per-process LocMemCache, so token claims are not trusted.",
+        hint='Point it at a cache shared by all processes, or unset it.',
+        id='foodie_app.W001',
+    )]
@@ -0,0 +1,17 @@
+from django.db import migrations
+
+
+class PostgresOnlyRunSQL(migrations.RunSQL):
+    """
+    ``RunSQL`` that only runs on PostgreSQL. Used for indexes and constraints
+    that other backends cannot express, so migrations still apply on the
+    SQLite databases used for local development and tests.
+    """
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
@@ -6,14 +6,26 @@ import logging
 logger = logging.getLogger(__name__)
 
 class EmailBackend(ModelBackend):
-    def authenticate(self, request, email=None, password=None, **kwargs):
+    """
+    Authenticates by email, ignoring case, with one indexed query and exactly
+    one password hash per attempt: unknown emails hash the password once too,
+    so they take as long as wrong passwords. Also accepts ``username=``, as
+    the admin login passes the email under that name.
+    """
+
+    def authenticate(self, request, email=None, password=None, username=None, **kwargs):
+        email = email or username
+        if email is None or password is None:
+            return None
         logger.debug(f"Authenticating user with email: {email}")
         try:
-            user = User.objects.get(email=email)
+            user = User.objects.get_by_natural_key(email)
         except User.DoesNotExist:
             logger.debug(f"No user found with email: {email}")
+            User().set_password(password)
             return None
 
+        # Rehashes and saves the password when the hasher policy changed
         if user.check_password(password):
             return user
         logger.debug(f"Password mismatch for user: {email}")
@@ -0,0 +1,153 @@
+import hashlib
+import io
+import os
+from django.core.files.base import ContentFile
+from django.db import models
+from PIL import Image, ImageOps
+from foodie_app.models import Profile, User
+from foodie_app.tasks import enqueue
+import logging
+
+logger = logging.getLogger(__name__)
+
+# name -> (longest side in pixels, Pillow format, file extension)
+RENDITIONS = {
+    'thumbnail': (200, 'JPEG', 'jpg'),
+    'medium': (800, 'JPEG', 'jpg'),
+    # Written last: once it exists, every rendition of the image is ready
+    'webp': (800, 'WEBP', 'webp'),
+}
+
+def image_fields(instance):
+    return [field for field in instance._meta.concrete_fields if isinstance(field, models.ImageField)]
+
+
+def processed_field_name(field):
+    # BooleanField next to each image field, set once the image's renditions are written
+    return f'{field.name}_processed'
+
+
+def rendition_name(name, rendition):
+    stem, _ = os.path.splitext(name)
+    return f'renditions/{stem}/{rendition}.{RENDITIONS[rendition][2]}'
+
+
+def content_name(name, data):
+    """``name`` with its file name replaced by the SHA-256 of ``data``."""
+    directory, base = os.path.split(name)
+    _, ext = os.path.splitext(base)
+    return os.path.join(directory, f'{hashlib.sha256(data).hexdigest()}{ext.lower()}').replace('\\', '/')
+
+
+def dedupe_upload(field_file):
+    """
+    Name a new upload after the SHA-256 of its content, e.g.
+    ``post_images/<sha256>.jpg``. If that file is already stored the upload is
+    pointed at it instead of being written again.
+    """
+    upload = field_file.file
+    digest = hashlib.sha256()
+    for chunk in upload.chunks():
+        digest.update(chunk)
+    upload.seek(0)
+
+    field = field_file.field
+    _, ext = os.path.splitext(field_file.name)
+    name = field.generate_filename(field_file.instance, f'{digest.hexdigest()}{ext.lower()}')
+    if field_file.storage.exists(name):
+        field_file.name = name
+        field_file._committed = True
+    else:
+        field_file.name = os.path.basename(name)
+
+
+def _save_image(image, fmt):
+    buffer = io.BytesIO()
+    if fmt == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    # Saving without exif= drops EXIF, including GPS coordinates
+    image.save(buffer, format=fmt, quality=85, optimize=True)
+    return ContentFile(buffer.getvalue())
+
+
+def process_image(storage, name):
+    """
+    Strip EXIF from the stored original ``name`` (applying its orientation
+    first) and write every rendition in ``RENDITIONS``.
+
+    Stored names are content hashes, so a stripped original is saved under a
+    new name. Returns the name the original ends up under.
+    """
+    with storage.open(name, 'rb') as source:
+        original = Image.open(source)
+        fmt = original.format
+        has_exif = bool(original.getexif())
+        if not has_exif and storage.exists(rendition_name(name, 'webp')):
+            return name
+        image = ImageOps.exif_transpose(original)
+        image.load()
+
+    if has_exif and fmt in ('JPEG', 'PNG', 'WEBP'):
+        stripped = _save_image(image, fmt)
+        name = storage.save(content_name(name, stripped.read()), stripped)
+
+    for rendition, (size, rendition_fmt, _) in RENDITIONS.items():
+        resized = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        storage.save(rendition_name(name, rendition), _save_image(resized, rendition_fmt))
+    logger.info(f"Processed image {name}")
+    return name
+
+
+def process_stored_image(model, field_name, name):
+    """
+    ``process_image`` for the file ``model.field_name`` points at, moving the
+    rows that use ``name`` to the processed name and marking them processed.
+    Returns the processed name.
+
+    Deduplicated uploads share names within a field, so every row of the
+    field that uses ``name`` is updated. The only names shared across models
+    are a user's picture and the profile created with it.
+    """
+    processed = process_image(model._meta.get_field(field_name).storage, name)
+    # The old name is left for gc_media, in case a concurrent upload still points at it
+    for other in (User, Profile) if model in (User, Profile) else (model,):
+        for field in image_fields(other):
+            other._default_manager.filter(**{f'{field.name}__in': {name, processed}}).update(
+                **{field.name: processed, processed_field_name(field): True}
+            )
+    return processed
+
+
+def _run(model, field_name, name, then=None):
+    try:
+        process_stored_image(model, field_name, name)
+        if then is not None:
+            then()
+    except Exception:
+        logger.exception(f"Could not process image {name}")
+
+
+def schedule_processing(model, field_name, name, then=None):
+    """
+    Process the ``name`` stored in ``model.field_name`` on the ``images`` task
+    queue once the current transaction commits, then call ``then()``. With
+    ``IMAGE_WORKERS = 0`` it runs inline instead.
+    """
+    enqueue(_run, model, field_name, name, then, queue='images')
+
+
+def rendition_urls(field_file):
+    """
+    URLs of ``field_file`` and its renditions. Renditions are ``None`` until
+    the worker pool has written them and marked the row processed; nothing
+    is read from storage.
+    """
+    if not field_file:
+        return None
+    storage = field_file.storage
+    ready = getattr(field_file.instance, processed_field_name(field_file.field))
+    urls = {'original': field_file.url}
+    for rendition in RENDITIONS:
+        urls[rendition] = storage.url(rendition_name(field_file.name, rendition)) if ready else None
+    return urls
@@ -0,0 +1,64 @@
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
+from foodie_app.models import User
+from foodie_app.serializer import MyTokenObtainPairSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Time token logins, concurrently, against the cost of one password hash, and count their queries. "
+        "Creates a throwaway user and deletes it afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--logins', type=int, default=50)
+        parser.add_argument('--concurrency', type=int, default=4)
+
+    def _login(self, email, password):
+        try:
+            started = time.perf_counter()
+            valid = MyTokenObtainPairSerializer(data={'email': email, 'password': password}).is_valid()
+            return valid, time.perf_counter() - started
+        finally:
+            connections.close_all()
+
+    def _time_logins(self, email, password, logins, concurrency):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: self._login(email, password), range(logins)))
+        timings = sorted(elapsed for _, elapsed in results)
+        p99 = timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+        return sum(valid for valid, _ in results), statistics.median(timings), p99
+
+    def handle(self, *args, **options):
+        logins, concurrency = options['logins'], options['concurrency']
+        tag = uuid.uuid4().hex[:8]
+        email, password = f'Bench-{tag}@Example.com', uuid.uuid4().hex
+        user = User.objects.create_user(username=f'bench-{tag}', email=email, password=password)
+
+        try:
+            started = time.perf_counter()
+            get_hasher().encode(password, get_hasher().salt())
+            hash_time = time.perf_counter() - started
+            self.stdout.write(f"One password hash ({get_hasher().algorithm}): {hash_time * 1000:.1f}ms")
+
+            for label, login_email, login_password in (
+                ('valid', email.lower(), password),
+                ('wrong password', email, 'wrong'),
+                ('unknown email', f'nobody-{tag}@example.com', password),
+            ):
+                with CaptureQueriesContext(connection) as queries:
+                    MyTokenObtainPairSerializer(data={'email': login_email, 'password': login_password}).is_valid()
+                accepted, median, p99 = self._time_logins(login_email, login_password, logins, concurrency)
+                self.stdout.write(
+                    f"{label}: {accepted}/{logins} accepted, {len(queries)} quer{'y' if len(queries) == 1 else 'ies'}, "
+                    f"median {median * 1000:.1f}ms, p99 {p99 * 1000:.1f}ms "
+                    f"({median / hash_time:.1f}x one hash) at concurrency {concurrency}"
+                )
+        finally:
+            user.delete()
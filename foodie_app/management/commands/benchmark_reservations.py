@@ -0,0 +1,81 @@
+import threading
+import time
+import uuid
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from foodie_app.models import Reservation, ReservationCategory, ReservationSlot, Restaurant, User
+from foodie_app.services.reservation_service import day_slots, reserve
+
+
+class Command(BaseCommand):
+    help = (
+        "Race concurrent booking attempts for one slot and check it is never overbooked. "
+        "Creates a throwaway restaurant and users, and deletes them afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--attempts', type=int, default=50)
+        parser.add_argument('--capacity', type=int, default=10)
+        parser.add_argument('--party-size', type=int, default=1)
+
+    def handle(self, *args, **options):
+        attempts, capacity, party_size = options['attempts'], options['capacity'], options['party_size']
+        tag = uuid.uuid4().hex[:8]
+        owner = User.objects.create_user(username=f'bench-{tag}', email=f'bench-{tag}@example.com', password=None)
+        users = [
+            User.objects.create_user(username=f'bench-{tag}-{i}', email=f'bench-{tag}-{i}@example.com', password=None)
+            for i in range(attempts)
+        ]
+        restaurant = Restaurant.objects.create(
+            owner=owner, name=f'Benchmark {tag}', address='-', city='-', country='-', phone_number='-'
+        )
+        category = ReservationCategory.objects.create(
+            name='Benchmark', reservation_type='meeting_table', restaurant=restaurant, capacity=capacity
+        )
+        starts_at = day_slots(category, (timezone.localtime() + timedelta(days=1)).date())[0]
+
+        outcomes = {'booked': 0, 'rejected': 0, 'errors': 0}
+        lock = threading.Lock()
+        barrier = threading.Barrier(attempts)
+
+        def attempt(user):
+            barrier.wait()
+            try:
+                reserve(user, restaurant, 'meeting_table', starts_at, party_size)
+                outcome = 'booked'
+            except ValidationError:
+                outcome = 'rejected'
+            except Exception as e:
+                self.stderr.write(f"{type(e).__name__}: {e}")
+                outcome = 'errors'
+            finally:
+                connections.close_all()
+            with lock:
+                outcomes[outcome] += 1
+
+        try:
+            threads = [threading.Thread(target=attempt, args=(user,)) for user in users]
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+            slot = ReservationSlot.objects.get(category=category, starts_at=starts_at)
+            seats = sum(Reservation.objects.filter(slot=slot).values_list('number_of_people', flat=True))
+            self.stdout.write(
+                f"{attempts} attempts in {elapsed:.2f}s: {outcomes['booked']} booked, "
+                f"{outcomes['rejected']} rejected as full, {outcomes['errors']} errors. "
+                f"Slot holds {slot.booked}/{slot.capacity} seats, reservations hold {seats}."
+            )
+            if slot.booked > slot.capacity or seats != slot.booked:
+                raise CommandError("Slot was overbooked.")
+            self.stdout.write(self.style.SUCCESS("No overbooking."))
+        finally:
+            Reservation.objects.filter(restaurant=restaurant).delete()
+            restaurant.delete()
+            User.objects.filter(pk__in=[owner.pk] + [user.pk for user in users]).delete()
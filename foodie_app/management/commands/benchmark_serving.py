@@ -0,0 +1,128 @@
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# mode -> gunicorn arguments serving it
+MODES = {
+    'wsgi': ['Dinelt_Foodie_app.wsgi:application'],
+    'asgi': ['Dinelt_Foodie_app.asgi:application', '--worker-class', 'uvicorn_worker.UvicornWorker'],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Serve the app under gunicorn with sync WSGI workers and with uvicorn ASGI workers, and compare how "
+        "each handles slow-network clients. Clients arrive at a steady rate, take --upload-seconds to send their "
+        "request and read the response at --download-kbps, like phones on a poor connection. Uses the "
+        "configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/api/food/?page_size=200')
+        parser.add_argument('--clients', type=int, default=200)
+        parser.add_argument('--rate', type=float, default=50, help="New clients per second.")
+        parser.add_argument('--upload-seconds', type=float, default=0.2)
+        parser.add_argument('--download-kbps', type=float, default=64, help="Kilobytes per second each client reads.")
+        parser.add_argument('--workers', type=int, default=2)
+        parser.add_argument('--timeout', type=float, default=60, help="Seconds a client waits before giving up.")
+        parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+
+    def _free_port(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            return sock.getsockname()[1]
+
+    def _serve(self, mode, port, workers):
+        server = subprocess.Popen(
+            [
+                sys.executable, '-m', 'gunicorn', *MODES[mode],
+                '--bind', f'127.0.0.1:{port}', '--workers', str(workers), '--log-level', 'warning',
+            ],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'Dinelt_Foodie_app.settings')},
+        )
+        deadline = time.monotonic() + 30
+        while time.monotonic() < deadline:
+            if server.poll() is not None:
+                raise CommandError(f"gunicorn ({mode}) exited with status {server.returncode}")
+            try:
+                socket.create_connection(('127.0.0.1', port), timeout=1).close()
+                return server
+            except OSError:
+                time.sleep(0.2)
+        server.terminate()
+        raise CommandError(f"gunicorn ({mode}) did not start listening on port {port}")
+
+    async def _client(self, port, path, upload_seconds, download_kbps):
+        started = time.perf_counter()
+        sock = socket.socket()
+        # A small receive window, so the server cannot hand the whole response to the kernel at once
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.setblocking(False)
+        try:
+            await asyncio.get_running_loop().sock_connect(sock, ('127.0.0.1', port))
+        except OSError:
+            sock.close()
+            raise
+        reader, writer = await asyncio.open_connection(sock=sock, limit=1024)
+        try:
+            request = f'GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n'.encode()
+            # Trickle the request out in pieces, as a client on a slow link does
+            pieces = 5
+            size = -(-len(request) // pieces)
+            for start in range(0, len(request), size):
+                writer.write(request[start:start + size])
+                await writer.drain()
+                await asyncio.sleep(upload_seconds / pieces)
+            status_line = await reader.readline()
+            while chunk := await reader.read(1024):
+                await asyncio.sleep(len(chunk) / (download_kbps * 1024))
+        finally:
+            writer.close()
+        return status_line.split()[1:2] == [b'200'], time.perf_counter() - started
+
+    async def _load(self, port, options):
+        async def arrive(i):
+            await asyncio.sleep(i / options['rate'])
+            try:
+                return await asyncio.wait_for(
+                    self._client(port, options['path'], options['upload_seconds'], options['download_kbps']),
+                    options['timeout'],
+                )
+            except (asyncio.TimeoutError, OSError):
+                return False, None
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(arrive(i) for i in range(options['clients'])))
+        return results, time.perf_counter() - started
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{options['clients']} clients at {options['rate']:g}/s sending GET {options['path']} over "
+            f"{options['upload_seconds']:g}s and reading at {options['download_kbps']:g}KB/s, "
+            f"against {options['workers']} gunicorn worker(s)"
+        )
+        for mode in options['modes']:
+            port = self._free_port()
+            server = self._serve(mode, port, options['workers'])
+            try:
+                results, elapsed = asyncio.run(self._load(port, options))
+            finally:
+                server.terminate()
+                server.wait()
+
+            ok = sorted(latency for success, latency in results if success)
+            if not ok:
+                self.stdout.write(f"{mode}: 0/{len(results)} succeeded")
+                continue
+            p99 = ok[min(len(ok) - 1, int(len(ok) * 0.99))]
+            self.stdout.write(
+                f"{mode}: {len(ok)}/{len(results)} succeeded in {elapsed:.1f}s ({len(ok) / elapsed:.1f} req/s), "
+                f"median {statistics.median(ok) * 1000:.0f}ms, p99 {p99 * 1000:.0f}ms"
+            )
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from foodie_app.services.like_service import fold_like_counters
+
+
+class Command(BaseCommand):
+    help = "Fold pending like counter shards into Post.likes and Story.likes."
+
+    def handle(self, *args, **options):
+        updated = fold_like_counters()
+        self.stdout.write(self.style.SUCCESS(f"Folded like counters of {updated} post(s) and story(ies)."))
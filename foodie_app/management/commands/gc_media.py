@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from foodie_app.services.media_service import adopt_legacy_files, collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Delete unreferenced media files and blobs; optionally move legacy files to content-addressed names first."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--adopt-legacy', action='store_true',
+                            help="Re-store files with random-suffix names under their SHA-256 first.")
+        parser.add_argument('--min-age', type=int, default=24,
+                            help="Keep files younger than this many hours (default 24).")
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        if options['adopt_legacy']:
+            moved = adopt_legacy_files(dry_run=options['dry_run'])
+            self.stdout.write(f"Moved {moved} legacy file name(s) to content-addressed names.")
+
+        files, blobs, freed = collect_garbage(min_age=options['min_age'] * 60 * 60, dry_run=options['dry_run'])
+        prefix = "Would delete" if options['dry_run'] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {files} unreferenced file(s) and {blobs} blob(s), {freed / (1024 * 1024):.1f} MiB."
+        ))
@@ -0,0 +1,27 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from foodie_app.images import image_fields, process_stored_image
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Strip EXIF from every stored image and build its missing thumbnail/medium/WebP renditions."
+
+    def handle(self, *args, **options):
+        processed = failed = 0
+        for model in apps.get_app_config('foodie_app').get_models():
+            for field in image_fields(model):
+                names = list(
+                    model.objects.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+                    .values_list(field.name, flat=True).distinct()
+                )
+                for name in names:
+                    try:
+                        process_stored_image(model, field.name, name)
+                        processed += 1
+                    except Exception as e:
+                        logger.warning(f"Could not process image {name}: {e}")
+                        failed += 1
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} image(s), {failed} failed."))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from foodie_app.revocation import prune_revoked_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete revoked token rows whose tokens have expired."
+
+    def handle(self, *args, **options):
+        deleted = prune_revoked_tokens()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} revoked token row(s)."))
@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from foodie_app.services.story_service import purge_expired_stories
+
+
+class Command(BaseCommand):
+    help = "Delete expired stories, their profile/comment links and their image files in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.STORY_PURGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_stories(options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Purged {deleted} expired stor{'y' if deleted == 1 else 'ies'}."))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from foodie_app.services.follow_service import rebuild_follow_counts
+
+
+class Command(BaseCommand):
+    help = "Recompute Profile.followers_count and following_count from the follow edges."
+
+    def handle(self, *args, **options):
+        updated = rebuild_follow_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt follow counts for {updated} profile(s)."))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from foodie_app.menu_cache import ALL_MENUS, bump_versions, restaurant_scope
+from foodie_app.models import Restaurant
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored rating count, sum, average and histogram of every restaurant from its reviews."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            restaurants = Restaurant.objects.rebuild_ratings()
+            bump_versions(ALL_MENUS, *(restaurant_scope(pk) for pk in Restaurant.objects.values_list('pk', flat=True)))
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt ratings for {restaurants} restaurant(s)."))
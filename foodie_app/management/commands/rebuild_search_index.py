@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from foodie_app.models import Food, Restaurant
+from foodie_app.services.search_service import update_search_vectors, uses_postgres_search
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored search vectors of all restaurants and foods."
+
+    def handle(self, *args, **options):
+        if not uses_postgres_search():
+            self.stdout.write("Full-text search needs PostgreSQL; nothing to rebuild.")
+            return
+        restaurants = update_search_vectors(Restaurant)
+        foods = update_search_vectors(Food)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt search vectors for {restaurants} restaurant(s) and {foods} food(s)."))
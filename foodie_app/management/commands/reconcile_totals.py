@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from foodie_app.services.cart_service import reconcile_cart_totals
+from foodie_app.services.order_service import reconcile_order_totals
+
+
+class Command(BaseCommand):
+    help = "Rebuild the stored subtotal/item_count of carts and orders from their items."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reprice',
+            action='store_true',
+            help="Refresh the unit price stored on cart items from the current food price first.",
+        )
+
+    def handle(self, *args, **options):
+        carts = reconcile_cart_totals(reprice=options['reprice'])
+        orders = reconcile_order_totals()
+        self.stdout.write(self.style.SUCCESS(f"Reconciled {carts} cart(s) and {orders} order(s)."))
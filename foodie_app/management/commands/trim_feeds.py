@@ -0,0 +1,14 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from foodie_app.services.feed_service import trim_feeds
+
+
+class Command(BaseCommand):
+    help = "Trim every home feed to the newest FEED_MAX_LENGTH entries."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--max-length', type=int, default=settings.FEED_MAX_LENGTH)
+
+    def handle(self, *args, **options):
+        deleted = trim_feeds(options['max_length'])
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} feed entr{'y' if deleted == 1 else 'ies'}."))
@@ -0,0 +1,160 @@
+import hashlib
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Scope for every read that spans all restaurants (e.g. the unfiltered catalog)
+ALL_MENUS = 'menu:all'
+
+
+def menu_cache():
+    return caches[settings.MENU_CACHE_ALIAS]
+
+
+def menu_scope(restaurant_id):
+    return f'menu:{restaurant_id}'
+
+
+def food_scope(food_id):
+    return f'food:{food_id}'
+
+
+def restaurant_scope(restaurant_id):
+    return f'restaurant:{restaurant_id}'
+
+
+def get_version(scope):
+    """
+    Current version of ``scope``: the time of its last change in milliseconds.
+    A scope that is not in the cache starts at the current time, so a version
+    can never repeat after the cache is flushed.
+    """
+    cache = menu_cache()
+    key = f'version:{scope}'
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, int(time.time() * 1000), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+async def aget_version(scope):
+    cache = menu_cache()
+    key = f'version:{scope}'
+    version = await cache.aget(key)
+    if version is None:
+        await cache.aadd(key, int(time.time() * 1000), timeout=None)
+        version = await cache.aget(key)
+    return version
+
+
+def bump_versions(*scopes):
+    """
+    Move every scope to a new version once the current transaction commits,
+    so readers never cache pre-commit data under the new version.
+    """
+    if not settings.MENU_CACHE_ENABLED:
+        return
+
+    def bump():
+        cache = menu_cache()
+        now = int(time.time() * 1000)
+        for scope in set(scopes):
+            key = f'version:{scope}'
+            cache.set(key, max(now, (cache.get(key) or 0) + 1), timeout=None)
+        logger.debug(f"Bumped menu cache versions: {', '.join(sorted(set(scopes)))}")
+
+    transaction.on_commit(bump)
+
+
+def bump_food_versions(food, *restaurant_ids):
+    # A food appears in its own detail, its restaurant's menu and the full catalog
+    restaurant_ids = set(restaurant_ids) | {food.restaurant_id}
+    bump_versions(food_scope(food.pk), ALL_MENUS, *(menu_scope(restaurant_id) for restaurant_id in restaurant_ids))
+
+
+class MenuCacheMixin:
+    """
+    Read-through cache for GET views whose output only changes when the
+    cache scope returned by ``get_cache_scope()`` is bumped.
+
+    Responses are stored under the scope's current version and carry an
+    ``ETag`` derived from it. ``If-None-Match`` is answered with 304 without
+    touching the database. There is no ``Last-Modified``: versions change
+    several times a second, which whole-second dates cannot tell apart.
+    Without ``MENU_CACHE_ENABLED`` the view is served as is.
+    """
+
+    def get_cache_scope(self):
+        raise NotImplementedError
+
+    def check_not_modified(self, request, scope, version):
+        """
+        ``(headers, response)``: the validators for ``version`` of ``scope``, and
+        a 304 response when the request's conditional headers match them.
+        """
+        etag = f'"{scope}:{version}"'
+        headers = {'ETag': etag}
+
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match is not None:
+            if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+                return headers, Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return headers, None
+
+    def get_response_key(self, request, scope, version):
+        uri = hashlib.sha256(request.build_absolute_uri().encode()).hexdigest()
+        return f'response:{scope}:{version}:{uri}'
+
+    def get(self, request, *args, **kwargs):
+        if not settings.MENU_CACHE_ENABLED:
+            return super().get(request, *args, **kwargs)
+        scope = self.get_cache_scope()
+        version = get_version(scope)
+        headers, not_modified = self.check_not_modified(request, scope, version)
+        if not_modified is not None:
+            return not_modified
+
+        cache = menu_cache()
+        key = self.get_response_key(request, scope, version)
+        data = cache.get(key)
+        if data is None:
+            response = super().get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(key, data, timeout=settings.MENU_CACHE_TIMEOUT)
+
+        return Response(data, headers=headers)
+
+
+class AsyncMenuCacheMixin(MenuCacheMixin):
+    """``MenuCacheMixin`` for async views, going through the cache's async API."""
+
+    async def get(self, request, *args, **kwargs):
+        if not settings.MENU_CACHE_ENABLED:
+            return await super(MenuCacheMixin, self).get(request, *args, **kwargs)
+        scope = self.get_cache_scope()
+        version = await aget_version(scope)
+        headers, not_modified = self.check_not_modified(request, scope, version)
+        if not_modified is not None:
+            return not_modified
+
+        cache = menu_cache()
+        key = self.get_response_key(request, scope, version)
+        data = await cache.aget(key)
+        if data is None:
+            # The view's own async get, past MenuCacheMixin's sync one
+            response = await super(MenuCacheMixin, self).get(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            await cache.aset(key, data, timeout=settings.MENU_CACHE_TIMEOUT)
+
+        return Response(data, headers=headers)
@@ -0,0 +1,32 @@
+# Generated by Django 5.1 on 2026-10-18 15:54
+
+from django.db import migrations, models
+
+
+def remove_duplicate_cart_items(apps, schema_editor):
+    # Keep the most recent row for every (cart, food) pair before adding the constraint
+    CartItem = apps.get_model('foodie_app', 'CartItem')
+    duplicates = (
+        CartItem.objects.values('cart_id', 'food_id')
+        .annotate(latest_id=models.Max('id'), rows=models.Count('id'))
+        .filter(rows__gt=1)
+    )
+    for duplicate in duplicates:
+        CartItem.objects.filter(
+            cart_id=duplicate['cart_id'], food_id=duplicate['food_id']
+        ).exclude(id=duplicate['latest_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0013_alter_reservation_reservation_type'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_cart_items, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='cartitem',
+            constraint=models.UniqueConstraint(fields=('cart', 'food'), name='unique_cart_food'),
+        ),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.1 on 2026-10-18 15:55
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_totals(apps, schema_editor):
+    Cart = apps.get_model('foodie_app', 'Cart')
+    CartItem = apps.get_model('foodie_app', 'CartItem')
+    Food = apps.get_model('foodie_app', 'Food')
+    Order = apps.get_model('foodie_app', 'Order')
+    OrderItem = apps.get_model('foodie_app', 'OrderItem')
+
+    CartItem.objects.update(
+        price=models.Subquery(Food.objects.filter(pk=models.OuterRef('food_id')).values('price')[:1])
+    )
+    for model, item_model, fk in ((Cart, CartItem, 'cart'), (Order, OrderItem, 'order')):
+        items = item_model.objects.filter(**{fk: models.OuterRef('pk')}).values(fk)
+        model.objects.update(
+            subtotal=Coalesce(
+                models.Subquery(items.annotate(total=models.Sum(models.F('price') * models.F('quantity'))).values('total')),
+                models.Value(0, output_field=models.DecimalField(max_digits=10, decimal_places=2)),
+            ),
+            item_count=Coalesce(
+                models.Subquery(items.annotate(count=models.Sum('quantity')).values('count')),
+                models.Value(0),
+            ),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0014_cartitem_unique_cart_food'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cart',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='cart',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='cartitem',
+            name='price',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='order',
+            name='subtotal',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=10),
+        ),
+        migrations.RunPython(backfill_totals, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-18 15:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0015_cart_order_denormalized_totals'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='order',
+            index=models.Index(fields=['user', '-order_time'], name='order_user_time_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1 on 2026-10-18 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0016_order_user_time_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='food',
+            index=models.Index(fields=['restaurant', 'category', 'price', 'id'], name='food_rest_cat_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='food',
+            index=models.Index(fields=['category', 'price', 'id'], name='food_cat_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='food',
+            index=models.Index(fields=['price', 'id'], name='food_price_idx'),
+        ),
+    ]
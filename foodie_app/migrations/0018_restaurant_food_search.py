@@ -0,0 +1,64 @@
+# Generated by Django 5.1 on 2026-10-18 15:59
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+from foodie_app.db_operations import PostgresOnlyRunSQL
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0017_food_catalog_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='food',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='food',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='food_search_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='restaurant_search_idx'),
+        ),
+        PostgresOnlyRunSQL(
+            sql=[
+                "CREATE INDEX restaurant_name_trgm_idx ON foodie_app_restaurant USING gin (name gin_trgm_ops)",
+                "CREATE INDEX restaurant_city_trgm_idx ON foodie_app_restaurant USING gin (city gin_trgm_ops)",
+                "CREATE INDEX food_name_trgm_idx ON foodie_app_food USING gin (name gin_trgm_ops)",
+            ],
+            reverse_sql=[
+                "DROP INDEX restaurant_name_trgm_idx",
+                "DROP INDEX restaurant_city_trgm_idx",
+                "DROP INDEX food_name_trgm_idx",
+            ],
+        ),
+        PostgresOnlyRunSQL(
+            sql=[
+                """
+                UPDATE foodie_app_restaurant SET search_vector =
+                    setweight(to_tsvector('english', COALESCE(name, '')), 'A')
+                    || setweight(to_tsvector('english', COALESCE(city, '')), 'B')
+                    || setweight(to_tsvector('english', COALESCE(description, '')), 'C')
+                """,
+                """
+                UPDATE foodie_app_food SET search_vector =
+                    setweight(to_tsvector('english', COALESCE(name, '')), 'A')
+                    || setweight(to_tsvector('english', COALESCE(description, '')), 'C')
+                """,
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
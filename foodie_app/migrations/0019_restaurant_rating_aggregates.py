@@ -0,0 +1,86 @@
+# Generated by Django 5.1 on 2026-10-18 16:05
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def backfill_ratings(apps, schema_editor):
+    Restaurant = apps.get_model('foodie_app', 'Restaurant')
+    RestaurantReview = apps.get_model('foodie_app', 'RestaurantReview')
+
+    aggregates = {}
+    rows = RestaurantReview.objects.values('restaurant_id', 'rating').annotate(reviews=models.Count('id'))
+    for row in rows:
+        changes = aggregates.setdefault(row['restaurant_id'], {'rating_count': 0, 'rating_sum': 0})
+        changes['rating_count'] += row['reviews']
+        changes['rating_sum'] += row['rating'] * row['reviews']
+        if 1 <= row['rating'] <= 5:
+            changes[f"rating_{row['rating']}_count"] = row['reviews']
+
+    for restaurant_id, changes in aggregates.items():
+        changes['rating_average'] = changes['rating_sum'] / changes['rating_count']
+        Restaurant.objects.filter(pk=restaurant_id).update(**changes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0018_restaurant_food_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_1_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_2_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_3_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_4_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_5_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_average',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='restaurantreview',
+            name='rating',
+            field=models.PositiveIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)]),
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['-rating_average', '-rating_count', 'id'], name='restaurant_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='restaurant',
+            index=models.Index(fields=['city', '-rating_average', '-rating_count', 'id'], name='restaurant_city_rating_idx'),
+        ),
+        migrations.RunPython(backfill_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1 on 2026-10-18 16:12
+
+from datetime import timedelta
+from django.db import migrations, models
+
+
+def backfill_expires_at(apps, schema_editor):
+    # Stories saved without an expiry would never be treated as active or expired
+    Story = apps.get_model('foodie_app', 'Story')
+    Story.objects.filter(expires_at__isnull=True).update(
+        expires_at=models.F('created_at') + timedelta(hours=24)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0020_home_feed'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_expires_at, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='story',
+            index=models.Index(fields=['expires_at'], name='story_expires_idx'),
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.1 on 2026-10-18 16:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_follow_edges(apps, schema_editor):
+    # Merge both old self-M2Ms into the edge table: A.following has B, or B.followers_number has A
+    Profile = apps.get_model('foodie_app', 'Profile')
+    Follow = apps.get_model('foodie_app', 'Follow')
+
+    edges = set(Profile.following.through.objects.values_list('from_profile_id', 'to_profile_id'))
+    edges |= {
+        (follower_id, followee_id)
+        for followee_id, follower_id in Profile.followers_number.through.objects.values_list(
+            'from_profile_id', 'to_profile_id'
+        )
+    }
+    Follow.objects.bulk_create(
+        [Follow(follower_id=follower_id, followee_id=followee_id) for follower_id, followee_id in edges
+         if follower_id != followee_id],
+        batch_size=1000,
+    )
+
+
+def backfill_follow_counts(apps, schema_editor):
+    Profile = apps.get_model('foodie_app', 'Profile')
+    Follow = apps.get_model('foodie_app', 'Follow')
+
+    def count(field):
+        edges = Follow.objects.filter(**{field: models.OuterRef('pk')}).values(field).annotate(count=models.Count('*'))
+        return models.functions.Coalesce(models.Subquery(edges.values('count')), models.Value(0))
+
+    Profile.objects.update(followers_count=count('followee'), following_count=count('follower'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0022_likes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='Follow',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('follower', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='following_edges', to='foodie_app.profile')),
+                ('followee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='follower_edges', to='foodie_app.profile')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='follow',
+            index=models.Index(fields=['followee', 'follower'], name='follow_followee_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.UniqueConstraint(fields=('follower', 'followee'), name='unique_follow'),
+        ),
+        migrations.AddConstraint(
+            model_name='follow',
+            constraint=models.CheckConstraint(condition=models.Q(('follower', models.F('followee')), _negated=True), name='follow_not_self'),
+        ),
+        migrations.RunPython(copy_follow_edges, migrations.RunPython.noop),
+        # An M2M cannot be switched to a through model in place: drop the old tables and re-add it
+        migrations.RemoveField(
+            model_name='profile',
+            name='followers_number',
+        ),
+        migrations.RemoveField(
+            model_name='profile',
+            name='following',
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following',
+            field=models.ManyToManyField(blank=True, related_name='follower_profiles', through='foodie_app.Follow', through_fields=('follower', 'followee'), to='foodie_app.profile'),
+        ),
+        migrations.RunPython(backfill_follow_counts, migrations.RunPython.noop),
+    ]
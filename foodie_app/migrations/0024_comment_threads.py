@@ -0,0 +1,88 @@
+# Generated by Django 5.1 on 2026-10-18 16:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+def move_story_comments(apps, schema_editor):
+    # Comments linked to a story through the old M2M become story comments; the post FK stays authoritative otherwise
+    StoryComments = apps.get_model('foodie_app', 'Story_comments')
+    Comments = apps.get_model('foodie_app', 'Comments')
+    for comment_id, story_id in StoryComments.objects.values_list('comments_id', 'story_id'):
+        Comments.objects.filter(pk=comment_id).update(story_id=story_id, post=None)
+
+
+def backfill_comment_counts(apps, schema_editor):
+    Comments = apps.get_model('foodie_app', 'Comments')
+    for model_name in ('Post', 'Story'):
+        model = apps.get_model('foodie_app', model_name)
+        field = model_name.lower()
+        comments = Comments.objects.filter(**{field: models.OuterRef('pk')}).values(field).annotate(count=models.Count('*'))
+        model.objects.update(
+            comment_count=models.functions.Coalesce(models.Subquery(comments.values('count')), models.Value(0))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0023_follow_graph'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comments',
+            name='author',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='comments',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='comments',
+            name='story',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='foodie_app.story'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='story',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AlterField(
+            model_name='comments',
+            name='post',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='comments', to='foodie_app.post'),
+        ),
+        migrations.RunPython(move_story_comments, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='post',
+            name='comments',
+        ),
+        migrations.RemoveField(
+            model_name='story',
+            name='comments',
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['post', 'id'], name='comment_post_thread_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comments',
+            index=models.Index(fields=['story', 'id'], name='comment_story_thread_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='comments',
+            constraint=models.CheckConstraint(condition=models.Q(models.Q(('post__isnull', False), ('story__isnull', True)), models.Q(('post__isnull', True), ('story__isnull', False)), _connector='OR'), name='comment_single_target'),
+        ),
+        migrations.RunPython(backfill_comment_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1 on 2026-10-18 16:40
+
+import datetime
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def check_duplicate_categories(apps, schema_editor):
+    # Which of a restaurant's categories of one type to keep is the owner's call; fail with the list instead
+    ReservationCategory = apps.get_model('foodie_app', 'ReservationCategory')
+    duplicates = [
+        f"restaurant {duplicate['restaurant_id']} ({duplicate['reservation_type']})"
+        for duplicate in ReservationCategory.objects.values('restaurant_id', 'reservation_type')
+        .annotate(rows=models.Count('id'))
+        .filter(rows__gt=1)
+        .order_by('restaurant_id', 'reservation_type')
+    ]
+    if duplicates:
+        raise RuntimeError(
+            f"Merge the reservation categories repeated for one restaurant and type before migrating: {', '.join(duplicates)}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0024_comment_threads'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_categories, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='ReservationSlot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('starts_at', models.DateTimeField()),
+                ('capacity', models.PositiveIntegerField()),
+                ('booked', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='reservationcategory',
+            name='capacity',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='reservationcategory',
+            name='closes_at',
+            field=models.TimeField(default=datetime.time(21, 0)),
+        ),
+        migrations.AddField(
+            model_name='reservationcategory',
+            name='opens_at',
+            field=models.TimeField(default=datetime.time(9, 0)),
+        ),
+        migrations.AddField(
+            model_name='reservationcategory',
+            name='slot_minutes',
+            field=models.PositiveIntegerField(default=60, validators=[django.core.validators.MinValueValidator(5)]),
+        ),
+        migrations.AddConstraint(
+            model_name='reservationcategory',
+            constraint=models.UniqueConstraint(fields=('restaurant', 'reservation_type'), name='unique_reservation_category'),
+        ),
+        migrations.AddField(
+            model_name='reservationslot',
+            name='category',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='slots', to='foodie_app.reservationcategory'),
+        ),
+        migrations.AddField(
+            model_name='reservation',
+            name='slot',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='reservations', to='foodie_app.reservationslot'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservationslot',
+            constraint=models.UniqueConstraint(fields=('category', 'starts_at'), name='unique_reservation_slot'),
+        ),
+        migrations.AddConstraint(
+            model_name='reservationslot',
+            constraint=models.CheckConstraint(condition=models.Q(('booked__lte', models.F('capacity'))), name='slot_not_overbooked'),
+        ),
+    ]
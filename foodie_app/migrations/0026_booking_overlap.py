@@ -0,0 +1,61 @@
+# Generated by Django 5.1 on 2026-10-18 16:46
+
+from django.db import migrations, models
+from foodie_app.db_operations import PostgresOnlyRunSQL
+
+
+def check_conflicting_bookings(apps, schema_editor):
+    # Which of two clashing stays stands is for the guests and the host to settle; fail with the list instead
+    Booking = apps.get_model('foodie_app', 'Booking')
+    empty = list(Booking.objects.filter(check_out_date__lte=models.F('check_in_date')).values_list('id', flat=True))
+    overlapping = []
+    last_accommodation, last_booking, last_check_out = None, None, None
+    bookings = Booking.objects.exclude(id__in=empty).order_by('accommodation_id', 'check_in_date', 'id')
+    for booking in bookings.iterator():
+        if booking.accommodation_id == last_accommodation and booking.check_in_date < last_check_out:
+            overlapping.append(f'{last_booking} and {booking.id}')
+        if booking.accommodation_id != last_accommodation or booking.check_out_date > last_check_out:
+            last_accommodation, last_booking, last_check_out = booking.accommodation_id, booking.id, booking.check_out_date
+    problems = []
+    if empty:
+        problems.append(f"empty or reversed stays: {', '.join(map(str, empty))}")
+    if overlapping:
+        problems.append(f"overlapping bookings: {', '.join(overlapping)}")
+    if problems:
+        raise RuntimeError(f"Fix or cancel these before migrating; {'; '.join(problems)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0025_reservation_slots'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_conflicting_bookings, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='accommodation',
+            index=models.Index(fields=['city', 'id'], name='accommodation_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['accommodation', 'check_out_date', 'check_in_date'], name='booking_stay_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['user', '-check_in_date'], name='booking_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='booking',
+            constraint=models.CheckConstraint(condition=models.Q(('check_out_date__gt', models.F('check_in_date'))), name='booking_stay_not_empty'),
+        ),
+        # Not BtreeGistExtension, whose reverse queries pg_extension on every backend
+        PostgresOnlyRunSQL(sql="CREATE EXTENSION IF NOT EXISTS btree_gist", reverse_sql=migrations.RunSQL.noop),
+        PostgresOnlyRunSQL(
+            sql=(
+                "ALTER TABLE foodie_app_booking ADD CONSTRAINT booking_no_overlap EXCLUDE USING gist "
+                "(accommodation_id WITH =, tstzrange(check_in_date, check_out_date, '[)') WITH &&)"
+            ),
+            reverse_sql="ALTER TABLE foodie_app_booking DROP CONSTRAINT booking_no_overlap",
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1 on 2026-10-18 16:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def quote_existing_bookings(apps, schema_editor):
+    # No weekend prices or rates exist yet, so every night costs the base price
+    Booking = apps.get_model('foodie_app', 'Booking')
+    bookings = list(Booking.objects.select_related('accommodation'))
+    for booking in bookings:
+        nights = (timezone.localdate(booking.check_out_date) - timezone.localdate(booking.check_in_date)).days
+        booking.total_price = booking.accommodation.price_per_night * max(nights, 1)
+    Booking.objects.bulk_update(bookings, ['total_price'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0026_booking_overlap'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accommodation',
+            name='weekend_price_per_night',
+            field=models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='booking',
+            name='total_price',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=12, null=True),
+        ),
+        migrations.CreateModel(
+            name='AccommodationRate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('price_per_night', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('accommodation', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rates', to='foodie_app.accommodation')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('accommodation', 'date'), name='unique_accommodation_rate')],
+            },
+        ),
+        migrations.RunPython(quote_existing_bookings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.1 on 2026-10-18 16:52
+
+import django.db.models.functions.text
+import foodie_app.models
+from django.db import migrations, models
+
+
+def check_case_duplicates(apps, schema_editor):
+    # Accounts that only differ in email case can't be merged automatically; fail with the list instead
+    User = apps.get_model('foodie_app', 'User')
+    duplicates = list(
+        User.objects.annotate(email_lower=django.db.models.functions.text.Lower('email'))
+        .values('email_lower')
+        .annotate(users=models.Count('id'))
+        .filter(users__gt=1)
+        .values_list('email_lower', flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            f"Merge or rename the users whose emails only differ in case before migrating: {', '.join(duplicates)}"
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('foodie_app', '0027_accommodation_rates'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_case_duplicates, migrations.RunPython.noop),
+        migrations.AlterModelManagers(
+            name='user',
+            managers=[
+                ('objects', foodie_app.models.UserManager()),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.Lower('email'), name='user_email_ci_unique'),
+        ),
+    ]
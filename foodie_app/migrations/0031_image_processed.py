@@ -0,0 +1,60 @@
+# Generated by Django 5.1 on 2026-10-18 17:45
+
+import os
+from django.core.files.storage import default_storage
+from django.db import migrations, models
+
+MODELS = ['accommodation', 'post', 'profile', 'restaurant', 'story', 'user']
+
+
+def mark_processed_images(apps, schema_editor):
+    # Images whose WebP rendition (written last by foodie_app.images.process_image) is already stored
+    for model_name in MODELS:
+        model = apps.get_model('foodie_app', model_name)
+        names = model.objects.exclude(image='').exclude(image__isnull=True).values_list('image', flat=True).distinct()
+        ready = [
+            name for name in names
+            if default_storage.exists(f'renditions/{os.path.splitext(name)[0]}/webp.webp')
+        ]
+        model.objects.filter(image__in=ready).update(image_processed=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0030_order_time_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='accommodation',
+            name='image_processed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='image_processed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='image_processed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='restaurant',
+            name='image_processed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='story',
+            name='image_processed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='image_processed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.RunPython(mark_processed_images, migrations.RunPython.noop),
+    ]
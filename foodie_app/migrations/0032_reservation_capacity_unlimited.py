@@ -0,0 +1,31 @@
+# Generated by Django 5.1 on 2026-10-18 17:51
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def unlimit_unset_capacities(apps, schema_editor):
+    # 0025 gave existing categories a capacity of 0, which closed them; they never had a limit before
+    ReservationCategory = apps.get_model('foodie_app', 'ReservationCategory')
+    ReservationCategory.objects.filter(capacity=0).update(capacity=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0031_image_processed'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reservation',
+            name='slot',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reservations', to='foodie_app.reservationslot'),
+        ),
+        migrations.AlterField(
+            model_name='reservationcategory',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(unlimit_unset_capacities, migrations.RunPython.noop),
+    ]
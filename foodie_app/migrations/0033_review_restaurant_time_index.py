@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-18 18:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('foodie_app', '0032_reservation_capacity_unlimited'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='restaurantreview',
+            index=models.Index(fields=['restaurant', '-created_at', '-id'], name='review_restaurant_time_idx'),
+        ),
+    ]
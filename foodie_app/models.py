@@ -1,9 +1,12 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
-from django.contrib.auth.models import AbstractUser, Group, Permission
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from datetime import timedelta
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
+from django.contrib.auth.models import AbstractUser, Group, Permission, UserManager as DjangoUserManager
+from django.db.models.functions import Cast, Coalesce, Lower, NullIf
+from datetime import time, timedelta
+from decimal import Decimal
 from django.utils.translation import gettext_lazy as _
 
 
@@ -30,6 +33,9 @@ RESERVATION_TYPE_CHOICES = [
 ]
 
 
+RATING_VALUES = range(1, 6)
+
+
 STATUS_CHOICES = [
     ('Pending', _('Pending')),
     ('Completed', _('Completed')),
@@ -37,6 +43,15 @@ STATUS_CHOICES = [
 ]
 
 
+class UserManager(DjangoUserManager):
+    def with_email(self, email):
+        """Users whose email is ``email`` ignoring case, looked up in the lower(email) unique index."""
+        return self.alias(email_lower=Lower('email')).filter(email_lower=(email or '').lower())
+
+    def get_by_natural_key(self, email):
+        return self.with_email(email).get()
+
+
 class User(AbstractUser):
     full_name = models.CharField(max_length=255)
     email = models.EmailField(unique=True, blank=False)
@@ -46,6 +61,8 @@ class User(AbstractUser):
     address = models.CharField(max_length=255)
     postal_code = models.CharField(max_length=20)
     image = models.ImageField(upload_to='profile_pics', blank=True, null=True)
+    # Set once the image's renditions are written (foodie_app/images.py)
+    image_processed = models.BooleanField(default=False, editable=False)
     is_business_owner = models.BooleanField(default=False, null=False)
 
 
@@ -68,51 +85,265 @@ class User(AbstractUser):
         related_query_name='custom_user'
     )
 
+    objects = UserManager()
+
+    class Meta(AbstractUser.Meta):
+        constraints = [
+            models.UniqueConstraint(Lower('email'), name='user_email_ci_unique'),
+        ]
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        # Users built from token claims load all their missing columns on the first one touched
+        if fields is not None and getattr(self, 'from_token_claims', False):
+            fields = {*fields, *self.get_deferred_fields()}
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+
+
+def _count(queryset, field):
+    # Correlated COUNT(*) subquery over ``queryset`` grouped by ``field``
+    return Coalesce(
+        models.Subquery(queryset.values(field).annotate(count=models.Count('*')).values('count')),
+        models.Value(0),
+    )
+
+
+def current_likes(target, path=''):
+    """
+    ``likes`` of the ``target`` ('post' or 'story') at ``path`` plus the
+    deltas of its counter shards that are not folded in yet.
+    """
+    shards = LikeCounterShard.objects.filter(**{target: models.OuterRef(f'{path}pk')})
+    pending = models.Subquery(shards.values(target).annotate(total=models.Sum('delta')).values('total'))
+    return models.F(f'{path}likes') + Coalesce(pending, models.Value(0))
+
+
+class ProfileQuerySet(models.QuerySet):
+    def with_summary(self, recent_posts=None):
+        """
+        Annotate the post count and prefetch the ``recent_posts`` newest posts
+        onto ``profile.user.recent_posts``: two queries however large the
+        profile is. Follow counts are stored on the profile itself.
+        """
+        recent_posts = recent_posts or settings.PROFILE_RECENT_POSTS
+        return self.select_related('user').annotate(
+            post_count=_count(Post.objects.filter(author=models.OuterRef('user')), 'author'),
+        ).prefetch_related(
+            models.Prefetch(
+                'user__posts',
+                queryset=Post.objects.with_like_counts().order_by('-created_at', '-id')[:recent_posts],
+                to_attr='recent_posts',
+            )
+        )
+
 
 class Profile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     username = models.CharField(max_length=200)
     bio = models.CharField(max_length=300, blank=True)
     image = models.ImageField(upload_to="user_images", blank=True, null=True)
-    followers_number = models.ManyToManyField(
-        'self', symmetrical=False, related_name='following_profiles', blank=True
-    )
+    image_processed = models.BooleanField(default=False, editable=False)
     following = models.ManyToManyField(
         'self', symmetrical=False, related_name='follower_profiles', blank=True,
+        through='Follow', through_fields=('follower', 'followee'),
     )
+    # Maintained from Follow rows by the signals in follow_service
+    followers_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
     posts = models.ManyToManyField('Post', related_name='profile_posts', blank=True)
     stories = models.ManyToManyField('Story', related_name='profile_stories', blank=True)
     is_business_owner = models.BooleanField(default=False, null=False)
+    # Set once the profile has too many followers to fan its posts out; followers then pull them on read
+    fanout_on_read = models.BooleanField(default=False, editable=False)
+
+    objects = ProfileQuerySet.as_manager()
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='following_edges')
+    followee = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='follower_edges')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            # Also the index for "who does X follow"
+            models.UniqueConstraint(fields=['follower', 'followee'], name='unique_follow'),
+            models.CheckConstraint(condition=~models.Q(follower=models.F('followee')), name='follow_not_self'),
+        ]
+        indexes = [
+            models.Index(fields=['followee', 'follower'], name='follow_followee_idx'),
+        ]
+
+
+class PostQuerySet(models.QuerySet):
+    def with_like_counts(self):
+        return self.annotate(current_likes=current_likes('post'))
 
 
 class Post(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='posts')
     content = models.TextField()
     image = models.ImageField(upload_to="post_images", blank=True, null=True)
+    image_processed = models.BooleanField(default=False, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    comments = models.ManyToManyField('Comments', blank=True, related_name="post_comments")
     likes = models.IntegerField(default=0)
+    # Maintained from Comments rows by signals
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = PostQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Fan-out-on-read path of the home feed
+            models.Index(fields=['author', '-created_at', '-id'], name='post_author_time_idx'),
+        ]
+
+
+class FeedEntry(models.Model):
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='feed_entries')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='feed_entries')
+    author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'post'], name='unique_feed_owner_post'),
+        ]
+        indexes = [
+            models.Index(fields=['owner', '-created_at', '-post'], name='feed_owner_time_idx'),
+        ]
+
+
+class StoryQuerySet(models.QuerySet):
+    def active(self, now=None):
+        return self.filter(expires_at__gt=now or timezone.now())
+
+    def expired(self, now=None):
+        return self.filter(expires_at__lte=now or timezone.now())
+
+    def with_like_counts(self):
+        return self.annotate(current_likes=current_likes('story'))
 
 
 class Story(models.Model):
     author = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='stories')
     content = models.TextField()
     image = models.ImageField(upload_to="story_images", blank=True, null=True)
-    comments = models.ManyToManyField('Comments', blank=True, related_name="story_comments")
+    image_processed = models.BooleanField(default=False, editable=False)
     likes = models.IntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     expires_at = models.DateTimeField(null=True, blank=True)  
 
+    objects = StoryQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Active-story reads (expires_at > now) and the expired-story purge
+            models.Index(fields=['expires_at'], name='story_expires_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.expires_at:
-            self.expires_at = self.created_at + timedelta(hours=24)  
+            self.expires_at = (self.created_at or timezone.now()) + timedelta(hours=24)
         super().save(*args, **kwargs)
 
 
+class Like(models.Model):
+    """A user's like of exactly one post or story."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='likes')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, null=True, blank=True, related_name='like_set')
+    story = models.ForeignKey(Story, on_delete=models.CASCADE, null=True, blank=True, related_name='like_set')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'post'], name='unique_like_user_post'),
+            models.UniqueConstraint(fields=['user', 'story'], name='unique_like_user_story'),
+            models.CheckConstraint(
+                condition=models.Q(post__isnull=False, story__isnull=True) | models.Q(post__isnull=True, story__isnull=False),
+                name='like_single_target',
+            ),
+        ]
+
+
+class LikeCounterShard(models.Model):
+    """
+    Pending like-count delta for a post or story, spread over
+    ``LIKE_COUNTER_SHARDS`` rows so concurrent likes rarely update the same row.
+    Folded into ``likes`` by ``fold_like_counters``.
+    """
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, null=True, blank=True, related_name='like_shards')
+    story = models.ForeignKey(Story, on_delete=models.CASCADE, null=True, blank=True, related_name='like_shards')
+    shard = models.PositiveSmallIntegerField()
+    delta = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'shard'], name='unique_like_shard_post'),
+            models.UniqueConstraint(fields=['story', 'shard'], name='unique_like_shard_story'),
+        ]
+
+
 class Comments(models.Model):
     content = models.TextField(blank=True, max_length=100)
-    post = models.ForeignKey(Post, on_delete=models.CASCADE, related_name='post_comments')
+    post = models.ForeignKey(Post, on_delete=models.CASCADE, null=True, blank=True, related_name='comments')
+    story = models.ForeignKey(Story, on_delete=models.CASCADE, null=True, blank=True, related_name='comments')
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, null=True, blank=True, related_name='comments'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(post__isnull=False, story__isnull=True) | models.Q(post__isnull=True, story__isnull=False),
+                name='comment_single_target',
+            ),
+        ]
+        indexes = [
+            # Keyset pagination of a thread
+            models.Index(fields=['post', 'id'], name='comment_post_thread_idx'),
+            models.Index(fields=['story', 'id'], name='comment_story_thread_idx'),
+        ]
+
+
+class RestaurantQuerySet(models.QuerySet):
+    def apply_rating(self, restaurant_id, rating, sign):
+        # Add (sign=1) or remove (sign=-1) one rating from the stored aggregates in a single UPDATE
+        count = models.F('rating_count') + sign
+        total = models.F('rating_sum') + sign * rating
+        changes = {
+            'rating_count': count,
+            'rating_sum': total,
+            'rating_average': Coalesce(
+                Cast(total, models.FloatField()) / NullIf(count, 0), models.Value(0.0)
+            ),
+        }
+        if rating in RATING_VALUES:
+            changes[f'rating_{rating}_count'] = models.F(f'rating_{rating}_count') + sign
+        return self.filter(pk=restaurant_id).update(**changes)
+
+    def rebuild_ratings(self):
+        # Recompute every aggregate from the reviews table
+        reviews = RestaurantReview.objects.filter(restaurant=models.OuterRef('pk')).values('restaurant')
+
+        def aggregate(expression, **filters):
+            return Coalesce(
+                models.Subquery(reviews.filter(**filters).annotate(value=expression).values('value')),
+                models.Value(0),
+            )
+
+        count = aggregate(models.Count('id'))
+        total = aggregate(models.Sum('rating'))
+        return self.update(
+            rating_count=count,
+            rating_sum=total,
+            rating_average=Coalesce(Cast(total, models.FloatField()) / NullIf(count, 0), models.Value(0.0)),
+            **{
+                f'rating_{rating}_count': aggregate(models.Count('id'), rating=rating)
+                for rating in RATING_VALUES
+            },
+        )
 
 
 class Restaurant(models.Model):
@@ -123,7 +354,30 @@ class Restaurant(models.Model):
     country = models.CharField(max_length=100)
     phone_number = models.CharField(max_length=20)
     image = models.ImageField(upload_to='restaurant_images', blank=True, null=True)
+    image_processed = models.BooleanField(default=False, editable=False)
     description = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+    rating_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_sum = models.PositiveIntegerField(default=0, editable=False)
+    rating_average = models.FloatField(default=0, editable=False)
+    rating_1_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_2_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_3_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_4_count = models.PositiveIntegerField(default=0, editable=False)
+    rating_5_count = models.PositiveIntegerField(default=0, editable=False)
+
+    objects = RestaurantQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='restaurant_search_idx'),
+            models.Index(fields=['-rating_average', '-rating_count', 'id'], name='restaurant_rating_idx'),
+            models.Index(fields=['city', '-rating_average', '-rating_count', 'id'], name='restaurant_city_rating_idx'),
+        ]
+
+    @property
+    def rating_histogram(self):
+        return {rating: getattr(self, f'rating_{rating}_count') for rating in RATING_VALUES}
    
     @property
     def managers(self):
@@ -136,20 +390,66 @@ class Restaurant(models.Model):
 class RestaurantReview(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE)
-    rating = models.PositiveIntegerField()
+    rating = models.PositiveIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     review = models.TextField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # A restaurant's reviews, newest first
+            models.Index(fields=['restaurant', '-created_at', '-id'], name='review_restaurant_time_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Keep the restaurant's rating aggregates in step with the review in one transaction;
+        # deletes are handled by a post_delete signal so queryset deletes are covered too
+        with transaction.atomic():
+            previous = None
+            if self.pk:
+                previous = RestaurantReview.objects.select_for_update().filter(
+                    pk=self.pk
+                ).values_list('restaurant_id', 'rating').first()
+            super().save(*args, **kwargs)
+            if previous:
+                Restaurant.objects.apply_rating(*previous, sign=-1)
+            Restaurant.objects.apply_rating(self.restaurant_id, self.rating, sign=1)
+
     def __str__(self):
         return f"Review by {self.user.username} on {self.restaurant.name}"
 
 
+class FoodQuerySet(models.QuerySet):
+    def catalog(self, restaurant=None, category=None, min_price=None, max_price=None):
+        # Every filter is optional; together they match the (restaurant, category, price) index
+        foods = self
+        if restaurant is not None:
+            foods = foods.filter(restaurant_id=restaurant)
+        if category is not None:
+            foods = foods.filter(category=category)
+        if min_price is not None:
+            foods = foods.filter(price__gte=min_price)
+        if max_price is not None:
+            foods = foods.filter(price__lte=max_price)
+        return foods
+
+
 class Food(models.Model):
     name = models.CharField(max_length=255)
     category = models.CharField(max_length=20, choices=FOOD_CATEGORY_CHOICES, null=False)
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name='foods')
     price = models.DecimalField(max_digits=10, decimal_places=2)
     description = models.TextField(blank=True, null=False)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = FoodQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='food_search_idx'),
+            models.Index(fields=['restaurant', 'category', 'price', 'id'], name='food_rest_cat_price_idx'),
+            models.Index(fields=['category', 'price', 'id'], name='food_cat_price_idx'),
+            models.Index(fields=['price', 'id'], name='food_price_idx'),
+        ]
 
 
     def __str__(self):
@@ -160,10 +460,44 @@ class ReservationCategory(models.Model):
     name = models.CharField(max_length=255)
     reservation_type = models.CharField(max_length=20, choices=RESERVATION_TYPE_CHOICES)
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, related_name='reservation_categories')
-   
+    # People that can be seated per slot (None: no limit, 0: no reservations), and the bookable slots of a day
+    capacity = models.PositiveIntegerField(null=True, blank=True)
+    slot_minutes = models.PositiveIntegerField(default=60, validators=[MinValueValidator(5)])
+    opens_at = models.TimeField(default=time(9, 0))
+    closes_at = models.TimeField(default=time(21, 0))
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['restaurant', 'reservation_type'], name='unique_reservation_category'),
+        ]
+
     def __str__(self):
         return self.name
 
+
+class ReservationSlot(models.Model):
+    """Seats booked in one slot of a category. Rows are created on first booking."""
+    category = models.ForeignKey(ReservationCategory, on_delete=models.CASCADE, related_name='slots')
+    starts_at = models.DateTimeField()
+    capacity = models.PositiveIntegerField()
+    booked = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            # Also the index for a category's slots of a day
+            models.UniqueConstraint(fields=['category', 'starts_at'], name='unique_reservation_slot'),
+            # Last line of defence against overbooking
+            models.CheckConstraint(condition=models.Q(booked__lte=models.F('capacity')), name='slot_not_overbooked'),
+        ]
+
+class OrderQuerySet(models.QuerySet):
+    def with_items(self):
+        # Load restaurants with a join and all items with their foods in one extra query
+        return self.select_related('restaurant').prefetch_related(
+            models.Prefetch('order_items', queryset=OrderItem.objects.select_related('food').order_by('id'))
+        )
+
+
 class Order(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE)
@@ -171,16 +505,22 @@ class Order(models.Model):
     order_time = models.DateTimeField(auto_now_add=True)
     estimated_delivery_time = models.DateTimeField(blank=True, null=True)
     total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0)
 
-    def calculate_total_price(self):
-        # Calculate the total price by summing the price of all associated OrderItems
-        return sum(item.food.price * item.quantity for item in self.order_items.all())
+    objects = OrderQuerySet.as_manager()
 
-    def save(self, *args, **kwargs):
-        # Calculate the total price before saving the order
-        if self.pk:  # Ensure the Order has been saved and has a primary key
-            self.total_price = self.calculate_total_price()
-        super().save(*args, **kwargs)
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-order_time', '-id'], name='order_user_time_idx'),
+        ]
+
+    def calculate_total_price(self):
+        # Sum the price captured on each OrderItem in a single aggregate query
+        total = self.order_items.aggregate(
+            total=models.Sum(models.F('price') * models.F('quantity'))
+        )['total']
+        return total or 0
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='order_items')
@@ -195,11 +535,8 @@ class Cart(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
-
-    @property
-    def total_price(self):
-        total = sum(item.total_price for item in self.cart_items.all())
-        return round(total, 2)
+    subtotal = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    item_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"Cart for {self.user.username} (ID: {self.id})"
@@ -208,10 +545,16 @@ class CartItem(models.Model):
     cart = models.ForeignKey(Cart, related_name='cart_items', on_delete=models.CASCADE)
     food = models.ForeignKey('Food', on_delete=models.CASCADE)
     quantity = models.PositiveIntegerField()
+    price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['cart', 'food'], name='unique_cart_food'),
+        ]
 
     @property
     def total_price(self):
-        return round(self.quantity * self.food.price, 2)
+        return round(self.quantity * self.price, 2)
 
     def __str__(self):
         return f"{self.quantity}x {self.food.name} in Cart {self.cart.id}"
@@ -224,6 +567,9 @@ class Reservation(models.Model):
     number_of_people = models.PositiveIntegerField()
     special_requests = models.TextField(blank=True)
     reservation_type = models.CharField(max_length=50, choices=RESERVATION_TYPE_CHOICES)
+    slot = models.ForeignKey(
+        ReservationSlot, on_delete=models.SET_NULL, blank=True, null=True, related_name='reservations', editable=False
+    )
 
 
     def __str__(self):
@@ -239,7 +585,21 @@ class Booking(models.Model):
     check_out_date = models.DateTimeField()
     number_of_guests = models.PositiveIntegerField()
     special_requests = models.TextField(blank=True)
-
+    # Quoted when the booking is made or its stay changes
+    total_price = models.DecimalField(max_digits=12, decimal_places=2, null=True, editable=False)
+
+    class Meta:
+        # On PostgreSQL, migration 0026 also adds the booking_no_overlap GiST
+        # exclusion constraint over tstzrange(check_in_date, check_out_date)
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(check_out_date__gt=models.F('check_in_date')), name='booking_stay_not_empty'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['accommodation', 'check_out_date', 'check_in_date'], name='booking_stay_idx'),
+            models.Index(fields=['user', '-check_in_date'], name='booking_user_idx'),
+        ]
 
     def __str__(self):
         return f"Booking {self.id} by {self.user.username} from {self.check_in_date} to {self.check_out_date}"
@@ -247,6 +607,50 @@ class Booking(models.Model):
 
 
 
+# ISO weekdays of the nights charged at the weekend rate: Friday and Saturday
+WEEKEND_NIGHTS = (5, 6)
+
+
+def stay_nights(check_in_date, check_out_date):
+    """Dates of the nights of a stay, in the current time zone. Always at least one."""
+    first = timezone.localdate(check_in_date)
+    nights = max((timezone.localdate(check_out_date) - first).days, 1)
+    return [first + timedelta(days=night) for night in range(nights)]
+
+
+class AccommodationQuerySet(models.QuerySet):
+    def with_quote(self, check_in_date, check_out_date):
+        """
+        Annotate ``quoted_total``, the price of the stay, on every row in the
+        same query: the nights at the base and weekend rates, corrected by one
+        correlated SUM over the stay's dates in the rate table.
+        """
+        nights = stay_nights(check_in_date, check_out_date)
+        weekend_nights = sum(1 for night in nights if night.isoweekday() in WEEKEND_NIGHTS)
+        money = models.DecimalField(max_digits=12, decimal_places=2)
+
+        default_price = models.Case(
+            models.When(
+                date__iso_week_day__in=WEEKEND_NIGHTS,
+                then=Coalesce(models.OuterRef('weekend_price_per_night'), models.OuterRef('price_per_night')),
+            ),
+            default=models.OuterRef('price_per_night'),
+            output_field=money,
+        )
+        adjustment = (
+            AccommodationRate.objects.filter(accommodation=models.OuterRef('pk'), date__range=(nights[0], nights[-1]))
+            .values('accommodation')
+            .annotate(total=models.Sum(models.F('price_per_night') - default_price, output_field=money))
+            .values('total')
+        )
+        return self.annotate(quoted_total=models.ExpressionWrapper(
+            models.F('price_per_night') * (len(nights) - weekend_nights)
+            + Coalesce('weekend_price_per_night', 'price_per_night') * weekend_nights
+            + Coalesce(models.Subquery(adjustment, output_field=money), models.Value(Decimal('0'))),
+            output_field=money,
+        ))
+
+
 class Accommodation(models.Model):
     name = models.CharField(max_length=255)
     address = models.CharField(max_length=255)
@@ -254,14 +658,42 @@ class Accommodation(models.Model):
     country = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     price_per_night = models.DecimalField(max_digits=10, decimal_places=2)
+    # Friday and Saturday nights; the base price when empty
+    weekend_price_per_night = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
     image = models.ImageField(upload_to='accommodation_images', blank=True, null=True)
+    image_processed = models.BooleanField(default=False, editable=False)
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE, blank=True, null=True)
 
+    objects = AccommodationQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['city', 'id'], name='accommodation_city_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class AccommodationRate(models.Model):
+    """
+    Nightly price of an accommodation on one date, overriding its base and
+    weekend prices, e.g. for a season or a holiday.
+    """
+    accommodation = models.ForeignKey(Accommodation, on_delete=models.CASCADE, related_name='rates')
+    date = models.DateField()
+    price_per_night = models.DecimalField(max_digits=10, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            # Also the index quotes range-scan
+            models.UniqueConstraint(fields=['accommodation', 'date'], name='unique_accommodation_rate'),
+        ]
+
+    def __str__(self):
+        return f"{self.accommodation} on {self.date}: {self.price_per_night}"
+
+
 class Manager(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     restaurant = models.ForeignKey(Restaurant, on_delete=models.CASCADE)
@@ -270,12 +702,29 @@ class Manager(models.Model):
 
     def __str__(self):
         return f"{self.user.username} is a manager for {self.restaurant.name}"
-   
-@receiver(post_save, sender=User)
-def create_user_profile(sender, instance, created, **kwargs):
-    if created:
-        Profile.objects.get_or_create(
-            user=instance,
-            username=instance.username,
-            defaults={'image': instance.image}
-        )
+
+
+class RevokedToken(models.Model):
+    """
+    A revoked JWT, by ``jti``, or every token of ``user`` issued up to
+    ``issued_before``. Rows are pruned once ``expires_at`` passes, as the
+    tokens they revoke have expired by then.
+    """
+    jti = models.CharField(max_length=64, unique=True, null=True, blank=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    issued_before = models.DateTimeField(null=True, blank=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(jti__isnull=False) | models.Q(user__isnull=False, issued_before__isnull=False),
+                name='revoked_token_target',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='revoked_token_expiry_idx'),
+        ]
+
+    def __str__(self):
+        return self.jti or f"Tokens of user {self.user_id} issued up to {self.issued_before}"
@@ -0,0 +1,83 @@
+from asgiref.sync import sync_to_async
+from rest_framework.pagination import CursorPagination
+
+
+class AsyncCursorPagination(CursorPagination):
+    """``CursorPagination`` that async views can await."""
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        # DRF's own implementation, with the page read in a thread instead of on the event loop
+        return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+
+
+class OrderCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    # id breaks ties between orders placed in the same instant, so none is skipped or repeated
+    ordering = ('-order_time', '-id')
+
+
+class FoodCatalogPagination(AsyncCursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    # Price first so range filters walk the price indexes; id keeps ties stable
+    ordering = ('price', 'id')
+
+
+class RestaurantCursorPagination(AsyncCursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def get_ordering(self, request, queryset, view):
+        # The view picks the ordering from the ?ordering= parameter
+        return view.get_ordering()
+
+
+class StoryCursorPagination(AsyncCursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    # Newest first: stories expire a fixed time after creation, so this walks the expires_at index
+    ordering = ('-expires_at', '-id')
+
+
+class PostCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    # Matches the (author, -created_at, -id) post index
+    ordering = ('-created_at', '-id')
+
+
+class ProfileCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    ordering = 'id'
+
+
+class CommentCursorPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    # Oldest first; walks the (post, id) / (story, id) thread indexes
+    ordering = 'id'
+
+
+class ReviewCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    # Newest first; matches the (restaurant, -created_at, -id) review index
+    ordering = ('-created_at', '-id')
+
+
+class AccommodationCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    # Walks the (city, id) accommodation index
+    ordering = 'id'
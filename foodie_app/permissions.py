@@ -0,0 +1,92 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Q
+from rest_framework import permissions
+from rest_framework.exceptions import PermissionDenied
+from foodie_app.models import Restaurant
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _managed_restaurants_cache():
+    alias = getattr(settings, 'MANAGED_RESTAURANTS_CACHE_ALIAS', None)
+    return caches[alias] if alias else None
+
+
+def _cache_key(user_id):
+    return f'managed-restaurants:{user_id}'
+
+
+def load_managed_restaurant_ids(user_id):
+    return frozenset(
+        Restaurant.objects.filter(Q(owner_id=user_id) | Q(manager__user_id=user_id))
+        .values_list('id', flat=True)
+        .distinct()
+    )
+
+
+def managed_restaurant_ids(request):
+    """
+    Ids of the restaurants the requesting user owns or manages.
+
+    Taken from the token's claims when possible, otherwise resolved with a
+    single query. Memoized on the request. When
+    ``MANAGED_RESTAURANTS_CACHE_ALIAS`` is set the set is also cached per user
+    and invalidated by ``Manager``/``Restaurant`` changes.
+    """
+    if hasattr(request, '_managed_restaurant_ids'):
+        return request._managed_restaurant_ids
+
+    user = request.user
+    if not user.is_authenticated:
+        restaurant_ids = frozenset()
+    elif getattr(user, 'claimed_restaurant_ids', None) is not None:
+        # Set by ClaimsJWTAuthentication from the token, whose claims it has checked are current
+        restaurant_ids = user.claimed_restaurant_ids
+    else:
+        cache = _managed_restaurants_cache()
+        restaurant_ids = cache.get(_cache_key(user.pk)) if cache else None
+        if restaurant_ids is None:
+            restaurant_ids = load_managed_restaurant_ids(user.pk)
+            if cache:
+                cache.set(_cache_key(user.pk), restaurant_ids, timeout=settings.MANAGED_RESTAURANTS_CACHE_TIMEOUT)
+
+    request._managed_restaurant_ids = restaurant_ids
+    return restaurant_ids
+
+
+def invalidate_managed_restaurants(*user_ids):
+    cache = _managed_restaurants_cache()
+    if cache:
+        # After commit, so a concurrent request cannot re-cache the old set
+        transaction.on_commit(lambda: cache.delete_many([_cache_key(user_id) for user_id in user_ids]))
+
+
+def check_can_manage_restaurant(request, restaurant_id, message):
+    """
+    Raise ``PermissionDenied`` with ``message`` unless the requesting user owns
+    or manages ``restaurant_id``. For writes that name a restaurant in the
+    payload, e.g. creating a food or moving it to another restaurant.
+    """
+    if restaurant_id is None or restaurant_id not in managed_restaurant_ids(request):
+        logger.warning(f"Unauthorized attempt by user: {request.user} on restaurant: {restaurant_id}")
+        raise PermissionDenied(message)
+
+
+class CanManageRestaurant(permissions.IsAuthenticated):
+    """
+    Object permission for restaurant-scoped writes: the user must own or
+    manage the object's restaurant. Works for ``Restaurant`` objects and for
+    any object with a ``restaurant`` foreign key, without loading the
+    restaurant, its owner or its managers.
+    """
+    message = "You do not have permission to manage this restaurant."
+
+    def has_object_permission(self, request, view, obj):
+        restaurant_id = obj.pk if isinstance(obj, Restaurant) else obj.restaurant_id
+        if restaurant_id is not None and restaurant_id in managed_restaurant_ids(request):
+            return True
+        logger.warning(f"Unauthorized {request.method} by user: {request.user} on {obj.__class__.__name__}: {obj.pk}")
+        return False
@@ -0,0 +1,47 @@
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections, DEFAULT_DB_ALIAS
+from django.test.utils import CaptureQueriesContext
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries, using=DEFAULT_DB_ALIAS):
+    """
+    Fail with ``QueryBudgetExceeded`` if the wrapped block runs more than
+    ``max_queries`` queries. Yields the capture context so callers can inspect
+    ``captured_queries``.
+    """
+    with CaptureQueriesContext(connections[using]) as context:
+        yield context
+    if len(context) > max_queries:
+        statements = '\n'.join(query['sql'] for query in context.captured_queries)
+        raise QueryBudgetExceeded(f"{len(context)} queries executed, budget is {max_queries}:\n{statements}")
+
+
+class QueryBudgetMixin:
+    """
+    View mixin that counts the queries of every request when the
+    ``QUERY_BUDGET_CHECKS`` setting is on and logs a warning when a request
+    goes over the view's ``query_budget``.
+    """
+    query_budget = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.query_budget is None or not getattr(settings, 'QUERY_BUDGET_CHECKS', False):
+            return super().dispatch(request, *args, **kwargs)
+
+        with CaptureQueriesContext(connections[DEFAULT_DB_ALIAS]) as context:
+            response = super().dispatch(request, *args, **kwargs)
+        if len(context) > self.query_budget:
+            logger.warning(
+                f"{self.__class__.__name__} ran {len(context)} queries for {request.method} {request.path}, "
+                f"budget is {self.query_budget}"
+            )
+        return response
@@ -0,0 +1,165 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone as dt_timezone
+from django.conf import settings
+from django.utils import timezone
+from rest_framework_simplejwt.settings import api_settings
+from foodie_app.models import RevokedToken
+import logging
+
+logger = logging.getLogger(__name__)
+
+BLOOM_HASHES = 7
+
+
+class BloomFilter:
+    """Set of strings with no false negatives and rare false positives, in a fixed number of bits."""
+
+    def __init__(self, bits):
+        self.bits = bits
+        self.array = bytearray((bits + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first, step = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * step) % self.bits for i in range(BLOOM_HASHES)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.array[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.array[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class _RevocationList:
+    def __init__(self, bloom, cutoffs, synced_at):
+        self.bloom = bloom
+        # user id -> tokens issued before this Unix time, in fractional seconds, are revoked
+        self.cutoffs = cutoffs
+        self.synced_at = synced_at
+
+
+_state = None
+_sync_lock = threading.Lock()
+_confirmed_lock = threading.Lock()
+# jti -> whether the table has it, for JTIs the Bloom filter matched. Revocations stay
+# true until the token expires, so only the false answers are dropped on sync.
+_confirmed = OrderedDict()
+
+
+def _max_lifetime():
+    return max(api_settings.ACCESS_TOKEN_LIFETIME, api_settings.REFRESH_TOKEN_LIFETIME)
+
+
+def _load(previous):
+    now = timezone.now()
+    bloom = BloomFilter(settings.TOKEN_REVOCATION_BLOOM_BITS)
+    cutoffs = {}
+    rows = RevokedToken.objects.filter(expires_at__gt=now).values_list('jti', 'user_id', 'issued_before')
+    for jti, user_id, issued_before in rows.iterator():
+        if jti is not None:
+            bloom.add(jti)
+        else:
+            cutoffs[user_id] = max(cutoffs.get(user_id, 0), issued_before.timestamp())
+
+    if previous is not None:
+        # Keep cutoffs added locally while the rows were read
+        oldest = (now - _max_lifetime()).timestamp()
+        for user_id, cutoff in previous.cutoffs.items():
+            if cutoff > max(cutoffs.get(user_id, 0), oldest):
+                cutoffs[user_id] = cutoff
+    return _RevocationList(bloom, cutoffs, time.monotonic())
+
+
+def _current():
+    global _state, _confirmed
+    state = _state
+    if state is not None and time.monotonic() - state.synced_at < settings.TOKEN_REVOCATION_SYNC_INTERVAL:
+        return state
+    with _sync_lock:
+        if _state is state:
+            _state = _load(state)
+            with _confirmed_lock:
+                _confirmed = OrderedDict((jti, True) for jti, revoked in _confirmed.items() if revoked)
+        return _state
+
+
+def _remember(jti, revoked):
+    with _confirmed_lock:
+        _confirmed[jti] = revoked
+        _confirmed.move_to_end(jti)
+        while len(_confirmed) > settings.TOKEN_REVOCATION_LRU_SIZE:
+            _confirmed.popitem(last=False)
+
+
+def is_revoked(token):
+    """
+    Whether ``token`` was revoked, without a query for almost every token.
+
+    The user cutoffs and a Bloom filter of revoked JTIs are reloaded from
+    ``RevokedToken`` every ``TOKEN_REVOCATION_SYNC_INTERVAL`` seconds. Only
+    JTIs the filter matches are looked up, and the answers are kept in a
+    bounded LRU.
+
+    Tokens issued here carry a fractional ``iat`` (see ``issued_now``), so a
+    login right after ``revoke_user_tokens`` is not caught by its cutoff.
+    Whole-second ``iat`` values of other tokens are revoked for the whole
+    second the cutoff falls in.
+    """
+    state = _current()
+    if token.get('iat', 0) < state.cutoffs.get(token.get(api_settings.USER_ID_CLAIM), float('-inf')):
+        return True
+
+    jti = token.get(api_settings.JTI_CLAIM)
+    if jti is None:
+        return False
+    with _confirmed_lock:
+        revoked = _confirmed.get(jti)
+        if revoked is not None:
+            _confirmed.move_to_end(jti)
+    if revoked is None:
+        if jti not in state.bloom:
+            return False
+        revoked = RevokedToken.objects.filter(jti=jti).exists()
+        _remember(jti, revoked)
+    return revoked
+
+
+def issued_now(token):
+    """
+    Set ``token``'s ``iat`` to its issue time in fractional seconds; simplejwt
+    truncates it to whole seconds. Access tokens made from a refresh token copy it.
+    """
+    token['iat'] = token.current_time.timestamp()
+    return token
+
+
+def prune_revoked_tokens():
+    """Delete the rows of tokens that have expired anyway. Returns the number deleted."""
+    deleted, _ = RevokedToken.objects.filter(expires_at__lte=timezone.now()).delete()
+    return deleted
+
+
+def revoke_token(token):
+    """Revoke one access or refresh token, e.g. on logout. Other processes notice it on their next sync."""
+    jti = token[api_settings.JTI_CLAIM]
+    expires_at = datetime.fromtimestamp(token['exp'], tz=dt_timezone.utc)
+    RevokedToken.objects.get_or_create(jti=jti, defaults={'expires_at': expires_at})
+    # Writes are rare next to reads, so they also keep the table compact
+    prune_revoked_tokens()
+    _current().bloom.add(jti)
+    _remember(jti, True)
+    logger.info(f"Revoked token {jti}")
+
+
+def revoke_user_tokens(user_id):
+    """Revoke every token issued to ``user_id`` so far, signing them out everywhere."""
+    now = timezone.now()
+    RevokedToken.objects.create(user_id=user_id, issued_before=now, expires_at=now + _max_lifetime())
+    prune_revoked_tokens()
+    state = _current()
+    state.cutoffs[user_id] = max(state.cutoffs.get(user_id, 0), now.timestamp())
+    logger.info(f"Revoked all tokens of user {user_id}")
@@ -0,0 +1,48 @@
+import threading
+import time
+from django.conf import settings
+from django.db import close_old_connections
+import logging
+
+logger = logging.getLogger(__name__)
+
+_started = threading.Event()
+
+
+def _run_periodically(interval, job):
+    while True:
+        time.sleep(interval)
+        try:
+            job()
+        except Exception:
+            logger.exception(f"Scheduled job {job.__name__} failed")
+        finally:
+            close_old_connections()
+
+
+def _jobs():
+    from foodie_app.services.like_service import fold_like_counters
+    from foodie_app.services.story_service import purge_expired_stories
+
+    return [
+        (settings.STORY_PURGE_INTERVAL, purge_expired_stories),
+        (settings.LIKE_COUNTER_FOLD_INTERVAL, fold_like_counters),
+    ]
+
+
+def start_scheduler():
+    """
+    Run each periodic job in a daemon thread of the current process, every
+    ``<JOB>_INTERVAL`` seconds. Jobs with an interval of 0 are disabled;
+    deployments with a cron or worker dyno run the matching management
+    commands instead.
+    """
+    if _started.is_set():
+        return
+    _started.set()
+
+    for interval, job in _jobs():
+        if not interval:
+            continue
+        threading.Thread(target=_run_periodically, args=(interval, job), name=job.__name__, daemon=True).start()
+        logger.info(f"Running {job.__name__} every {interval}s")
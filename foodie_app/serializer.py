@@ -1,22 +1,66 @@
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import authenticate
+from django.contrib.auth.models import update_last_login
+from django.contrib.auth.validators import UnicodeUsernameValidator
 from foodie_app.models import (
     User, Profile, Post, Story, Restaurant, RestaurantReview, Food, Order,
-    Reservation, Cart, OrderItem, Booking, Accommodation, Manager, CartItem
+    Reservation, Cart, OrderItem, Booking, Accommodation, AccommodationRate, Manager, CartItem, Comments
 )
+from foodie_app.authentication import token_claims
+from foodie_app.images import rendition_urls
+from foodie_app.revocation import is_revoked, issued_now
+from foodie_app.services.booking_service import validate_stay
+from foodie_app.services.like_service import like_count
+from foodie_app.services.registration_service import register_user
 import logging
 from datetime import timedelta
+from decimal import Decimal
 from django.utils import timezone
 
 logger = logging.getLogger(__name__)
 
+
+class ImageRenditionsField(serializers.ReadOnlyField):
+    """URLs of an image and its thumbnail/medium/WebP renditions."""
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', 'image')
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        urls = rendition_urls(value)
+        request = self.context.get('request')
+        if urls and request is not None:
+            urls = {name: url and request.build_absolute_uri(url) for name, url in urls.items()}
+        return urls
+
+
+class LikeCountField(serializers.ReadOnlyField):
+    """
+    ``likes`` of a post or story plus its like counter deltas not folded in
+    yet, read from ``with_like_counts()`` or else queried for the object.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault('source', '*')
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        count = getattr(obj, 'current_likes', None)
+        return like_count(obj) if count is None else count
+
 class UserSerializer(serializers.ModelSerializer):
+    image_renditions = ImageRenditionsField()
     class Meta:
         model = User
         fields = (
-            'id', 'username', 'email', 'image', 'full_name', 'phone_number',
+            'id', 'username', 'email', 'image', 'image_renditions', 'full_name', 'phone_number',
             'country', 'city', 'address', 'postal_code'
         )
         extra_kwargs = {'password': {'write_only': True}}
@@ -24,13 +68,20 @@ class UserSerializer(serializers.ModelSerializer):
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     username_field = 'email'
 
+    @classmethod
+    def get_token(cls, user):
+        token = issued_now(super().get_token(user))
+        for claim, value in token_claims(user).items():
+            token[claim] = value
+        return token
+
     def validate(self, attrs):
         credentials = {
             'email': attrs.get('email'),
             'password': attrs.get('password'),
         }
 
-        user = authenticate(**credentials)
+        user = authenticate(self.context.get('request'), **credentials)
 
         if user is None:
             logger.error(f"Authentication failed for email: {credentials['email']}")
@@ -40,9 +91,34 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
             logger.error(f"Inactive user account attempted to login: {user.email}")
             raise serializers.ValidationError({'detail': 'User account is disabled'}, code='authorization')
 
-        return super().validate(attrs)
+        # Issued here instead of in super().validate(), which would authenticate and hash the password again
+        self.user = user
+        refresh = self.get_token(user)
+        if jwt_settings.UPDATE_LAST_LOGIN:
+            update_last_login(None, user)
+        return {'refresh': str(refresh), 'access': str(refresh.access_token)}
     
 
+class MyTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Rejects revoked refresh tokens, and issues access tokens with the user's
+    current claims instead of the ones copied from the refresh token.
+    """
+
+    def validate(self, attrs):
+        if is_revoked(self.token_class(attrs['refresh'])):
+            raise InvalidToken("Token has been revoked")
+        data = super().validate(attrs)
+        access = AccessToken(data['access'], verify=False)
+        user = User.objects.filter(pk=access[jwt_settings.USER_ID_CLAIM], is_active=True).first()
+        if user is None:
+            raise AuthenticationFailed("User not found or inactive.", code='user_inactive')
+        for claim, value in token_claims(user).items():
+            access[claim] = value
+        data['access'] = str(access)
+        return data
+
+
 class RegisterSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
     image = serializers.ImageField(required=False, allow_null=True)
@@ -53,44 +129,22 @@ class RegisterSerializer(serializers.ModelSerializer):
             'username', 'email', 'password',
             'full_name', 'phone_number', 'country', 'city', 'address', 'postal_code', 'image', 'is_business_owner',
         )
-
-    def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
-            logger.warning(f"Attempt to register with existing email: {value}")
-            raise serializers.ValidationError("A user with this email already exists.")
-        return value
-
-    def validate_username(self, value):
-        if User.objects.filter(username=value).exists():
-            logger.warning(f"Attempt to register with existing username: {value}")
-            raise serializers.ValidationError("A user with this username already exists.")
-        return value
+        # Without the unique validators' lookups; register_user reports duplicates from the constraints
+        extra_kwargs = {
+            'username': {'validators': [UnicodeUsernameValidator()]},
+            'email': {'validators': []},
+        }
 
     def create(self, validated_data):
-        try:
-            password = validated_data.pop('password')
-            user = User(**validated_data)
-            user.set_password(password)
-            user.save()
-
-            profile_data = {
-                'user': user,
-                'username': user.username,
-                'image': validated_data.get('image')  
-            }
-            Profile.objects.create(**profile_data)
-            logger.info(f"User and profile created successfully: {user.email}")
-
-            return user
-        except Exception as e:
-            logger.error(f"Error creating user and profile: {e}")
-            raise serializers.ValidationError("User and profile created successfully")
+        return register_user(**validated_data)
 
 class PostSerializer(serializers.ModelSerializer):
+    image_renditions = ImageRenditionsField()
+    likes = LikeCountField()
     class Meta:
         model = Post
-        fields = ['id', 'author', 'content', 'image', 'created_at', 'comments', 'likes']
-        read_only_fields = ['author', 'comments', 'likes']
+        fields = ['id', 'author', 'content', 'image', 'image_renditions', 'created_at', 'comment_count', 'likes']
+        read_only_fields = ['author', 'comment_count', 'likes']
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -109,10 +163,12 @@ class PostSerializer(serializers.ModelSerializer):
 
 
 class StorySerializer(serializers.ModelSerializer):
+    image_renditions = ImageRenditionsField()
+    likes = LikeCountField()
     class Meta:
         model = Story
-        fields = ['id', 'author', 'content', 'image', 'created_at', 'expires_at', 'comments', 'likes']
-        read_only_fields = ['author', 'comments', 'likes', 'expires_at', 'created_at']
+        fields = ['id', 'author', 'content', 'image', 'image_renditions', 'created_at', 'expires_at', 'comment_count', 'likes']
+        read_only_fields = ['author', 'comment_count', 'likes', 'expires_at', 'created_at']
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -129,25 +185,70 @@ class StorySerializer(serializers.ModelSerializer):
         return story
 
 
+class CommentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Comments
+        fields = ['id', 'author', 'content', 'created_at', 'post', 'story']
+        read_only_fields = ['author', 'created_at', 'post', 'story']
+
+
+class PostSummarySerializer(serializers.ModelSerializer):
+    image_renditions = ImageRenditionsField()
+    likes = LikeCountField()
+    class Meta:
+        model = Post
+        fields = ['id', 'content', 'image', 'image_renditions', 'created_at', 'comment_count', 'likes']
+        read_only_fields = fields
+
+
+class ProfileSummarySerializer(serializers.ModelSerializer):
+    image_renditions = ImageRenditionsField()
+    is_following = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Profile
+        fields = ['id', 'user', 'username', 'image', 'image_renditions', 'followers_count', 'is_following']
+        read_only_fields = fields
+
+    def get_is_following(self, obj):
+        # Set of followed profile ids, resolved once per page by the view
+        return obj.pk in self.context.get('following_ids', ())
+
+
 class ProfileSerializer(serializers.ModelSerializer):
-    posts = PostSerializer(many=True, read_only=True)
-    stories = StorySerializer(many=True, read_only=True)
+    image_renditions = ImageRenditionsField()
+    # Expects a Profile.objects.with_summary() instance
     is_business_owner = serializers.BooleanField(source='user.is_business_owner', read_only=True)
+    followers_count = serializers.IntegerField(read_only=True)
+    following_count = serializers.IntegerField(read_only=True)
+    post_count = serializers.IntegerField(read_only=True)
+    recent_posts = PostSummarySerializer(source='user.recent_posts', many=True, read_only=True)
 
     class Meta:
         model = Profile
-        fields = ['user', 'username', 'bio', 'image', 'followers_number', 'following', 'posts', 'stories', 'is_business_owner']
-        read_only_fields = ['user', 'posts', 'stories', 'followers_number', 'following', 'is_business_owner']
+        fields = [
+            'id', 'user', 'username', 'bio', 'image', 'image_renditions', 'is_business_owner',
+            'followers_count', 'following_count', 'post_count', 'recent_posts',
+        ]
+        read_only_fields = ['id', 'user', 'is_business_owner', 'followers_count', 'following_count']
         
 class RestaurantReviewSerializer(serializers.ModelSerializer): 
     class Meta:
         model = RestaurantReview
         fields = ['id', 'restaurant', 'user', 'rating', 'review', 'created_at']
+        read_only_fields = ['id', 'restaurant', 'user', 'created_at']
 
 class RestaurantSerializer(serializers.ModelSerializer):
+    image_renditions = ImageRenditionsField()
+    rating_histogram = serializers.ReadOnlyField()
+
     class Meta:
         model = Restaurant
-        fields = ['id', 'name', 'city', 'country', 'address', 'phone_number', 'image', 'description']
+        fields = [
+            'id', 'name', 'city', 'country', 'address', 'phone_number', 'image', 'image_renditions', 'description',
+            'rating_count', 'rating_average', 'rating_histogram',
+        ]
+        read_only_fields = ['rating_count', 'rating_average']
 
     def create(self, validated_data):
         request = self.context.get('request')
@@ -180,12 +281,13 @@ class OrderItemSerializer(serializers.ModelSerializer):
 
 class OrderSerializer(serializers.ModelSerializer):
     order_items = OrderItemSerializer(many=True, read_only=True)
+    restaurant_name = serializers.ReadOnlyField(source='restaurant.name')
     total_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
 
     class Meta:
         model = Order
-        fields = ['id', 'user', 'restaurant', 'status', 'order_time', 'estimated_delivery_time', 'total_price', 'order_items']
-        read_only_fields = ['id', 'user', 'order_time', 'estimated_delivery_time', 'total_price']
+        fields = ['id', 'user', 'restaurant', 'restaurant_name', 'status', 'order_time', 'estimated_delivery_time', 'subtotal', 'item_count', 'total_price', 'order_items']
+        read_only_fields = ['id', 'user', 'order_time', 'estimated_delivery_time', 'subtotal', 'item_count', 'total_price']
 
     def create(self, validated_data):
         order = Order.objects.create(**validated_data)
@@ -193,7 +295,7 @@ class OrderSerializer(serializers.ModelSerializer):
 
 class CartItemSerializer(serializers.ModelSerializer):
     food_name = serializers.CharField(source='food.name', read_only=True)
-    food_price = serializers.DecimalField(source='food.price', max_digits=10, decimal_places=2, read_only=True)
+    food_price = serializers.DecimalField(source='price', max_digits=10, decimal_places=2, read_only=True)
     total_price = serializers.SerializerMethodField()
 
     class Meta:
@@ -205,56 +307,49 @@ class CartItemSerializer(serializers.ModelSerializer):
 
 class CartSerializer(serializers.ModelSerializer):
     cart_items = CartItemSerializer(many=True, read_only=True)
-    total_price = serializers.ReadOnlyField()
+    total_price = serializers.ReadOnlyField(source='subtotal')
 
     class Meta:
         model = Cart
-        fields = ['id', 'user', 'cart_items', 'total_price']
-        read_only_fields = ['id', 'user', 'total_price']
-    
-class CartItemSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = CartItem
-        fields = ['id', 'food', 'quantity', 'price']
+        fields = ['id', 'user', 'cart_items', 'item_count', 'total_price']
+        read_only_fields = ['id', 'user', 'item_count', 'total_price']
 
-class CartSerializer(serializers.ModelSerializer):
-    cart_items = CartItemSerializer(many=True, read_only=True)
 
-    class Meta:
-        model = Cart
-        fields = ['id', 'user', 'cart_items', 'total_price']
-        read_only_fields = ['id', 'user']
-        
 class ReservationSerializer(serializers.ModelSerializer):
+    number_of_people = serializers.IntegerField(min_value=1)
+
     class Meta:
         model = Reservation
-        fields = ['id', 'user', 'restaurant', 'reservation_date', 'number_of_people', 'special_requests', 'reservation_type']
-        read_only_fields = ['id', 'user']
+        fields = ['id', 'user', 'restaurant', 'reservation_date', 'number_of_people', 'special_requests', 'reservation_type', 'slot']
+        read_only_fields = ['id', 'user', 'slot']
 
 
 class BookingSerializer(serializers.ModelSerializer):
+    number_of_guests = serializers.IntegerField(min_value=1)
+
     class Meta:
         model = Booking
-        fields = ['id', 'user', 'accommodation', 'check_in_date', 'check_out_date', 'number_of_guests', 'special_requests']
-        read_only_fields = ['id', 'user']
+        fields = ['id', 'user', 'accommodation', 'check_in_date', 'check_out_date', 'number_of_guests', 'special_requests', 'total_price']
+        read_only_fields = ['id', 'user', 'total_price']
+
+    def validate(self, attrs):
+        check_in_date = attrs.get('check_in_date', getattr(self.instance, 'check_in_date', None))
+        check_out_date = attrs.get('check_out_date', getattr(self.instance, 'check_out_date', None))
+        validate_stay(check_in_date, check_out_date)
+        return attrs
+
 
-    def create(self, validated_data):
-        try:
-            booking = super().create(validated_data)
-            logger.info(f"Booking created successfully for user: {booking.user.username}")
-            return booking
-        except Exception as e:
-            logger.error(f"Error creating booking: {e}")
-            raise serializers.ValidationError("An error occurred while creating the booking.")
-    def validate_accommodation(self, value):
-        if not Accommodation.objects.filter(id=value.id).exists():
-            raise serializers.ValidationError("Accommodation does not exist.")
-        return value
-    
 class AccommodationSerializer(serializers.ModelSerializer):
+    image_renditions = ImageRenditionsField()
+    # Only present on querysets annotated with ``with_quote``
+    quoted_total = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+
     class Meta:
         model = Accommodation
-        fields = ['id', 'name', 'address', 'city', 'country', 'description', 'image', 'restaurant', 'price_per_night']
+        fields = [
+            'id', 'name', 'address', 'city', 'country', 'description', 'image', 'image_renditions', 'restaurant',
+            'price_per_night', 'weekend_price_per_night', 'quoted_total',
+        ]
         read_only_fields = ['id']
 
     def create(self, validated_data):
@@ -267,6 +362,20 @@ class AccommodationSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("An error occurred while creating the accommodation.")
 
 
+class AccommodationRateSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AccommodationRate
+        fields = ['date', 'price_per_night']
+
+
+class RateRangeSerializer(serializers.Serializer):
+    start_date = serializers.DateField()
+    end_date = serializers.DateField()
+    price_per_night = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0'))
+    # ISO weekdays (1 = Monday) the rate applies to; every day when empty
+    weekdays = serializers.ListField(child=serializers.IntegerField(min_value=1, max_value=7), required=False)
+
+
 class ManagerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Manager
@@ -0,0 +1,75 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Q
+from rest_framework.exceptions import ValidationError
+from foodie_app.models import Accommodation, Booking
+from foodie_app.services.pricing_service import quote
+import logging
+
+logger = logging.getLogger(__name__)
+
+OVERLAP_MESSAGE = "The accommodation is already booked for some of these dates."
+
+
+def validate_stay(check_in_date, check_out_date):
+    if check_out_date <= check_in_date:
+        raise ValidationError({"check_out_date": "Check-out must be after check-in."})
+
+
+def overlapping(check_in_date, check_out_date):
+    """``Q`` matching bookings whose stay overlaps ``[check_in_date, check_out_date)``."""
+    return Q(check_in_date__lt=check_out_date, check_out_date__gt=check_in_date)
+
+
+def _save(booking):
+    """
+    Save ``booking`` unless it overlaps another booking of its accommodation.
+    The lookup gives a readable error; on PostgreSQL the booking_no_overlap
+    exclusion constraint also rejects the concurrent bookings that slip past it.
+    """
+    validate_stay(booking.check_in_date, booking.check_out_date)
+    conflicts = Booking.objects.filter(
+        overlapping(booking.check_in_date, booking.check_out_date), accommodation_id=booking.accommodation_id
+    ).exclude(pk=booking.pk)
+    if conflicts.exists():
+        raise ValidationError({"check_in_date": OVERLAP_MESSAGE})
+    try:
+        with transaction.atomic():
+            booking.save()
+    except IntegrityError:
+        raise ValidationError({"check_in_date": OVERLAP_MESSAGE})
+    return booking
+
+
+def book(user, accommodation, check_in_date, check_out_date, **fields):
+    validate_stay(check_in_date, check_out_date)
+    booking = _save(Booking(
+        user=user, accommodation=accommodation, check_in_date=check_in_date, check_out_date=check_out_date,
+        total_price=quote(accommodation, check_in_date, check_out_date), **fields
+    ))
+    logger.info(f"Booking {booking.pk} created for accommodation {accommodation.pk} by user: {user.username}")
+    return booking
+
+
+def update_booking(booking, **changes):
+    """Apply ``changes``, quoting the stay again when its dates or accommodation change."""
+    for field, value in changes.items():
+        setattr(booking, field, value)
+    if {'accommodation', 'check_in_date', 'check_out_date'} & changes.keys():
+        validate_stay(booking.check_in_date, booking.check_out_date)
+        booking.total_price = quote(booking.accommodation, booking.check_in_date, booking.check_out_date)
+    return _save(booking)
+
+
+def available_accommodations(city, check_in_date, check_out_date):
+    """
+    Accommodations in ``city`` with no booking overlapping the stay, as one
+    ``NOT EXISTS`` anti-join probing the bookings' range index, each quoted
+    for the stay.
+    """
+    validate_stay(check_in_date, check_out_date)
+    booked = Booking.objects.filter(overlapping(check_in_date, check_out_date), accommodation=OuterRef('pk'))
+    return (
+        Accommodation.objects.filter(~Exists(booked), city=city)
+        .with_quote(check_in_date, check_out_date)
+        .order_by('id')
+    )
@@ -0,0 +1,116 @@
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import F, OuterRef, Prefetch, Subquery
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from foodie_app.models import Cart, CartItem, Food
+from foodie_app.services.line_items import missing_foods_error, parse_line_items, stored_totals
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def parse_cart_lines(cart_items_data):
+    return parse_line_items(cart_items_data, 'cart')
+
+
+def get_cart(**lookup):
+    """
+    Load a cart together with its items and their foods in two queries.
+    """
+    return Cart.objects.prefetch_related(
+        Prefetch('cart_items', queryset=CartItem.objects.select_related('food').order_by('id'))
+    ).get(**lookup)
+
+
+def _apply_totals_delta(cart, subtotal_delta, count_delta):
+    Cart.objects.filter(pk=cart.pk).update(
+        subtotal=F('subtotal') + subtotal_delta,
+        item_count=F('item_count') + count_delta,
+        updated_at=timezone.now(),
+    )
+
+
+def upsert_cart_items(cart, lines):
+    """
+    Set the quantity of every ``{food_id: quantity}`` line in ``cart``.
+
+    Foods are resolved with a single ``in_bulk`` lookup and all lines are
+    written with one ``INSERT ... ON CONFLICT (cart, food) DO UPDATE``. The
+    cart's stored ``subtotal``/``item_count`` are moved by the difference
+    against the replaced lines, and the refreshed cart is read back inside the
+    same transaction.
+    """
+    foods = Food.objects.in_bulk(list(lines))
+    missing = set(lines) - set(foods)
+    if missing:
+        raise NotFound(missing_foods_error(missing))
+
+    with transaction.atomic():
+        # Lock the cart row so concurrent syncs apply their deltas one at a time
+        Cart.objects.select_for_update().only('pk').get(pk=cart.pk)
+        previous = list(
+            CartItem.objects.filter(cart=cart, food_id__in=list(lines)).values_list('quantity', 'price')
+        )
+
+        subtotal_delta = sum(foods[food_id].price * quantity for food_id, quantity in lines.items())
+        subtotal_delta -= sum((price * quantity for quantity, price in previous), Decimal('0'))
+        count_delta = sum(lines.values()) - sum(quantity for quantity, price in previous)
+
+        CartItem.objects.bulk_create(
+            [
+                CartItem(cart=cart, food=foods[food_id], quantity=quantity, price=foods[food_id].price)
+                for food_id, quantity in lines.items()
+            ],
+            update_conflicts=True,
+            unique_fields=['cart', 'food'],
+            update_fields=['quantity', 'price'],
+        )
+        _apply_totals_delta(cart, subtotal_delta, count_delta)
+        cart = get_cart(pk=cart.pk)
+
+    logger.info(f"Cart {cart.id} synced with {len(lines)} item(s)")
+    return cart
+
+
+def remove_cart_item(cart, item_id):
+    """
+    Delete a single cart item and subtract it from the cart's stored totals.
+    """
+    with transaction.atomic():
+        # The same cart lock as upsert_cart_items, so a concurrent sync cannot move this line meanwhile
+        Cart.objects.select_for_update().only('pk').get(pk=cart.pk)
+        item = CartItem.objects.filter(cart=cart, pk=item_id).first()
+        if item is None:
+            raise NotFound("Cart item not found.")
+        item.delete()
+        _apply_totals_delta(cart, -item.price * item.quantity, -item.quantity)
+    logger.info(f"Cart item {item_id} removed from cart {cart.id}")
+
+
+def drop_food_from_carts(food_id):
+    """
+    Subtract the lines of ``food_id`` from the stored totals of the carts
+    holding it. Runs right before the food, and with it those lines, is
+    deleted; a cascade deletes several foods, so each subtracts only its own.
+    """
+    lines = CartItem.objects.filter(cart=OuterRef('pk'), food_id=food_id)
+    Cart.objects.filter(pk__in=CartItem.objects.filter(food_id=food_id).values('cart_id')).update(
+        subtotal=F('subtotal') - Subquery(lines.values(total=F('price') * F('quantity'))[:1]),
+        item_count=F('item_count') - Subquery(lines.values('quantity')[:1]),
+        updated_at=timezone.now(),
+    )
+
+
+def reconcile_cart_totals(reprice=False):
+    """
+    Rebuild ``subtotal``/``item_count`` of every cart from its items. With
+    ``reprice`` the unit price captured on each item is first refreshed from
+    the current food price. Returns the number of carts updated.
+    """
+    with transaction.atomic():
+        if reprice:
+            CartItem.objects.update(
+                price=Subquery(Food.objects.filter(pk=OuterRef('food_id')).values('price')[:1])
+            )
+        return Cart.objects.update(**stored_totals(CartItem.objects.filter(cart=OuterRef('pk')).values('cart')))
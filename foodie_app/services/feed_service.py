@@ -0,0 +1,151 @@
+import base64
+from datetime import datetime
+from django.conf import settings
+from django.db.models import Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from rest_framework.exceptions import ValidationError
+from foodie_app.models import FeedEntry, Follow, Post, Profile, current_likes
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Feeds written or trimmed per batch
+FEED_BATCH_SIZE = 1000
+
+
+def fan_out_post(post_id):
+    """
+    Write a feed entry for post ``post_id`` into the feeds of its author and
+    every follower of the author, trimming each of those feeds back to
+    ``FEED_MAX_LENGTH`` entries. Runs on the task queue after the post commits.
+
+    Authors with more than ``FEED_FANOUT_FOLLOWER_LIMIT`` followers are switched
+    to fan-out-on-read instead: their posts are only written to their own feed
+    and followers pull them when reading.
+    """
+    post = Post.objects.filter(pk=post_id).only('author_id', 'created_at').first()
+    if post is None:
+        # Deleted before the task ran
+        return
+
+    profile = Profile.objects.filter(user_id=post.author_id).values('id', 'fanout_on_read', 'followers_count').first()
+    owner_ids = [post.author_id]
+
+    if profile is not None and not profile['fanout_on_read']:
+        if profile['followers_count'] > settings.FEED_FANOUT_FOLLOWER_LIMIT:
+            Profile.objects.filter(pk=profile['id']).update(fanout_on_read=True)
+            logger.info(f"User {post.author_id} switched to fan-out-on-read")
+        else:
+            owner_ids += Profile.objects.filter(following=profile['id']).values_list('user_id', flat=True)
+
+    owner_ids = list(set(owner_ids))
+    for start in range(0, len(owner_ids), FEED_BATCH_SIZE):
+        batch = owner_ids[start:start + FEED_BATCH_SIZE]
+        FeedEntry.objects.bulk_create(
+            [FeedEntry(owner_id=owner_id, post=post, author_id=post.author_id, created_at=post.created_at) for owner_id in batch],
+            ignore_conflicts=True,
+        )
+        _trim(batch, settings.FEED_MAX_LENGTH)
+
+
+def drop_unfollowed_posts(follower_id, followee_id):
+    """
+    Remove the posts of profile ``followee_id`` from the feed of profile
+    ``follower_id``, unless it has followed them again since. Runs on the task
+    queue after an unfollow commits; the scan is bounded by the feed length.
+    """
+    if Follow.objects.filter(follower_id=follower_id, followee_id=followee_id).exists():
+        return
+    deleted = FeedEntry.objects.filter(owner__profile=follower_id, author__profile=followee_id).delete()[0]
+    logger.info(f"Dropped {deleted} feed entries of profile {followee_id} from profile {follower_id}")
+
+
+def encode_cursor(created_at, post_id):
+    return base64.urlsafe_b64encode(f'{created_at.isoformat()}|{post_id}'.encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        created_at, post_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(created_at), int(post_id)
+    except (ValueError, UnicodeDecodeError):
+        raise ValidationError({"cursor": "Invalid cursor."})
+
+
+def _before(cursor, created_at_field, id_field):
+    created_at, post_id = cursor
+    return Q(**{f'{created_at_field}__lt': created_at}) | Q(
+        **{created_at_field: created_at, f'{id_field}__lt': post_id}
+    )
+
+
+def get_feed_page(user, cursor=None, limit=20):
+    """
+    Return ``(posts, next_cursor)`` for one page of ``user``'s home feed,
+    newest first.
+
+    Pushed posts come from a range scan over the user's feed entries; posts of
+    followed fan-out-on-read authors are read from their own post index and
+    merged in.
+    """
+    entries = FeedEntry.objects.filter(owner=user).select_related('post').annotate(
+        post_current_likes=current_likes('post', 'post__')
+    )
+    pulled = Post.objects.with_like_counts().filter(
+        author__profile__in=Profile.objects.filter(follower_profiles__user=user, fanout_on_read=True)
+    )
+    if cursor is not None:
+        position = decode_cursor(cursor)
+        entries = entries.filter(_before(position, 'created_at', 'post_id'))
+        pulled = pulled.filter(_before(position, 'created_at', 'id'))
+
+    posts = {}
+    for entry in entries.order_by('-created_at', '-post_id')[:limit + 1]:
+        entry.post.current_likes = entry.post_current_likes
+        posts[entry.post_id] = entry.post
+    for post in pulled.order_by('-created_at', '-id')[:limit + 1]:
+        posts.setdefault(post.id, post)
+
+    page = sorted(posts.values(), key=lambda post: (post.created_at, post.id), reverse=True)
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        next_cursor = encode_cursor(page[-1].created_at, page[-1].id)
+
+    return page, next_cursor
+
+
+def trim_feeds(max_length=None):
+    """
+    Delete the oldest entries of every feed longer than ``max_length``
+    (``FEED_MAX_LENGTH`` by default). Returns the number of entries deleted.
+    """
+    max_length = max_length or settings.FEED_MAX_LENGTH
+    owners = list(
+        FeedEntry.objects.values('owner')
+        .annotate(entries=Count('id'))
+        .filter(entries__gt=max_length)
+        .values_list('owner', flat=True)
+    )
+
+    deleted = 0
+    for start in range(0, len(owners), FEED_BATCH_SIZE):
+        deleted += _trim(owners[start:start + FEED_BATCH_SIZE], max_length)
+    return deleted
+
+
+def _trim(owner_ids, max_length):
+    # Entries past the newest max_length of each owner's feed, in one pass over their index range
+    overflow = (
+        FeedEntry.objects.filter(owner_id__in=owner_ids)
+        .annotate(position=Window(
+            RowNumber(), partition_by=F('owner_id'), order_by=[F('created_at').desc(), F('post_id').desc()]
+        ))
+        .filter(position__gt=max_length)
+        .values_list('pk', flat=True)
+    )
+    overflow = list(overflow)
+    if not overflow:
+        return 0
+    return FeedEntry.objects.filter(pk__in=overflow).delete()[0]
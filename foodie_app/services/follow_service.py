@@ -0,0 +1,67 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+from foodie_app.models import Follow, Profile
+from foodie_app.services.feed_service import drop_unfollowed_posts
+from foodie_app.tasks import enqueue
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def apply_follow_counts(follower_ids, followee_ids, sign):
+    """
+    Add ``sign`` to ``following_count`` of every follower and to
+    ``followers_count`` of every followee, once per edge. Ids may repeat.
+    """
+    # One UPDATE per distinct delta, in pk order so concurrent follows lock rows consistently
+    for field, ids in (('following_count', follower_ids), ('followers_count', followee_ids)):
+        deltas = {}
+        for profile_id in ids:
+            deltas[profile_id] = deltas.get(profile_id, 0) + sign
+        by_delta = {}
+        for profile_id, delta in sorted(deltas.items()):
+            by_delta.setdefault(delta, []).append(profile_id)
+        for delta, profile_ids in by_delta.items():
+            Profile.objects.filter(pk__in=profile_ids).update(**{field: F(field) + delta})
+
+
+def follow(follower, followee):
+    """Make ``follower`` follow ``followee``. Returns False if it already did."""
+    if follower.pk == followee.pk:
+        raise ValidationError({"detail": "You cannot follow yourself."})
+    try:
+        with transaction.atomic():
+            Follow.objects.create(follower=follower, followee=followee)
+    except IntegrityError:
+        return False
+    logger.info(f"Profile {follower.pk} followed {followee.pk}")
+    return True
+
+
+def unfollow(follower, followee):
+    """Remove the follow edge and, on a worker, the followee's posts from the follower's feed. Returns False if there was none."""
+    with transaction.atomic():
+        deleted = Follow.objects.filter(follower=follower, followee=followee).delete()[0]
+        if deleted:
+            enqueue(drop_unfollowed_posts, follower.pk, followee.pk)
+    return bool(deleted)
+
+
+def following_ids(user, profile_ids):
+    """The subset of ``profile_ids`` that ``user``'s profile follows, in one indexed query."""
+    if not user.is_authenticated or not profile_ids:
+        return set()
+    return set(
+        Follow.objects.filter(follower__user=user, followee_id__in=profile_ids).values_list('followee_id', flat=True)
+    )
+
+
+def rebuild_follow_counts():
+    """Recompute every profile's follow counts from the edge table."""
+    def count(field):
+        edges = Follow.objects.filter(**{field: OuterRef('pk')}).values(field).annotate(count=Count('*'))
+        return Coalesce(Subquery(edges.values('count')), Value(0))
+
+    return Profile.objects.update(followers_count=count('followee'), following_count=count('follower'))
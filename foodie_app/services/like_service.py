@@ -0,0 +1,94 @@
+import random
+from collections import defaultdict
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from foodie_app.models import Like, LikeCounterShard, Post, Story
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Foreign key on Like and LikeCounterShard for each likeable model
+TARGET_FIELDS = {
+    Post: 'post',
+    Story: 'story',
+}
+
+
+def _add_to_shard(field, target_id, delta):
+    shard = random.randrange(settings.LIKE_COUNTER_SHARDS)
+    lookup = {f'{field}_id': target_id, 'shard': shard}
+    if LikeCounterShard.objects.filter(**lookup).update(delta=F('delta') + delta):
+        return
+    try:
+        with transaction.atomic():
+            LikeCounterShard.objects.create(delta=delta, **lookup)
+    except IntegrityError:
+        # Another request created the shard first
+        LikeCounterShard.objects.filter(**lookup).update(delta=F('delta') + delta)
+
+
+def like_count(obj):
+    """``obj.likes`` plus the deltas not folded in yet."""
+    field = TARGET_FIELDS[type(obj)]
+    pending = LikeCounterShard.objects.filter(**{field: obj}).aggregate(pending=Sum('delta'))['pending']
+    return obj.likes + (pending or 0)
+
+
+def toggle_like(user, obj):
+    """
+    Like ``obj`` for ``user``, or remove the like if it exists. Returns
+    ``(liked, like_count)``.
+
+    Each toggle touches the user's ``Like`` row and one randomly chosen counter
+    shard, so concurrent likes of the same post neither lose updates nor queue
+    on a single row.
+    """
+    field = TARGET_FIELDS[type(obj)]
+    lookup = {'user': user, field: obj}
+
+    with transaction.atomic():
+        if Like.objects.filter(**lookup).delete()[0]:
+            liked, delta = False, -1
+        else:
+            try:
+                with transaction.atomic():
+                    Like.objects.create(**lookup)
+                liked, delta = True, 1
+            except IntegrityError:
+                # A concurrent request from the same user already liked it
+                liked, delta = True, 0
+
+        if delta:
+            _add_to_shard(field, obj.pk, delta)
+
+    return liked, like_count(obj)
+
+
+def fold_like_counters():
+    """
+    Move pending shard deltas into ``Post.likes`` and ``Story.likes``.
+    Returns the number of posts and stories updated.
+    """
+    updated = 0
+    for model, field in TARGET_FIELDS.items():
+        with transaction.atomic():
+            shards = list(
+                LikeCounterShard.objects.select_for_update()
+                .filter(**{f'{field}__isnull': False})
+                .exclude(delta=0)
+                .values_list('id', f'{field}_id', 'delta')
+            )
+            totals = defaultdict(int)
+            for _, target_id, delta in shards:
+                totals[target_id] += delta
+            # The shards stay locked until commit, so no like lands between the read and the reset
+            LikeCounterShard.objects.filter(pk__in=[shard_id for shard_id, _, _ in shards]).update(delta=0)
+            for target_id, delta in totals.items():
+                if delta:
+                    model.objects.filter(pk=target_id).update(likes=F('likes') + delta)
+            updated += len(totals)
+
+    if updated:
+        logger.info(f"Folded like counters of {updated} posts and stories")
+    return updated
@@ -0,0 +1,55 @@
+from django.db.models import DecimalField, F, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from rest_framework.exceptions import ValidationError
+
+
+def parse_line_items(items_data, label):
+    """
+    Validate a raw list of ``{"food_id": ..., "quantity": ...}`` dicts and
+    return a ``{food_id: quantity}`` mapping. A food id may appear only once,
+    since a repeat is more likely a client bug than a wish to add the
+    quantities. ``label`` ("order", "cart") is used in error messages.
+    """
+    if not isinstance(items_data, list):
+        raise ValidationError({"detail": f"{label.capitalize()} items must be a list."})
+
+    if not items_data:
+        raise ValidationError({"detail": f"At least one {label} item is required."})
+
+    lines = {}
+    for item in items_data:
+        if not isinstance(item, dict) or not item.get('food_id') or item.get('quantity') is None:
+            raise ValidationError({"detail": f"Each {label} item must include food_id and quantity."})
+
+        try:
+            food_id = int(item['food_id'])
+            quantity = int(item['quantity'])
+        except (TypeError, ValueError):
+            raise ValidationError({"detail": "food_id and quantity must be integers."})
+
+        if quantity <= 0:
+            raise ValidationError({"detail": "Quantity must be a positive integer."})
+
+        if food_id in lines:
+            raise ValidationError({"detail": f"Food {food_id} appears more than once in the {label} items."})
+        lines[food_id] = quantity
+    return lines
+
+
+def missing_foods_error(missing):
+    return f"Food not found: {', '.join(str(food_id) for food_id in sorted(missing))}"
+
+
+def stored_totals(items):
+    """
+    ``subtotal``/``item_count`` update expressions computed from ``items``, a
+    line-item queryset correlated to the row being updated with ``OuterRef``
+    and grouped with ``values(<fk>)``.
+    """
+    return {
+        'subtotal': Coalesce(
+            Subquery(items.annotate(total=Sum(F('price') * F('quantity'))).values('total')),
+            Value(0, output_field=DecimalField(max_digits=10, decimal_places=2)),
+        ),
+        'item_count': Coalesce(Subquery(items.annotate(count=Sum('quantity')).values('count')), Value(0)),
+    }
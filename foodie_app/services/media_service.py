@@ -0,0 +1,103 @@
+import os
+import time
+from django.apps import apps
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models
+from foodie_app.images import content_name
+from foodie_app.storage import BLOB_DIR, is_hashed_name
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def file_fields():
+    for model in apps.get_app_config('foodie_app').get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.FileField):
+                yield model, field
+
+
+def _stored_names(model, field):
+    return (
+        model._default_manager.exclude(**{field.name: ''}).exclude(**{f'{field.name}__isnull': True})
+        .values_list(field.name, flat=True).distinct()
+    )
+
+
+def adopt_legacy_files(dry_run=False):
+    """
+    Move files saved before content addressing (``myphoto_Z4MLvBh.jpg``) to
+    ``<sha256>`` names, so identical copies share one blob. Returns the number
+    of names moved; the old files are left for ``collect_garbage``.
+    """
+    moved = 0
+    for model, field in file_fields():
+        storage = field.storage
+        for name in list(_stored_names(model, field)):
+            if is_hashed_name(name) or not storage.exists(name):
+                continue
+            with storage.open(name, 'rb') as source:
+                data = source.read()
+            new_name = content_name(name, data)
+            if not dry_run:
+                storage.save(new_name, ContentFile(data))
+                model._default_manager.filter(**{field.name: name}).update(**{field.name: new_name})
+            logger.info(f"Moved {name} to {new_name}")
+            moved += 1
+    return moved
+
+
+def _age(path):
+    stat = os.stat(path)
+    # ctime changes whenever a link to the inode is added, mtime is shared with the blob
+    return time.time() - max(stat.st_mtime, stat.st_ctime)
+
+
+def collect_garbage(min_age=24 * 60 * 60, dry_run=False, storage=default_storage):
+    """
+    Delete media files no row references, and then blobs no file links to
+    any more. Files younger than ``min_age`` seconds are kept, so uploads
+    whose rows are not committed yet survive. Returns
+    ``(files_deleted, blobs_deleted, bytes_freed)``.
+    """
+    referenced = set()
+    directories = {'renditions'}
+    for model, field in file_fields():
+        referenced.update(_stored_names(model, field).iterator())
+        if isinstance(field.upload_to, str) and field.upload_to:
+            directories.add(field.upload_to.strip('/').split('/')[0])
+    referenced_stems = {os.path.splitext(name)[0] for name in referenced}
+
+    def is_referenced(name):
+        if name.startswith('renditions/'):
+            return os.path.dirname(name)[len('renditions/'):] in referenced_stems
+        return name in referenced
+
+    files_deleted = blobs_deleted = freed = 0
+    root = storage.location
+
+    for directory in sorted(directories):
+        for dirpath, _, filenames in os.walk(os.path.join(root, directory)):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                name = os.path.relpath(path, root).replace(os.sep, '/')
+                if (filename.startswith('.') or not is_referenced(name)) and _age(path) >= min_age:
+                    stat = os.stat(path)
+                    if not dry_run:
+                        os.unlink(path)
+                    files_deleted += 1
+                    # A hard link frees nothing until its blob goes too
+                    freed += stat.st_size if stat.st_nlink == 1 else 0
+
+    for dirpath, _, filenames in os.walk(os.path.join(root, BLOB_DIR)):
+        for filename in filenames:
+            path = os.path.join(dirpath, filename)
+            stat = os.stat(path)
+            if stat.st_nlink == 1 and _age(path) >= min_age:
+                if not dry_run:
+                    os.unlink(path)
+                blobs_deleted += 1
+                freed += stat.st_size
+
+    return files_deleted, blobs_deleted, freed
@@ -0,0 +1,57 @@
+from django.db import transaction
+from django.db.models import OuterRef
+from rest_framework.exceptions import NotFound, ValidationError
+from foodie_app.models import Food, Order, OrderItem
+from foodie_app.services.line_items import missing_foods_error, parse_line_items, stored_totals
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def parse_order_lines(order_items_data):
+    return parse_line_items(order_items_data, 'order')
+
+
+def place_order(user, restaurant, lines, **order_fields):
+    """
+    Create an order and all of its items from the ``{food_id: quantity}``
+    mapping returned by ``parse_order_lines``.
+
+    Every food is resolved with a single ``in_bulk`` lookup and checked in
+    memory, then the order and its items are written in one transaction, so the
+    number of queries does not depend on the number of lines.
+    """
+    foods = Food.objects.in_bulk(list(lines))
+    missing = set(lines) - set(foods)
+    if missing:
+        raise NotFound(missing_foods_error(missing))
+
+    if any(food.restaurant_id != restaurant.id for food in foods.values()):
+        raise ValidationError({"detail": "All order items must belong to the selected restaurant."})
+
+    total_price = sum(foods[food_id].price * quantity for food_id, quantity in lines.items())
+
+    with transaction.atomic():
+        order = Order.objects.create(
+            user=user,
+            restaurant=restaurant,
+            total_price=total_price,
+            subtotal=total_price,
+            item_count=sum(lines.values()),
+            **order_fields
+        )
+        OrderItem.objects.bulk_create([
+            OrderItem(order=order, food=foods[food_id], quantity=quantity, price=foods[food_id].price)
+            for food_id, quantity in lines.items()
+        ])
+
+    logger.info(f"Order {order.id} placed by user {user.username} with {len(lines)} line(s)")
+    return order
+
+
+def reconcile_order_totals():
+    """
+    Rebuild ``subtotal``/``item_count`` of every order from its items.
+    Returns the number of orders updated.
+    """
+    return Order.objects.update(**stored_totals(OrderItem.objects.filter(order=OuterRef('pk')).values('order')))
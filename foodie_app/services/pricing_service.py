@@ -0,0 +1,70 @@
+from datetime import timedelta
+from rest_framework.exceptions import ValidationError
+from foodie_app.models import WEEKEND_NIGHTS, Accommodation, AccommodationRate, stay_nights
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Most dates one set_rates call may write
+MAX_RATE_DAYS = 366
+
+
+def quote(accommodation, check_in_date, check_out_date):
+    """Total price of staying at ``accommodation`` from ``check_in_date`` to ``check_out_date``."""
+    return Accommodation.objects.with_quote(check_in_date, check_out_date).values_list(
+        'quoted_total', flat=True
+    ).get(pk=accommodation.pk)
+
+
+def nightly_rates(accommodation, check_in_date, check_out_date):
+    """``(date, price)`` for every night of the stay, reading the rate table once."""
+    nights = stay_nights(check_in_date, check_out_date)
+    overrides = dict(
+        AccommodationRate.objects.filter(accommodation=accommodation, date__range=(nights[0], nights[-1]))
+        .values_list('date', 'price_per_night')
+    )
+    # A weekend price of 0 is a free night, as in with_quote's COALESCE
+    weekend_price = accommodation.weekend_price_per_night
+    if weekend_price is None:
+        weekend_price = accommodation.price_per_night
+    return [
+        (night, overrides.get(
+            night, weekend_price if night.isoweekday() in WEEKEND_NIGHTS else accommodation.price_per_night
+        ))
+        for night in nights
+    ]
+
+
+def set_rates(accommodation, start_date, end_date, price_per_night, weekdays=None):
+    """
+    Charge ``price_per_night`` for the nights from ``start_date`` to
+    ``end_date`` inclusive, optionally only on the ISO ``weekdays``, replacing
+    the rates already set for those dates, at most ``MAX_RATE_DAYS`` of them.
+    Returns the number of dates set.
+    """
+    if end_date < start_date:
+        raise ValidationError({"end_date": "The end date must not be before the start date."})
+    if (end_date - start_date).days >= MAX_RATE_DAYS:
+        raise ValidationError({"end_date": f"Rates can be set for at most {MAX_RATE_DAYS} days at a time."})
+    dates = [start_date + timedelta(days=day) for day in range((end_date - start_date).days + 1)]
+    rates = [
+        AccommodationRate(accommodation=accommodation, date=date, price_per_night=price_per_night)
+        for date in dates
+        if not weekdays or date.isoweekday() in weekdays
+    ]
+    AccommodationRate.objects.bulk_create(
+        rates,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['accommodation', 'date'],
+        update_fields=['price_per_night'],
+    )
+    logger.info(f"Set {len(rates)} rate(s) for accommodation {accommodation.pk} from {start_date} to {end_date}")
+    return len(rates)
+
+
+def clear_rates(accommodation, start_date, end_date):
+    deleted, _ = AccommodationRate.objects.filter(
+        accommodation=accommodation, date__range=(start_date, end_date)
+    ).delete()
+    return deleted
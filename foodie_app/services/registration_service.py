@@ -0,0 +1,92 @@
+import re
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import IntegrityError, connection, transaction
+from rest_framework.exceptions import ValidationError
+from foodie_app.models import User
+from foodie_app.tasks import enqueue
+import logging
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_MESSAGES = {
+    'email': "A user with this email already exists.",
+    'username': "A user with this username already exists.",
+}
+
+
+# Unique constraints on expressions, which introspection does not tie to a column
+EXPRESSION_CONSTRAINTS = {
+    'user_email_ci_unique': 'email',
+}
+
+# SQLite names the failed index, or the columns of a column constraint
+SQLITE_UNIQUE_FAILED = re.compile(r"UNIQUE constraint failed: (?:index '(?P<index>\w+)'|(?P<table>\w+)\.(?P<column>\w+))")
+
+
+def _unique_constraints():
+    """Name of every unique constraint or index on one ``DUPLICATE_MESSAGES`` column -> that column."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, User._meta.db_table)
+    names = dict(EXPRESSION_CONSTRAINTS)
+    for name, constraint in constraints.items():
+        columns = constraint['columns'] or []
+        if constraint['unique'] and len(columns) == 1 and columns[0] in DUPLICATE_MESSAGES:
+            names[name] = columns[0]
+    return names
+
+
+def _duplicate_field(error):
+    """
+    The field whose unique constraint ``error`` violated, from the constraint's
+    name. The message also holds the submitted value, so it is never searched.
+    """
+    cause = error.__cause__
+    diag = getattr(cause, 'diag', None)
+    if diag is not None:
+        # PostgreSQL reports the constraint by name
+        return _unique_constraints().get(diag.constraint_name)
+    match = SQLITE_UNIQUE_FAILED.fullmatch(str(cause))
+    if match is None:
+        return None
+    if match['index']:
+        return _unique_constraints().get(match['index'])
+    if match['table'] == User._meta.db_table and match['column'] in DUPLICATE_MESSAGES:
+        return match['column']
+    return None
+
+
+def register_user(password, **fields):
+    """
+    Create a user and, through the ``post_save`` signal, their profile in one
+    transaction: one password hash and two inserts. Duplicate emails and
+    usernames are left to the unique constraints. The avatar is processed on
+    the ``images`` queue and the welcome email sent from the default queue.
+    """
+    user = User(**fields)
+    user.set_password(password)
+    try:
+        with transaction.atomic():
+            user.save()
+            enqueue(send_welcome_email, user.pk)
+    except IntegrityError as e:
+        field = _duplicate_field(e)
+        if field is None:
+            raise
+        logger.warning(f"Attempt to register with existing {field}: {fields.get(field)}")
+        raise ValidationError({field: [DUPLICATE_MESSAGES[field]]})
+    logger.info(f"User registered: {user.email}")
+    return user
+
+
+def send_welcome_email(user_id):
+    user = User.objects.filter(pk=user_id).values('email', 'full_name', 'username').first()
+    if user is None:
+        return
+    send_mail(
+        "Welcome to Dinelt",
+        f"Hi {user['full_name'] or user['username']},\n\nThanks for signing up to Dinelt.",
+        settings.DEFAULT_FROM_EMAIL,
+        [user['email']],
+    )
+    logger.info(f"Sent welcome email to user {user_id}")
@@ -0,0 +1,161 @@
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from foodie_app.models import Reservation, ReservationCategory, ReservationSlot
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Categories taking reservations: a capacity of None has no limit, 0 closes the category
+OPEN_CATEGORIES = Q(capacity__isnull=True) | Q(capacity__gt=0)
+
+# Fields that decide which slot a reservation takes seats in, and how many
+SLOT_FIELDS = ('restaurant', 'reservation_type', 'reservation_date', 'number_of_people')
+
+
+def get_category(restaurant_id, reservation_type):
+    category = ReservationCategory.objects.filter(
+        OPEN_CATEGORIES, restaurant_id=restaurant_id, reservation_type=reservation_type
+    ).first()
+    if category is None:
+        raise ValidationError({"reservation_type": "This restaurant does not take reservations of this type."})
+    return category
+
+
+def day_slots(category, day):
+    """Start times of ``category``'s slots on ``day``, in the current time zone."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(day, category.opens_at), tz)
+    end = timezone.make_aware(datetime.combine(day, category.closes_at), tz)
+    step = timedelta(minutes=category.slot_minutes)
+    slots = []
+    while start + step <= end:
+        slots.append(start)
+        start += step
+    return slots
+
+
+def _slot_start(category, starts_at):
+    starts_at = timezone.localtime(starts_at)
+    if starts_at not in day_slots(category, starts_at.date()):
+        raise ValidationError({
+            "reservation_date": f"Reservations start every {category.slot_minutes} minutes "
+                                f"from {category.opens_at:%H:%M} and end by {category.closes_at:%H:%M}."
+        })
+    if starts_at <= timezone.now():
+        raise ValidationError({"reservation_date": "Reservations must be in the future."})
+    return starts_at
+
+
+def _claim(category, starts_at, people):
+    """
+    Book ``people`` seats in the slot, creating its row on first use. The
+    check and the increment are one conditional UPDATE, so concurrent claims
+    serialize on the slot row and can never push it past its capacity.
+    Categories without a capacity have nothing to claim and return None.
+    """
+    if category.capacity is None:
+        return None
+    slot, _ = ReservationSlot.objects.get_or_create(
+        category=category, starts_at=starts_at, defaults={'capacity': category.capacity}
+    )
+    claimed = ReservationSlot.objects.filter(pk=slot.pk, booked__lte=F('capacity') - people).update(
+        booked=F('booked') + people
+    )
+    if not claimed:
+        raise ValidationError({"reservation_date": "Not enough capacity left in this slot."})
+    return slot
+
+
+def _release(reservation):
+    if reservation.slot_id is not None:
+        ReservationSlot.objects.filter(pk=reservation.slot_id).update(booked=F('booked') - reservation.number_of_people)
+
+
+def reserve(user, restaurant, reservation_type, reservation_date, number_of_people, **fields):
+    if restaurant is None:
+        raise ValidationError({"restaurant": "This field is required."})
+    category = get_category(restaurant.pk, reservation_type)
+    starts_at = _slot_start(category, reservation_date)
+
+    with transaction.atomic():
+        slot = _claim(category, starts_at, number_of_people)
+        reservation = Reservation.objects.create(
+            user=user, restaurant=restaurant, reservation_type=reservation_type, reservation_date=starts_at,
+            number_of_people=number_of_people, slot=slot, **fields
+        )
+    logger.info(f"Reservation {reservation.pk} booked {number_of_people} seat(s) in slot {reservation.slot_id}")
+    return reservation
+
+
+def update_reservation(reservation, **changes):
+    """
+    Apply ``changes``, moving the booked seats when the slot or party size
+    changes. A PUT resends every field, so values are compared with the stored
+    ones: unchanged slot fields leave the seats (and past reservations) alone.
+    """
+    moved = any(field in changes and changes[field] != getattr(reservation, field) for field in SLOT_FIELDS)
+    for field, value in changes.items():
+        setattr(reservation, field, value)
+    if not moved:
+        reservation.save()
+        return reservation
+
+    if reservation.restaurant is None:
+        raise ValidationError({"restaurant": "This field is required."})
+    category = get_category(reservation.restaurant_id, reservation.reservation_type)
+    starts_at = _slot_start(category, reservation.reservation_date)
+
+    with transaction.atomic():
+        previous = Reservation.objects.select_for_update().get(pk=reservation.pk)
+        _release(previous)
+        reservation.slot = _claim(category, starts_at, reservation.number_of_people)
+        reservation.reservation_date = starts_at
+        reservation.save()
+    return reservation
+
+
+def cancel_reservation(reservation):
+    with transaction.atomic():
+        previous = Reservation.objects.select_for_update().get(pk=reservation.pk)
+        _release(previous)
+        previous.delete()
+
+
+def available_slots(restaurant_id, day, reservation_type=None):
+    """
+    Open slots of ``restaurant_id`` on ``day``: one range scan over the
+    (category, starts_at) slot index, merged with the slots nobody booked yet.
+    Slots of categories without a capacity are always open, with ``available`` None.
+    """
+    categories = ReservationCategory.objects.filter(OPEN_CATEGORIES, restaurant_id=restaurant_id)
+    if reservation_type:
+        categories = categories.filter(reservation_type=reservation_type)
+    categories = list(categories)
+    if not categories:
+        return []
+
+    tz = timezone.get_current_timezone()
+    day_start = timezone.make_aware(datetime.combine(day, datetime.min.time()), tz)
+    booked = {
+        (category_id, starts_at): capacity - seats
+        for category_id, starts_at, capacity, seats in ReservationSlot.objects.filter(
+            category__in=categories, starts_at__gte=day_start, starts_at__lt=day_start + timedelta(days=1)
+        ).values_list('category_id', 'starts_at', 'capacity', 'booked')
+    }
+
+    now = timezone.now()
+    slots = []
+    for category in categories:
+        for starts_at in day_slots(category, day):
+            available = booked.get((category.pk, starts_at), category.capacity)
+            if starts_at > now and (available is None or available > 0):
+                slots.append({
+                    'reservation_type': category.reservation_type,
+                    'starts_at': starts_at,
+                    'ends_at': starts_at + timedelta(minutes=category.slot_minutes),
+                    'available': available,
+                })
+    return sorted(slots, key=lambda slot: (slot['starts_at'], slot['reservation_type']))
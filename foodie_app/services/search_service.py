@@ -0,0 +1,89 @@
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramWordSimilarity,
+)
+from django.db import connection
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest
+from foodie_app.models import Food, Restaurant
+
+SEARCH_CONFIG = 'english'
+
+# Columns matched with trigrams so that misspelled names still find results
+TRIGRAM_FIELDS = {
+    Restaurant: ('name', 'city'),
+    Food: ('name',),
+}
+
+
+def uses_postgres_search():
+    return connection.vendor == 'postgresql'
+
+
+def restaurant_search_vector():
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('city', weight='B', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+def food_search_vector():
+    return (
+        SearchVector('name', weight='A', config=SEARCH_CONFIG)
+        + SearchVector('description', weight='C', config=SEARCH_CONFIG)
+    )
+
+
+SEARCH_VECTORS = {
+    Restaurant: restaurant_search_vector,
+    Food: food_search_vector,
+}
+
+
+def update_search_vectors(model, **lookup):
+    """
+    Recompute the stored ``search_vector`` of the matching rows in a single
+    ``UPDATE``. A no-op on databases without full-text search.
+    """
+    if not uses_postgres_search():
+        return 0
+    return model.objects.filter(**lookup).update(search_vector=SEARCH_VECTORS[model]())
+
+
+def search_filter(model, term):
+    """
+    ``Q`` object matching ``term`` against ``model``. On PostgreSQL it uses the
+    GIN-indexed ``search_vector`` and the trigram indexes; elsewhere it falls
+    back to ``icontains`` over the same columns.
+    """
+    if uses_postgres_search():
+        match = Q(search_vector=SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch'))
+        for field in TRIGRAM_FIELDS[model]:
+            match |= Q(**{f'{field}__trigram_word_similar': term})
+        return match
+
+    match = Q()
+    for field in ('name', 'city', 'description') if model is Restaurant else ('name', 'description'):
+        match |= Q(**{f'{field}__icontains': term})
+    return match
+
+
+def search(model, term, limit=20):
+    """
+    Return up to ``limit`` rows of ``model`` matching ``term``, best match first.
+    """
+    results = model.objects.filter(search_filter(model, term))
+
+    if uses_postgres_search():
+        query = SearchQuery(term, config=SEARCH_CONFIG, search_type='websearch')
+        similarities = [TrigramWordSimilarity(term, field) for field in TRIGRAM_FIELDS[model]]
+        results = results.annotate(
+            score=SearchRank(F('search_vector'), query)
+            + (Greatest(*similarities) if len(similarities) > 1 else similarities[0])
+        ).order_by('-score', 'id')
+    else:
+        results = results.annotate(
+            score=Case(When(name__icontains=term, then=Value(1)), default=Value(0), output_field=IntegerField())
+        ).order_by('-score', 'id')
+
+    return results[:limit]
@@ -0,0 +1,50 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from foodie_app.models import Profile, Story
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _delete_files(storage, names):
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError as e:
+            logger.warning(f"Could not delete story image {name}: {e}")
+
+
+def purge_expired_stories(batch_size=None, now=None):
+    """
+    Delete stories that expired before ``now`` in batches of ``batch_size``
+    (``STORY_PURGE_BATCH_SIZE`` by default), together with their
+    ``Profile.stories`` links and comments. Image files are removed once each
+    batch commits. Returns the number of stories deleted.
+    """
+    batch_size = batch_size or settings.STORY_PURGE_BATCH_SIZE
+    now = now or timezone.now()
+    storage = Story._meta.get_field('image').storage
+    deleted = 0
+
+    while True:
+        with transaction.atomic():
+            batch = list(
+                Story.objects.expired(now).order_by('expires_at').values_list('id', 'image')[:batch_size]
+            )
+            if not batch:
+                break
+            story_ids = [story_id for story_id, _ in batch]
+            images = [image for _, image in batch if image]
+
+            Profile.stories.through.objects.filter(story_id__in=story_ids).delete()
+            Story.objects.filter(id__in=story_ids).delete()
+            transaction.on_commit(lambda images=images: _delete_files(storage, images))
+
+        deleted += len(batch)
+        if len(batch) < batch_size:
+            break
+
+    if deleted:
+        logger.info(f"Purged {deleted} expired stories")
+    return deleted
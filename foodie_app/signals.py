@@ -1,15 +1,170 @@
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import m2m_changed, pre_delete, pre_save, post_save, post_delete
 from django.dispatch import receiver
-from .models import User, Profile
+from .models import User, Profile, Follow, Post, Story, Comments, Restaurant, RestaurantReview, Food, Manager
+from .images import dedupe_upload, image_fields, processed_field_name, schedule_processing
+from .menu_cache import ALL_MENUS, bump_food_versions, bump_versions, menu_scope, restaurant_scope
+from .authentication import invalidate_token_claims
+from .permissions import invalidate_managed_restaurants
+from .services.cart_service import drop_food_from_carts
+from .services.feed_service import fan_out_post
+from .tasks import enqueue
+from .services.follow_service import apply_follow_counts
+from .services.search_service import update_search_vectors
 import logging
 
 logger = logging.getLogger(__name__)
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
+    # The only place profiles are created; a failure rolls the user back with it
     if created:
-        try:
-            Profile.objects.get_or_create(user=instance, defaults={'username': instance.username})
-            logger.info(f"Profile created for user {instance.username}")
-        except Exception as e:
-            logger.error(f"Failed to create profile for user {instance.username}: {e}")
+        Profile.objects.create(user=instance, username=instance.username, image=instance.image)
+        logger.info(f"Profile created for user {instance.username}")
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_save, sender=Food)
+def update_search_vector(sender, instance, **kwargs):
+    update_search_vectors(sender, pk=instance.pk)
+
+
+@receiver(post_save, sender=Food)
+@receiver(post_delete, sender=Food)
+def bump_food_cache_versions(sender, instance, **kwargs):
+    bump_food_versions(instance)
+
+
+@receiver(pre_delete, sender=Food)
+def drop_deleted_food_from_carts(sender, instance, **kwargs):
+    # Cart items go with the food through the cascade, which would leave the cart totals stale
+    drop_food_from_carts(instance.pk)
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+def bump_restaurant_cache_versions(sender, instance, **kwargs):
+    bump_versions(restaurant_scope(instance.pk), menu_scope(instance.pk), ALL_MENUS)
+
+
+@receiver(post_delete, sender=RestaurantReview)
+def remove_review_rating(sender, instance, **kwargs):
+    # Saves are applied in RestaurantReview.save(); deletes run inside the deletion transaction
+    Restaurant.objects.apply_rating(instance.restaurant_id, instance.rating, sign=-1)
+
+
+@receiver(post_save, sender=RestaurantReview)
+@receiver(post_delete, sender=RestaurantReview)
+def bump_review_cache_versions(sender, instance, **kwargs):
+    bump_versions(restaurant_scope(instance.restaurant_id), ALL_MENUS)
+
+
+# The user column that grants a Manager or Restaurant row's access
+ACCESS_FIELDS = {Manager: 'user_id', Restaurant: 'owner_id'}
+
+
+@receiver(pre_save, sender=Manager)
+@receiver(pre_save, sender=Restaurant)
+def remember_previous_access(sender, instance, **kwargs):
+    # A reassigned manager or owner loses the restaurant, so their cached set and claims go too
+    field = ACCESS_FIELDS[sender]
+    instance._previous_access_id = (
+        sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first() if instance.pk else None
+    )
+
+
+def _access_ids(instance):
+    user_id = getattr(instance, ACCESS_FIELDS[type(instance)])
+    previous_id = getattr(instance, '_previous_access_id', None)
+    return [user_id] if previous_id in (None, user_id) else [user_id, previous_id]
+
+
+@receiver(post_save, sender=Manager)
+@receiver(post_delete, sender=Manager)
+def invalidate_manager_restaurants(sender, instance, **kwargs):
+    invalidate_managed_restaurants(*_access_ids(instance))
+    invalidate_token_claims(*_access_ids(instance))
+
+
+@receiver(post_save, sender=Restaurant)
+@receiver(post_delete, sender=Restaurant)
+def invalidate_owner_restaurants(sender, instance, **kwargs):
+    invalidate_managed_restaurants(*_access_ids(instance))
+    invalidate_token_claims(*_access_ids(instance))
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_token_claims(sender, instance, **kwargs):
+    invalidate_token_claims(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def fan_out_new_post(sender, instance, created, **kwargs):
+    if created:
+        # Writing to every follower's feed is left to a worker, after the post commits
+        enqueue(fan_out_post, instance.pk)
+
+
+@receiver(post_save, sender=Follow)
+def count_follow(sender, instance, created, **kwargs):
+    if created:
+        apply_follow_counts([instance.follower_id], [instance.followee_id], 1)
+
+
+@receiver(post_delete, sender=Follow)
+def count_unfollow(sender, instance, **kwargs):
+    apply_follow_counts([instance.follower_id], [instance.followee_id], -1)
+
+
+@receiver(m2m_changed, sender=Profile.following.through)
+def count_follows_added(sender, instance, action, reverse, pk_set, **kwargs):
+    # profile.following.add() bulk-creates Follow rows without post_save; removals go through post_delete
+    if action != 'post_add' or not pk_set:
+        return
+    others = list(pk_set)
+    if reverse:
+        apply_follow_counts(others, [instance.pk] * len(others), 1)
+    else:
+        apply_follow_counts([instance.pk] * len(others), others, 1)
+
+
+def _apply_comment_count(comment, delta):
+    model, target_id = (Post, comment.post_id) if comment.post_id else (Story, comment.story_id)
+    model.objects.filter(pk=target_id).update(comment_count=F('comment_count') + delta)
+
+
+@receiver(post_save, sender=Comments)
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        _apply_comment_count(instance, 1)
+
+
+@receiver(post_delete, sender=Comments)
+def uncount_comment(sender, instance, **kwargs):
+    _apply_comment_count(instance, -1)
+
+
+@receiver(pre_save)
+def dedupe_image_uploads(sender, instance, **kwargs):
+    if sender._meta.app_label != 'foodie_app':
+        return
+    pending = []
+    for field in image_fields(instance):
+        field_file = getattr(instance, field.attname)
+        if field_file and not field_file._committed:
+            dedupe_upload(field_file)
+            setattr(instance, processed_field_name(field), False)
+            pending.append(field.name)
+    instance._pending_images = pending
+
+
+@receiver(post_save)
+def process_image_uploads(sender, instance, **kwargs):
+    then = None
+    if sender is Restaurant:
+        # Cached restaurant responses embed the rendition URLs
+        then = lambda: bump_versions(restaurant_scope(instance.pk), menu_scope(instance.pk), ALL_MENUS)
+    for field_name in getattr(instance, '_pending_images', ()):
+        schedule_processing(sender, field_name, getattr(instance, field_name).name, then)
+    instance._pending_images = []
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import re
+import tempfile
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+import logging
+
+logger = logging.getLogger(__name__)
+
+BLOB_DIR = 'blobs'
+
+# Names that embed a SHA-256 never change content and can be cached forever
+HASHED_NAME = re.compile(r'(^|/)[0-9a-f]{64}(/|\.|$)')
+
+
+def is_hashed_name(name):
+    return bool(HASHED_NAME.search(name))
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that keeps every distinct file once, as
+    ``blobs/<sha[:2]>/<sha256>``, and stores each name as a hard link to its
+    blob. The blob's link count is its reference count: identical uploads
+    share one copy on disk, and a blob with no names left (``st_nlink == 1``)
+    is garbage, removed by ``manage.py gc_media``.
+
+    Saving to an existing content-addressed name (see ``is_hashed_name``)
+    replaces it atomically instead of picking a suffixed alternative: both
+    hold the same bytes. Other names get Django's usual suffix, so an upload
+    never overwrites a different file.
+    """
+
+    def blob_name(self, digest):
+        return f'{BLOB_DIR}/{digest[:2]}/{digest}'
+
+    def get_available_name(self, name, max_length=None):
+        if is_hashed_name(name):
+            return name
+        return super().get_available_name(name, max_length=max_length)
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        blob_path = self.path(self.blob_name(digest.hexdigest()))
+        if not os.path.exists(blob_path):
+            self._write_blob(blob_path, content)
+
+        self._link(blob_path, self.path(name))
+        return name.replace('\\', '/')
+
+    def _temp_path(self, directory, prefix):
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=directory, prefix=prefix)
+        os.close(fd)
+        return temp_path
+
+    def _write_blob(self, blob_path, content):
+        # Written to a temporary file and renamed, so a blob is never seen half-written
+        temp_path = self._temp_path(os.path.dirname(blob_path), '.blob-')
+        try:
+            with open(temp_path, 'wb') as target:
+                for chunk in content.chunks():
+                    target.write(chunk)
+            if self.file_permissions_mode is not None:
+                os.chmod(temp_path, self.file_permissions_mode)
+            os.replace(temp_path, blob_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    def _link(self, blob_path, path):
+        if os.path.exists(path) and os.path.samefile(blob_path, path):
+            return
+        # Linked under a temporary name and renamed over ``path``, so readers never see it missing
+        temp_path = self._temp_path(os.path.dirname(path), '.link-')
+        os.unlink(temp_path)
+        try:
+            os.link(blob_path, temp_path)
+        except OSError as e:
+            logger.warning(f"Hard link failed ({e}), copying {blob_path} instead")
+            with open(blob_path, 'rb') as source, open(temp_path, 'wb') as target:
+                for chunk in iter(lambda: source.read(64 * 1024), b''):
+                    target.write(chunk)
+        os.replace(temp_path, path)
+
+    def reference_count(self, name):
+        """Number of names that share ``name``'s blob, ``name`` included."""
+        return os.stat(self.path(name)).st_nlink - 1
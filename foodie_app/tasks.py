@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, transaction
+import logging
+
+logger = logging.getLogger(__name__)
+
+# queue -> setting holding its number of worker threads
+QUEUES = {
+    'default': 'TASK_WORKERS',
+    'images': 'IMAGE_WORKERS',
+}
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception(f"Task {func.__name__} failed")
+
+
+def _run_in_worker(func, args, kwargs):
+    try:
+        _run(func, args, kwargs)
+    finally:
+        close_old_connections()
+
+
+def _workers(queue):
+    return getattr(settings, QUEUES[queue])
+
+
+def _get_executor(queue):
+    with _executors_lock:
+        if queue not in _executors:
+            _executors[queue] = ThreadPoolExecutor(
+                max_workers=_workers(queue), thread_name_prefix=f'tasks-{queue}'
+            )
+        return _executors[queue]
+
+
+def enqueue(func, *args, queue='default', **kwargs):
+    """
+    Run ``func(*args, **kwargs)`` on the worker threads of ``queue`` once the
+    current transaction commits. Queues configured with 0 workers run
+    their tasks inline instead, which is what tests use. Failures are logged.
+    """
+    def submit():
+        if _workers(queue):
+            _get_executor(queue).submit(_run_in_worker, func, args, kwargs)
+        else:
+            _run(func, args, kwargs)
+
+    transaction.on_commit(submit)
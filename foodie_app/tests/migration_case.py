@@ -0,0 +1,36 @@
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+
+class MigrationTestCase(TransactionTestCase):
+    """
+    Migrates foodie_app back to ``migrate_from`` and hands the historical
+    models to ``setUpBeforeMigration``; ``migrate()`` then runs up to
+    ``migrate_to``. The schema is brought back to the latest migration after
+    each test, so tests must leave data the later migrations accept.
+    """
+    migrate_from = None
+    migrate_to = None
+
+    def setUp(self):
+        super().setUp()
+        self.setUpBeforeMigration(self._migrate(self.migrate_from))
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+        super().tearDown()
+
+    def setUpBeforeMigration(self, apps):
+        pass
+
+    def migrate(self):
+        return self._migrate(self.migrate_to)
+
+    def _migrate(self, migration):
+        targets = [('foodie_app', migration)]
+        executor = MigrationExecutor(connection)
+        executor.migrate(targets)
+        executor.loader.build_graph()
+        return executor.loader.project_state(targets).apps
@@ -0,0 +1,50 @@
+from decimal import Decimal
+from django.core.cache import caches
+from django.test import TestCase
+from foodie_app.models import Food, Restaurant, User
+
+
+class AsyncViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        cls.restaurants = [
+            Restaurant.objects.create(owner=owner, name=f'Kibanda {i}', address='CBD', city='Nairobi', country='KE', phone_number='1')
+            for i in range(5)
+        ]
+        cls.foods = [
+            Food.objects.create(name=f'Dish {i}', category='main_course', restaurant=cls.restaurants[0], price=Decimal(i + 1))
+            for i in range(5)
+        ]
+
+    def setUp(self):
+        caches['menu'].clear()
+
+    async def walk(self, url):
+        pages = []
+        while url:
+            response = await self.async_client.get(url)
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            pages.append([item['id'] for item in data['results']])
+            url = data['next']
+        return pages
+
+    async def test_cursor_pages_forward_and_back(self):
+        pages = await self.walk('/api/restaurants/?page_size=2')
+        self.assertEqual(pages, [[r.pk for r in self.restaurants[i:i + 2]] for i in (0, 2, 4)])
+
+        last = (await self.async_client.get('/api/restaurants/?page_size=2')).json()
+        while last['next']:
+            last = (await self.async_client.get(last['next'])).json()
+        previous = (await self.async_client.get(last['previous'])).json()
+        self.assertEqual([r['id'] for r in previous['results']], pages[1])
+
+    async def test_catalog_pages_by_price(self):
+        pages = await self.walk(f'/api/food/?restaurant={self.restaurants[0].pk}&page_size=3')
+        self.assertEqual(pages, [[f.pk for f in self.foods[:3]], [f.pk for f in self.foods[3:]]])
+
+    async def test_retrieve(self):
+        response = await self.async_client.get(f'/api/restaurants/{self.restaurants[0].pk}/')
+        self.assertEqual(response.json()['name'], 'Kibanda 0')
+        self.assertEqual((await self.async_client.get('/api/restaurants/0/')).status_code, 404)
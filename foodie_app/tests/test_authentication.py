@@ -0,0 +1,67 @@
+import shutil
+import tempfile
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+from foodie_app.authentication import ClaimsJWTAuthentication
+from foodie_app.checks import check_token_claims_cache_is_shared
+from foodie_app.models import Manager, Restaurant, User
+
+
+class TokenClaimsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw', is_business_owner=True)
+        cls.manager = User.objects.create_user(username='manager', email='manager@example.com', password='pw')
+        cls.restaurant = Restaurant.objects.create(
+            owner=cls.owner, name='Mama Rocks', address='Kenyatta Ave', city='Nairobi', country='KE', phone_number='1'
+        )
+
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.shared_cache = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}
+
+    def authenticate(self, email):
+        access = APIClient().post('/api/token/', {'email': email, 'password': 'pw'}, format='json').data['access']
+        request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+        user, _ = ClaimsJWTAuthentication().authenticate(request)
+        return user
+
+    def test_claims_are_trusted_with_a_shared_cache(self):
+        with self.settings(CACHES={'default': self.shared_cache}, TOKEN_CLAIMS_CACHE_ALIAS='default'):
+            user = self.authenticate('owner@example.com')
+            self.assertTrue(user.from_token_claims)
+            self.assertEqual(user.claimed_restaurant_ids, {self.restaurant.pk})
+            self.assertEqual(check_token_claims_cache_is_shared(None), [])
+
+    def test_outdated_claims_fall_back_to_the_database(self):
+        with self.settings(CACHES={'default': self.shared_cache}, TOKEN_CLAIMS_CACHE_ALIAS='default'):
+            access = APIClient().post('/api/token/', {'email': 'manager@example.com', 'password': 'pw'}, format='json').data['access']
+            request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+            self.assertTrue(ClaimsJWTAuthentication().authenticate(request)[0].from_token_claims)
+            with self.captureOnCommitCallbacks(execute=True):
+                Manager.objects.create(user=self.manager, restaurant=self.restaurant)
+            user, _ = ClaimsJWTAuthentication().authenticate(request)
+            self.assertFalse(getattr(user, 'from_token_claims', False))
+
+    def test_claims_are_not_trusted_without_a_shared_cache(self):
+        for alias in (None, 'default'):
+            with self.subTest(alias=alias), override_settings(TOKEN_CLAIMS_CACHE_ALIAS=alias):
+                user = self.authenticate('owner@example.com')
+                self.assertFalse(getattr(user, 'from_token_claims', False))
+                self.assertEqual(user, self.owner)
+        with override_settings(TOKEN_CLAIMS_CACHE_ALIAS='default'):
+            self.assertEqual([warning.id for warning in check_token_claims_cache_is_shared(None)], ['foodie_app.W001'])
+
+    def test_reassigning_the_owner_outdates_the_previous_owners_claims(self):
+        # Saving a restaurant also bumps the menu cache versions
+        caches = {'default': self.shared_cache, 'menu': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+        with self.settings(CACHES=caches, TOKEN_CLAIMS_CACHE_ALIAS='default'):
+            access = APIClient().post('/api/token/', {'email': 'owner@example.com', 'password': 'pw'}, format='json').data['access']
+            request = APIRequestFactory().get('/', HTTP_AUTHORIZATION=f'Bearer {access}')
+            self.assertTrue(ClaimsJWTAuthentication().authenticate(request)[0].from_token_claims)
+            with self.captureOnCommitCallbacks(execute=True):
+                self.restaurant.owner = self.manager
+                self.restaurant.save()
+            user, _ = ClaimsJWTAuthentication().authenticate(request)
+            self.assertFalse(getattr(user, 'from_token_claims', False))
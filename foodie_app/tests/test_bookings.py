@@ -0,0 +1,65 @@
+from datetime import timedelta
+from decimal import Decimal
+from importlib import import_module
+from unittest import skipIf
+from django.apps import apps
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from foodie_app.models import Accommodation, Booking, User
+
+
+class AccommodationAvailabilityTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.guest = User.objects.create_user(username='guest', email='guest@example.com', password='pw')
+        cls.accommodations = Accommodation.objects.bulk_create(
+            Accommodation(name=f'Cottage {i}', address='Lake Rd', city='Naivasha', country='KE', price_per_night=Decimal('50'))
+            for i in range(5)
+        )
+        cls.check_in = (timezone.now() + timedelta(days=7)).replace(microsecond=0)
+        cls.check_out = cls.check_in + timedelta(days=2)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def url(self, page_size):
+        return (f'/api/accommodation/available/?city=Naivasha&page_size={page_size}'
+                f'&check_in={self.check_in.isoformat()}&check_out={self.check_out.isoformat()}').replace('+', '%2B')
+
+    def test_available_accommodations_are_paginated(self):
+        Booking.objects.create(
+            user=self.guest, accommodation=self.accommodations[1], check_in_date=self.check_in,
+            check_out_date=self.check_out, number_of_guests=2,
+        )
+        seen, url = [], self.url(2)
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen += [accommodation['id'] for accommodation in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, [a.pk for a in self.accommodations if a != self.accommodations[1]])
+        self.assertEqual(response.data['results'][0]['quoted_total'], '100.00')
+
+
+@skipIf(connection.vendor == 'postgresql', "PostgreSQL's exclusion constraint rejects overlapping bookings")
+class BookingOverlapMigrationTests(TestCase):
+    def test_overlapping_bookings_are_listed_not_deleted(self):
+        check = import_module('foodie_app.migrations.0026_booking_overlap').check_conflicting_bookings
+        guest = User.objects.create_user(username='guest', email='guest@example.com', password='pw')
+        accommodation = Accommodation.objects.create(
+            name='Cottage', address='Lake Rd', city='Naivasha', country='KE', price_per_night=Decimal('50')
+        )
+        start = timezone.now()
+        first, second, third = (
+            Booking.objects.create(
+                user=guest, accommodation=accommodation, number_of_guests=1,
+                check_in_date=start + timedelta(days=days), check_out_date=start + timedelta(days=days + nights),
+            )
+            for days, nights in ((0, 5), (1, 1), (3, 4))
+        )
+        with self.assertRaisesMessage(RuntimeError, f'{first.pk} and {second.pk}, {first.pk} and {third.pk}'):
+            check(apps, None)
+        self.assertEqual(Booking.objects.count(), 3)
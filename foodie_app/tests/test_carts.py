@@ -0,0 +1,90 @@
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from foodie_app.models import Cart, CartItem, Food, Restaurant, User
+from foodie_app.services.cart_service import remove_cart_item, upsert_cart_items
+
+
+class CartTotalsTests(TestCase):
+    def setUp(self):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        self.restaurant = Restaurant.objects.create(
+            owner=owner, name='Java House', address='Kimathi St', city='Nairobi', country='KE', phone_number='1'
+        )
+        self.coffee = Food.objects.create(name='Coffee', category='beverage', restaurant=self.restaurant, price=Decimal('2.50'))
+        self.cake = Food.objects.create(name='Cake', category='dessert', restaurant=self.restaurant, price=Decimal('4.00'))
+        user = User.objects.create_user(username='diner', email='diner@example.com', password='pw')
+        self.cart = upsert_cart_items(Cart.objects.create(user=user), {self.coffee.pk: 2, self.cake.pk: 1})
+
+    def assertTotals(self, subtotal, item_count):
+        self.cart.refresh_from_db()
+        self.assertEqual((self.cart.subtotal, self.cart.item_count), (Decimal(subtotal), item_count))
+
+    def test_sync_and_remove(self):
+        self.assertTotals('9.00', 3)
+        upsert_cart_items(self.cart, {self.coffee.pk: 1})
+        self.assertTotals('6.50', 2)
+        remove_cart_item(self.cart, self.cart.cart_items.get(food=self.cake).pk)
+        self.assertTotals('2.50', 1)
+
+    def test_deleting_a_food_drops_it_from_cart_totals(self):
+        self.cake.delete()
+        self.assertTotals('5.00', 2)
+
+    def test_deleting_a_restaurant_empties_cart_totals(self):
+        self.restaurant.delete()
+        self.assertTotals('0.00', 0)
+
+
+class CartSyncTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        restaurant = Restaurant.objects.create(
+            owner=owner, name='Java House', address='Kimathi St', city='Nairobi', country='KE', phone_number='1'
+        )
+        cls.foods = [
+            Food.objects.create(name=f'Dish {i}', category='main_course', restaurant=restaurant, price=Decimal(i + 1))
+            for i in range(6)
+        ]
+        cls.user = User.objects.create_user(username='diner', email='diner@example.com', password='pw')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync(self, *items, method='post', url='/api/cart/add/'):
+        payload = {'cart_items': [{'food_id': food_id, 'quantity': quantity} for food_id, quantity in items]}
+        return getattr(self.client, method)(url, payload, format='json')
+
+    def test_sync_inserts_and_updates_lines(self):
+        self.assertEqual(self.sync((self.foods[0].pk, 2), (self.foods[1].pk, 1)).status_code, 201)
+        response = self.sync((self.foods[1].pk, 3), (self.foods[2].pk, 1), method='put', url='/api/cart/update/1/')
+        self.assertEqual(response.status_code, 200)
+        cart = Cart.objects.get(user=self.user)
+        self.assertCountEqual(
+            cart.cart_items.values_list('food_id', 'quantity'),
+            [(self.foods[0].pk, 2), (self.foods[1].pk, 3), (self.foods[2].pk, 1)],
+        )
+        self.assertEqual((cart.subtotal, cart.item_count), (Decimal('11'), 6))
+
+    def test_queries_do_not_grow_with_the_lines(self):
+        self.sync((self.foods[0].pk, 1))
+        counts = []
+        for foods in (self.foods[:1], self.foods):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.sync(*((food.pk, 2) for food in foods)).status_code, 201)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_rejected_syncs_write_nothing(self):
+        for items, status in (
+            ([(self.foods[0].pk, 1), (self.foods[0].pk, 2)], 400),
+            ([(self.foods[0].pk, 1), (999999, 1)], 404),
+        ):
+            with self.subTest(items=items):
+                self.assertEqual(self.sync(*items).status_code, status)
+        self.assertFalse(Cart.objects.exists())
+        self.assertFalse(CartItem.objects.exists())
@@ -0,0 +1,87 @@
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from foodie_app.models import Comments, Post, Story, User
+from foodie_app.tests.migration_case import MigrationTestCase
+
+
+class CommentTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='diner', email='diner@example.com', password='pw')
+        cls.post = Post.objects.create(author=cls.user, content='Ugali and sukuma')
+        cls.story = Story.objects.create(author=cls.user, content='At the market')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertCommentCounts(self, post_count, story_count):
+        self.post.refresh_from_db()
+        self.story.refresh_from_db()
+        self.assertEqual((self.post.comment_count, self.story.comment_count), (post_count, story_count))
+        self.assertEqual(
+            (self.post.comments.count(), self.story.comments.count()), (post_count, story_count)
+        )
+
+    def test_counts_follow_creates_and_deletes(self):
+        for _ in range(2):
+            self.assertEqual(self.client.post(f'/api/posts/{self.post.pk}/comments/', {'content': 'Tamu'}).status_code, 201)
+        response = self.client.post(f'/api/stories/{self.story.pk}/comments/', {'content': 'Wow'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['story'], response.data['post']), (self.story.pk, None))
+        self.assertCommentCounts(2, 1)
+
+        self.assertEqual(self.client.delete(f"/api/comments/{response.data['id']}/").status_code, 204)
+        self.post.comments.all().delete()
+        self.assertCommentCounts(0, 0)
+
+    def test_comment_needs_exactly_one_target(self):
+        for targets in ({'post': self.post, 'story': self.story}, {}):
+            with self.subTest(targets=list(targets)), self.assertRaises(IntegrityError), transaction.atomic():
+                Comments.objects.create(author=self.user, content='Both', **targets)
+
+    def test_thread_pages_oldest_first(self):
+        comments = Comments.objects.bulk_create(
+            Comments(post=self.post, author=self.user, content=str(i)) for i in range(5)
+        )
+        seen = []
+        url = f'/api/posts/{self.post.pk}/comments/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen += [comment['id'] for comment in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, sorted(comment.pk for comment in comments))
+
+
+class CommentThreadMigrationTests(MigrationTestCase):
+    migrate_from = '0023_follow_graph'
+    migrate_to = '0024_comment_threads'
+
+    def setUpBeforeMigration(self, apps):
+        User = apps.get_model('foodie_app', 'User')
+        Post = apps.get_model('foodie_app', 'Post')
+        Story = apps.get_model('foodie_app', 'Story')
+        Comments = apps.get_model('foodie_app', 'Comments')
+        user = User.objects.create(username='diner', email='diner@example.com')
+        post = Post.objects.create(author=user, content='Ugali and sukuma')
+        story = Story.objects.create(author=user, content='At the market', expires_at=timezone.now())
+        # Every comment needed a post; story comments were also linked through the story's M2M
+        self.post_comment = Comments.objects.create(post=post, content='Tamu')
+        self.story_comment = Comments.objects.create(post=post, content='Wow')
+        post.comments.add(self.post_comment)
+        story.comments.add(self.story_comment)
+        self.post_id, self.story_id = post.pk, story.pk
+
+    def test_story_comments_move_to_the_story(self):
+        apps = self.migrate()
+        Comments = apps.get_model('foodie_app', 'Comments')
+        self.assertEqual(
+            dict(Comments.objects.values_list('pk', 'post_id')),
+            {self.post_comment.pk: self.post_id, self.story_comment.pk: None},
+        )
+        self.assertEqual(Comments.objects.get(pk=self.story_comment.pk).story_id, self.story_id)
+        self.assertEqual(apps.get_model('foodie_app', 'Post').objects.get().comment_count, 1)
+        self.assertEqual(apps.get_model('foodie_app', 'Story').objects.get().comment_count, 1)
@@ -0,0 +1,50 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from foodie_app.models import FeedEntry, Post, User
+
+
+class FeedFanOutTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='pw')
+        cls.followers = [
+            User.objects.create_user(username=f'follower{i}', email=f'follower{i}@example.com', password='pw')
+            for i in range(3)
+        ]
+        cls.author.profile.follower_profiles.add(*(follower.profile for follower in cls.followers))
+
+    def post(self, content):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Post.objects.create(author=self.author, content=content)
+
+    def test_post_reaches_author_and_followers_after_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            post = Post.objects.create(author=self.author, content='Nyama choma tonight')
+        self.assertFalse(FeedEntry.objects.exists())
+        for callback in callbacks:
+            callback()
+        self.assertCountEqual(
+            FeedEntry.objects.filter(post=post).values_list('owner_id', flat=True),
+            [self.author.pk] + [follower.pk for follower in self.followers],
+        )
+
+    @override_settings(FEED_MAX_LENGTH=3)
+    def test_feeds_are_trimmed_on_write(self):
+        posts = [self.post(str(i)) for i in range(5)]
+        for owner in [self.author] + self.followers:
+            self.assertEqual(
+                list(FeedEntry.objects.filter(owner=owner).order_by('-created_at', '-post_id').values_list('post_id', flat=True)),
+                [post.pk for post in reversed(posts[2:])],
+            )
+
+    def test_unfollowed_author_leaves_the_feed(self):
+        post = self.post('Pilau on Friday')
+        follower = self.followers[0]
+        client = APIClient()
+        client.force_authenticate(follower)
+        self.assertEqual([p['id'] for p in client.get('/api/feed/').data['results']], [post.pk])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.delete(f'/api/profile/{self.author.profile.username}/follow/')
+        self.assertEqual(response.data['following'], False)
+        self.assertEqual(client.get('/api/feed/').data['results'], [])
+        self.assertEqual(FeedEntry.objects.filter(post=post).count(), 3)
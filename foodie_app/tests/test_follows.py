@@ -0,0 +1,100 @@
+from django.test import TestCase
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from foodie_app.models import Follow, Profile, User
+from foodie_app.services.follow_service import follow, rebuild_follow_counts, unfollow
+from foodie_app.tests.migration_case import MigrationTestCase
+
+
+class FollowTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(username=name, email=f'{name}@example.com', password='pw')
+            for name in ('wanjiru', 'otieno', 'akinyi')
+        ]
+
+    def setUp(self):
+        self.wanjiru, self.otieno, self.akinyi = (Profile.objects.get(user=user) for user in self.users)
+
+    def assertCountsMatchEdges(self):
+        stored = list(Profile.objects.order_by('pk').values_list('followers_count', 'following_count'))
+        rebuild_follow_counts()
+        self.assertEqual(stored, list(Profile.objects.order_by('pk').values_list('followers_count', 'following_count')))
+
+    def test_follow_and_unfollow_are_idempotent(self):
+        self.assertTrue(follow(self.wanjiru, self.otieno))
+        self.assertFalse(follow(self.wanjiru, self.otieno))
+        self.assertTrue(follow(self.akinyi, self.otieno))
+        self.assertCountsMatchEdges()
+        self.otieno.refresh_from_db()
+        self.assertEqual((self.otieno.followers_count, self.otieno.following_count), (2, 0))
+
+        self.assertTrue(unfollow(self.wanjiru, self.otieno))
+        self.assertFalse(unfollow(self.wanjiru, self.otieno))
+        self.assertCountsMatchEdges()
+        self.otieno.refresh_from_db()
+        self.assertEqual(self.otieno.followers_count, 1)
+
+    def test_self_follow_is_rejected(self):
+        with self.assertRaises(ValidationError):
+            follow(self.wanjiru, self.wanjiru)
+        self.assertFalse(Follow.objects.exists())
+
+    def test_m2m_changes_keep_counts(self):
+        self.wanjiru.following.add(self.otieno, self.akinyi)
+        self.akinyi.follower_profiles.add(self.otieno)
+        self.assertCountsMatchEdges()
+        self.wanjiru.following.remove(self.akinyi)
+        self.otieno.delete()
+        self.assertCountsMatchEdges()
+        self.akinyi.refresh_from_db()
+        self.assertEqual((self.akinyi.followers_count, self.akinyi.following_count), (0, 0))
+
+    def test_follow_view(self):
+        client = APIClient()
+        client.force_authenticate(self.users[0])
+        url = f'/api/profile/{self.otieno.username}/follow/'
+        for method, status, following, followers in (
+            ('post', 201, True, 1), ('post', 200, True, 1), ('delete', 200, False, 0), ('delete', 200, False, 0),
+        ):
+            with self.subTest(method=method):
+                response = getattr(client, method)(url)
+                self.assertEqual(response.status_code, status)
+                self.assertEqual(response.data, {'following': following, 'followers_count': followers})
+        self.assertEqual(client.post(f'/api/profile/{self.wanjiru.username}/follow/').status_code, 400)
+
+
+class FollowGraphMigrationTests(MigrationTestCase):
+    migrate_from = '0022_likes'
+    migrate_to = '0023_follow_graph'
+
+    def setUpBeforeMigration(self, apps):
+        User = apps.get_model('foodie_app', 'User')
+        Profile = apps.get_model('foodie_app', 'Profile')
+        self.ids = {}
+        for name in ('wanjiru', 'otieno', 'akinyi'):
+            user = User.objects.create(username=name, email=f'{name}@example.com')
+            self.ids[name] = Profile.objects.create(user=user, username=name).pk
+        wanjiru, otieno, akinyi = (Profile.objects.get(pk=self.ids[name]) for name in ('wanjiru', 'otieno', 'akinyi'))
+        wanjiru.following.add(otieno, wanjiru)
+        # Both tables hold otieno -> wanjiru; followers_number is read in reverse
+        otieno.following.add(wanjiru)
+        wanjiru.followers_number.add(otieno)
+        akinyi.followers_number.add(wanjiru)
+
+    def test_both_tables_are_merged_and_counted(self):
+        apps = self.migrate()
+        Follow = apps.get_model('foodie_app', 'Follow')
+        Profile = apps.get_model('foodie_app', 'Profile')
+        names = {pk: name for name, pk in self.ids.items()}
+        self.assertCountEqual(
+            [(names[follower], names[followee]) for follower, followee in Follow.objects.values_list('follower', 'followee')],
+            [('wanjiru', 'otieno'), ('wanjiru', 'akinyi'), ('otieno', 'wanjiru')],
+        )
+        self.assertEqual(
+            {names[pk]: (followers, following) for pk, followers, following in Profile.objects.values_list(
+                'pk', 'followers_count', 'following_count'
+            )},
+            {'wanjiru': (1, 2), 'otieno': (1, 1), 'akinyi': (1, 0)},
+        )
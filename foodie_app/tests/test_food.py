@@ -0,0 +1,34 @@
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+from foodie_app.models import Food, Restaurant, User
+
+
+class FoodCatalogTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        cls.restaurant = Restaurant.objects.create(
+            owner=owner, name='Nyama Mama', address='Delta', city='Nairobi', country='KE', phone_number='1'
+        )
+        other = Restaurant.objects.create(
+            owner=owner, name='Tamarind', address='Nyali', city='Mombasa', country='KE', phone_number='1'
+        )
+        for price in ('3.00', '6.00', '9.00'):
+            Food.objects.create(name=f'Dish {price}', category='main_course', restaurant=cls.restaurant, price=Decimal(price))
+        Food.objects.create(name='Juice', category='beverage', restaurant=other, price=Decimal('2.00'))
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_filters(self):
+        response = self.client.get(f'/api/food/?restaurant={self.restaurant.pk}&min_price=4&max_price=9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([food['price'] for food in response.data['results']], ['6.00', '9.00'])
+        response = self.client.get('/api/food/?category=beverage')
+        self.assertEqual([food['name'] for food in response.data['results']], ['Juice'])
+
+    def test_invalid_filters_are_rejected(self):
+        for query in ('restaurant=abc', 'restaurant=%C2%B2', 'category=soup', 'min_price=cheap', 'max_price=NaN'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/food/?{query}').status_code, 400)
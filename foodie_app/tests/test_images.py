@@ -0,0 +1,54 @@
+import io
+import shutil
+import tempfile
+from unittest import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+from foodie_app.models import Post, User
+from foodie_app.storage import ContentAddressedStorage
+
+
+def jpeg(color='red'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (1200, 900), color).save(buffer, 'JPEG')
+    return SimpleUploadedFile('photo.jpg', buffer.getvalue(), 'image/jpeg')
+
+
+class ImageRenditionTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = User.objects.create_user(username='cook', email='cook@example.com', password='pw')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_renditions_appear_once_processed(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post('/api/posts/', {'content': 'Chapati', 'image': jpeg()}, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(response.data['image_renditions']['thumbnail'])
+
+        for callback in callbacks:
+            callback()
+        post = Post.objects.get(pk=response.data['id'])
+        self.assertTrue(post.image_processed)
+        # Readers take readiness from the row, not from storage
+        with mock.patch.object(ContentAddressedStorage, 'exists', side_effect=AssertionError):
+            renditions = self.client.get('/api/posts/').data[0]['image_renditions']
+        self.assertTrue(renditions['thumbnail'].endswith('/thumbnail.jpg'))
+        self.assertTrue(renditions['webp'].endswith('/webp.webp'))
+
+    def test_new_upload_waits_for_its_own_renditions(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/posts/', {'content': 'Chapati', 'image': jpeg()}, format='multipart')
+        with self.captureOnCommitCallbacks():
+            response = self.client.patch(
+                f"/api/posts/{response.data['id']}/", {'image': jpeg('blue')}, format='multipart'
+            )
+        self.assertIsNone(response.data['image_renditions']['thumbnail'])
+        self.assertFalse(Post.objects.get(pk=response.data['id']).image_processed)
@@ -0,0 +1,47 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from foodie_app.models import Post, Story, User
+from foodie_app.services.like_service import fold_like_counters, toggle_like
+
+
+class LikeCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user(username='author', email='author@example.com', password='pw')
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.post = Post.objects.create(author=cls.author, content='Ugali and sukuma')
+        cls.story = Story.objects.create(author=cls.author, content='At the market')
+        cls.fans = [
+            User.objects.create_user(username=f'fan{i}', email=f'fan{i}@example.com', password='pw') for i in range(3)
+        ]
+        for fan in cls.fans:
+            toggle_like(fan, cls.post)
+            toggle_like(fan, cls.story)
+        toggle_like(cls.fans[0], cls.post)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.author)
+
+    def assertLikes(self, post_likes, story_likes):
+        responses = {
+            f'/api/posts/{self.post.pk}/': lambda data: data,
+            '/api/posts/': lambda data: data[0],
+            '/api/profile/author/posts/': lambda data: data['results'][0],
+            '/api/profile/author/': lambda data: data['recent_posts'][0],
+            '/api/feed/': lambda data: data['results'][0],
+        }
+        for url, post in responses.items():
+            with self.subTest(url=url):
+                self.assertEqual(post(self.client.get(url).data)['likes'], post_likes)
+        self.assertEqual(self.client.get(f'/api/stories/{self.story.pk}/').data['likes'], story_likes)
+        self.assertEqual(self.client.get('/api/stories/').data['results'][0]['likes'], story_likes)
+
+    def test_pending_shard_deltas_are_counted(self):
+        self.assertEqual(Post.objects.get(pk=self.post.pk).likes, 0)
+        self.assertLikes(2, 3)
+
+    def test_folding_keeps_the_count(self):
+        fold_like_counters()
+        self.assertEqual(Post.objects.get(pk=self.post.pk).likes, 2)
+        self.assertLikes(2, 3)
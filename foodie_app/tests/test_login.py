@@ -0,0 +1,69 @@
+from unittest import mock
+from django.contrib.auth import authenticate
+from django.contrib.auth.hashers import MD5PasswordHasher
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from foodie_app.models import User
+from foodie_app.tests.migration_case import MigrationTestCase
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class EmailLoginTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='mwangi', email='Mwangi@Example.com', password='pw', is_staff=True, is_superuser=True
+        )
+
+    def hashes(self):
+        return mock.patch.object(MD5PasswordHasher, 'encode', autospec=True, side_effect=MD5PasswordHasher.encode)
+
+    def test_email_matches_ignoring_case(self):
+        for email in ('Mwangi@Example.com', 'mwangi@example.com', 'MWANGI@EXAMPLE.COM'):
+            with self.subTest(email=email):
+                self.assertEqual(authenticate(None, email=email, password='pw'), self.user)
+        self.assertIsNone(authenticate(None, email='mwangi@example.com', password='wrong'))
+
+    def test_one_hash_per_attempt(self):
+        for email, password in (('nobody@example.com', 'pw'), ('mwangi@example.com', 'wrong'), ('mwangi@example.com', 'pw')):
+            with self.subTest(email=email, password=password), self.hashes() as encode:
+                authenticate(None, email=email, password=password)
+                self.assertEqual(encode.call_count, 1)
+
+    def test_username_argument_takes_the_email(self):
+        # The admin login form passes the email as username=; usernames themselves no longer log in
+        self.assertEqual(authenticate(None, username='mwangi@example.com', password='pw'), self.user)
+        self.assertIsNone(authenticate(None, username='mwangi', password='pw'))
+        response = self.client.post('/admin/login/', {'username': 'mwangi@example.com', 'password': 'pw', 'next': '/admin/'})
+        self.assertRedirects(response, '/admin/', fetch_redirect_response=False)
+
+    def test_token_login(self):
+        client = APIClient()
+        response = client.post('/api/token/', {'email': 'MWANGI@example.com', 'password': 'pw'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data), {'refresh', 'access'})
+        response = client.post('/api/token/', {'email': 'mwangi', 'password': 'pw'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_inactive_user_gets_no_token(self):
+        User.objects.filter(pk=self.user.pk).update(is_active=False)
+        response = APIClient().post('/api/token/', {'email': 'mwangi@example.com', 'password': 'pw'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn('access', response.data)
+
+
+class EmailCaseMigrationTests(MigrationTestCase):
+    migrate_from = '0027_accommodation_rates'
+    migrate_to = '0028_user_email_ci'
+
+    def setUpBeforeMigration(self, apps):
+        self.User = apps.get_model('foodie_app', 'User')
+        self.User.objects.create(username='mwangi', email='mwangi@example.com')
+        self.User.objects.create(username='mwangi2', email='Mwangi@Example.com')
+
+    def test_case_duplicates_stop_the_migration(self):
+        with self.assertRaisesMessage(RuntimeError, 'mwangi@example.com'):
+            self.migrate()
+        self.User.objects.filter(username='mwangi2').delete()
+        User = self.migrate().get_model('foodie_app', 'User')
+        self.assertEqual(User.objects.get().username, 'mwangi')
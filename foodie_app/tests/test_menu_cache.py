@@ -0,0 +1,78 @@
+from decimal import Decimal
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from foodie_app.checks import check_menu_cache_is_shared
+from foodie_app.models import Food, Restaurant, User
+
+
+class MenuCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        cls.restaurant = Restaurant.objects.create(
+            owner=owner, name='Talisman', address='Ngong Rd', city='Nairobi', country='KE', phone_number='1'
+        )
+        cls.food = Food.objects.create(name='Pilau', category='main_course', restaurant=cls.restaurant, price=Decimal('7.00'))
+
+    def setUp(self):
+        # Versions and responses would otherwise carry over between tests that reuse ids
+        caches['menu'].clear()
+        self.client = APIClient()
+
+    def change_price(self, price):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.food.price = Decimal(price)
+            self.food.save()
+
+    def test_matching_etag_is_not_modified(self):
+        for url in (f'/api/food/{self.food.pk}/', f'/api/food/?restaurant={self.restaurant.pk}'):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotIn('Last-Modified', response)
+                etag = response['ETag']
+                with self.assertNumQueries(0):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response['ETag'], etag)
+
+    def test_change_bumps_version(self):
+        url = f'/api/food/{self.food.pk}/'
+        etag = self.client.get(url)['ETag']
+        self.change_price('8.00')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['price'], '8.00')
+
+    def test_changes_within_a_second_are_told_apart(self):
+        url = f'/api/food/?restaurant={self.restaurant.pk}'
+        etags = {self.client.get(url)['ETag']}
+        for price in ('8.00', '9.00'):
+            self.change_price(price)
+            etags.add(self.client.get(url)['ETag'])
+        self.assertEqual(len(etags), 3)
+
+
+    @override_settings(MENU_CACHE_ENABLED=False)
+    def test_disabled_cache_serves_without_etags(self):
+        url = f'/api/food/{self.food.pk}/'
+        response = self.client.get(url)
+        self.assertNotIn('ETag', response)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.food.price = Decimal('8.00')
+            self.food.save()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH='*').data['price'], '8.00')
+
+
+class MenuCacheCheckTests(TestCase):
+    def test_enabled_locmem_is_refused_whatever_debug_says(self):
+        for debug in (False, True):
+            with self.subTest(debug=debug), override_settings(DEBUG=debug):
+                self.assertEqual([error.id for error in check_menu_cache_is_shared(None)], ['foodie_app.E001'])
+        with override_settings(MENU_CACHE_ENABLED=False):
+            self.assertEqual(check_menu_cache_is_shared(None), [])
+        redis = {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://localhost'}
+        with override_settings(CACHES={'default': redis, 'menu': redis}):
+            self.assertEqual(check_menu_cache_is_shared(None), [])
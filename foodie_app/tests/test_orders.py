@@ -0,0 +1,116 @@
+from decimal import Decimal
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from foodie_app.models import Food, Order, OrderItem, Restaurant, User
+from foodie_app.query_budget import query_budget
+from foodie_app.views.order_views import OrderListView
+
+
+class OrderListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='diner', email='diner@example.com', password='pw')
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        restaurant = Restaurant.objects.create(
+            owner=owner, name='Mama Oliech', address='Marcus Garvey Rd', city='Nairobi', country='KE', phone_number='1'
+        )
+        food = Food.objects.create(name='Fish', category='main_course', restaurant=restaurant, price=Decimal('9.50'))
+        # One bulk insert, so the orders share order_time and only the id orders them
+        orders = Order.objects.bulk_create(
+            Order(user=cls.user, restaurant=restaurant, total_price=Decimal('19.00'), subtotal=Decimal('19.00'), item_count=2)
+            for _ in range(500)
+        )
+        OrderItem.objects.bulk_create(
+            OrderItem(order=order, food=food, quantity=2, price=Decimal('9.50')) for order in orders
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_page_stays_within_query_budget(self):
+        with query_budget(OrderListView.query_budget):
+            response = self.client.get('/api/orders/?page_size=100')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 100)
+        self.assertEqual(len(response.data['results'][0]['order_items']), 1)
+
+    def test_cursor_walks_every_order_once(self):
+        seen = []
+        url = '/api/orders/?page_size=30'
+        while url:
+            with query_budget(OrderListView.query_budget):
+                response = self.client.get(url)
+            seen += [order['id'] for order in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(len(seen), 500)
+        self.assertEqual(seen, sorted(Order.objects.values_list('id', flat=True), reverse=True))
+
+    def test_previous_page_matches(self):
+        first = self.client.get('/api/orders/?page_size=30')
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(
+            [order['id'] for order in back.data['results']], [order['id'] for order in first.data['results']]
+        )
+
+
+class OrderPlacementTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='diner', email='diner@example.com', password='pw')
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        cls.restaurant = Restaurant.objects.create(
+            owner=owner, name='Mama Oliech', address='Marcus Garvey Rd', city='Nairobi', country='KE', phone_number='1'
+        )
+        other = Restaurant.objects.create(
+            owner=owner, name='Tamarind', address='Nyali', city='Mombasa', country='KE', phone_number='1'
+        )
+        cls.foods = [
+            Food.objects.create(name=f'Dish {i}', category='main_course', restaurant=cls.restaurant, price=Decimal(i + 1))
+            for i in range(6)
+        ]
+        cls.elsewhere = Food.objects.create(name='Biryani', category='main_course', restaurant=other, price=Decimal('5'))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def place(self, *items):
+        return self.client.post('/api/orders/create/', {
+            'restaurant': self.restaurant.pk,
+            'order_items': [{'food_id': food_id, 'quantity': quantity} for food_id, quantity in items],
+        }, format='json')
+
+    def test_order_and_items_are_written_with_totals(self):
+        response = self.place((self.foods[0].pk, 2), (self.foods[2].pk, 1))
+        self.assertEqual(response.status_code, 201)
+        order = Order.objects.get()
+        self.assertEqual((order.total_price, order.subtotal, order.item_count), (Decimal('5'), Decimal('5'), 3))
+        self.assertCountEqual(
+            order.order_items.values_list('food_id', 'quantity', 'price'),
+            [(self.foods[0].pk, 2, Decimal('1')), (self.foods[2].pk, 1, Decimal('3'))],
+        )
+
+    def test_queries_do_not_grow_with_the_lines(self):
+        counts = []
+        for foods in (self.foods[:1], self.foods):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.place(*((food.pk, 1) for food in foods)).status_code, 201)
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_rejected_orders_write_nothing(self):
+        for items, status in (
+            ([(self.foods[0].pk, 1), (self.foods[0].pk, 2)], 400),
+            ([(self.foods[0].pk, 1), (999999, 1)], 404),
+            ([(self.foods[0].pk, 1), (self.elsewhere.pk, 1)], 400),
+            ([(self.foods[0].pk, 0)], 400),
+            ([], 400),
+        ):
+            with self.subTest(items=items):
+                self.assertEqual(self.place(*items).status_code, status)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
@@ -0,0 +1,44 @@
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+from rest_framework.test import APIRequestFactory
+from foodie_app.models import Manager, Restaurant, User
+from foodie_app.permissions import managed_restaurant_ids
+
+
+@override_settings(MANAGED_RESTAURANTS_CACHE_ALIAS='default')
+class ManagedRestaurantsCacheTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        cls.buyer = User.objects.create_user(username='buyer', email='buyer@example.com', password='pw')
+        cls.restaurant = Restaurant.objects.create(
+            owner=cls.owner, name='Talisman', address='Ngong Rd', city='Nairobi', country='KE', phone_number='1'
+        )
+
+    def setUp(self):
+        caches['default'].clear()
+
+    def restaurant_ids(self, user):
+        request = APIRequestFactory().get('/')
+        request.user = user
+        return managed_restaurant_ids(request)
+
+    def test_reassigning_the_owner_drops_the_previous_owner(self):
+        self.assertEqual(self.restaurant_ids(self.owner), {self.restaurant.pk})
+        self.assertEqual(self.restaurant_ids(self.buyer), set())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.restaurant.owner = self.buyer
+            self.restaurant.save()
+        self.assertEqual(self.restaurant_ids(self.owner), set())
+        self.assertEqual(self.restaurant_ids(self.buyer), {self.restaurant.pk})
+
+    def test_reassigning_a_manager_drops_the_previous_manager(self):
+        manager = User.objects.create_user(username='manager', email='manager@example.com', password='pw')
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment = Manager.objects.create(user=manager, restaurant=self.restaurant)
+        self.assertEqual(self.restaurant_ids(manager), {self.restaurant.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            assignment.user = self.buyer
+            assignment.save()
+        self.assertEqual(self.restaurant_ids(manager), set())
+        self.assertEqual(self.restaurant_ids(self.buyer), {self.restaurant.pk})
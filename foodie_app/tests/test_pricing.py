@@ -0,0 +1,38 @@
+from decimal import Decimal
+from django.test import TestCase
+from rest_framework.test import APIClient
+from foodie_app.models import Accommodation, Restaurant, User
+
+
+class AccommodationPricingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        restaurant = Restaurant.objects.create(
+            owner=cls.owner, name='Lake House', address='Moi South Lake Rd', city='Naivasha', country='KE', phone_number='1'
+        )
+        cls.accommodation = Accommodation.objects.create(
+            name='Cottage', address='Moi South Lake Rd', city='Naivasha', country='KE', restaurant=restaurant,
+            price_per_night=Decimal('50'), weekend_price_per_night=Decimal('0'),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.owner)
+
+    def test_free_weekend_nights_agree_between_quote_and_search(self):
+        # Thursday to Monday: two weekday and two free weekend nights
+        stay = 'check_in=2030-01-03T14:00:00Z&check_out=2030-01-07T10:00:00Z'
+        quote = self.client.get(f'/api/accommodation/{self.accommodation.pk}/quote/?{stay}').data
+        self.assertEqual([night['price_per_night'] for night in quote['nights']], [Decimal('50'), 0, 0, Decimal('50')])
+        self.assertEqual(quote['total_price'], Decimal('100'))
+        search = self.client.get(f'/api/accommodation/available/?city=Naivasha&{stay}').data['results']
+        self.assertEqual(Decimal(search[0]['quoted_total']), quote['total_price'])
+
+    def test_rate_ranges_are_bounded(self):
+        url = f'/api/accommodation/{self.accommodation.pk}/rates/'
+        year = {'start_date': '2030-01-01', 'end_date': '2030-12-31', 'price_per_night': '80'}
+        self.assertEqual(self.client.post(url, year, format='json').data, {'rates_set': 365})
+        response = self.client.post(url, {**year, 'end_date': '2031-01-02'}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('end_date', response.data)
@@ -0,0 +1,48 @@
+from django.core import mail
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from foodie_app.models import Profile, User
+
+
+@override_settings(TASK_WORKERS=0)
+class RegistrationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user(username='existing', email='existing@example.com', password='pw')
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def register(self, **overrides):
+        data = {
+            'username': 'diner', 'email': 'diner@example.com', 'password': 'a-Long-passw0rd',
+            'full_name': 'Amani Diner', 'phone_number': '1', 'country': 'KE', 'city': 'Nairobi',
+            'address': 'Moi Ave', 'postal_code': '00100',
+        }
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post('/api/register/', {**data, **overrides}, format='json')
+
+    def test_registration_creates_profile_and_sends_welcome_email(self):
+        response = self.register()
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(username='diner')
+        self.assertTrue(user.check_password('a-Long-passw0rd'))
+        self.assertTrue(Profile.objects.filter(user=user, username='diner').exists())
+        self.assertEqual([message.to for message in mail.outbox], [['diner@example.com']])
+
+    def test_duplicate_email_is_reported_on_email(self):
+        for email in ('existing@example.com', 'Existing@Example.com', 'username@example.com'):
+            with self.subTest(email=email):
+                if email.startswith('username'):
+                    User.objects.create_user(username='other', email=email, password='pw')
+                response = self.register(email=email)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(list(response.data), ['email'])
+        self.assertEqual(mail.outbox, [])
+
+    def test_duplicate_username_is_reported_on_username(self):
+        # The submitted email names the other field, which must not be mistaken for the duplicate
+        response = self.register(username='existing', email='email@example.com')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(list(response.data), ['username'])
+        self.assertFalse(User.objects.filter(email='email@example.com').exists())
@@ -0,0 +1,89 @@
+from datetime import datetime, time, timedelta
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from foodie_app.models import Reservation, ReservationCategory, ReservationSlot, Restaurant, User
+
+
+class ReservationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        cls.diner = User.objects.create_user(username='diner', email='diner@example.com', password='pw')
+        cls.restaurant = Restaurant.objects.create(
+            owner=cls.owner, name='Habesha', address='Argwings Kodhek Rd', city='Nairobi', country='KE', phone_number='1'
+        )
+        cls.starts_at = timezone.make_aware(datetime.combine(timezone.localdate() + timedelta(days=1), time(12, 0)))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.diner)
+
+    def book(self, people):
+        return self.client.post('/api/reservations/', {
+            'restaurant': self.restaurant.pk, 'reservation_type': 'meeting_table',
+            'reservation_date': self.starts_at.isoformat(), 'number_of_people': people,
+        }, format='json')
+
+    def test_category_without_capacity_has_no_limit(self):
+        ReservationCategory.objects.create(name='Tables', reservation_type='meeting_table', restaurant=self.restaurant)
+        response = self.book(40)
+        self.assertEqual(response.status_code, 201)
+        self.assertIsNone(response.data['slot'])
+        slots = self.client.get(f'/api/restaurants/{self.restaurant.pk}/availability/?date={self.starts_at.date()}').data['slots']
+        self.assertIn({'reservation_type': 'meeting_table', 'starts_at': self.starts_at,
+                       'ends_at': self.starts_at + timedelta(hours=1), 'available': None}, slots)
+
+    def test_capacity_limits_a_slot(self):
+        ReservationCategory.objects.create(
+            name='Tables', reservation_type='meeting_table', restaurant=self.restaurant, capacity=4
+        )
+        self.assertEqual(self.book(3).status_code, 201)
+        self.assertEqual(self.book(2).status_code, 400)
+
+    def test_closed_category_takes_no_reservations(self):
+        ReservationCategory.objects.create(
+            name='Tables', reservation_type='meeting_table', restaurant=self.restaurant, capacity=0
+        )
+        self.assertEqual(self.book(2).status_code, 400)
+
+    def test_restaurant_and_owner_can_be_deleted_with_reservations(self):
+        category = ReservationCategory.objects.create(
+            name='Tables', reservation_type='meeting_table', restaurant=self.restaurant, capacity=4
+        )
+        self.assertEqual(self.book(2).status_code, 201)
+        category.delete()
+        self.assertIsNone(Reservation.objects.get().slot)
+
+        ReservationCategory.objects.create(
+            name='Tables', reservation_type='meeting_table', restaurant=self.restaurant, capacity=4
+        )
+        self.assertEqual(self.book(2).status_code, 201)
+        self.owner.delete()
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_put_of_unchanged_slot_fields_keeps_the_seats(self):
+        ReservationCategory.objects.create(
+            name='Tables', reservation_type='meeting_table', restaurant=self.restaurant, capacity=4
+        )
+        reservation = self.book(3).data
+        # The reservation's time has passed since it was booked
+        past = self.starts_at - timedelta(days=2)
+        Reservation.objects.filter(pk=reservation['id']).update(reservation_date=past)
+        ReservationSlot.objects.update(starts_at=past)
+        response = self.client.put(f"/api/reservations/{reservation['id']}/", {
+            'restaurant': self.restaurant.pk, 'reservation_type': 'meeting_table',
+            'reservation_date': past.isoformat(), 'number_of_people': 3, 'special_requests': 'Window seat',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Reservation.objects.get().special_requests, 'Window seat')
+        self.assertEqual(ReservationSlot.objects.get().booked, 3)
+
+    def test_changing_the_party_size_moves_the_seats(self):
+        ReservationCategory.objects.create(
+            name='Tables', reservation_type='meeting_table', restaurant=self.restaurant, capacity=4
+        )
+        reservation = self.book(3).data
+        response = self.client.patch(f"/api/reservations/{reservation['id']}/", {'number_of_people': 4}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ReservationSlot.objects.get().booked, 4)
@@ -0,0 +1,79 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+from foodie_app.models import Restaurant, RestaurantReview, User
+
+RATING_FIELDS = ['rating_count', 'rating_sum', 'rating_average'] + [f'rating_{rating}_count' for rating in range(1, 6)]
+
+
+class RestaurantRatingTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        cls.diners = [
+            User.objects.create_user(username=f'diner{i}', email=f'diner{i}@example.com', password='pw') for i in range(3)
+        ]
+        cls.nairobi = [
+            Restaurant.objects.create(owner=cls.owner, name=name, address='CBD', city='Nairobi', country='KE', phone_number='1')
+            for name in ('Nyama Mama', 'Habesha', 'Talisman')
+        ]
+        cls.mombasa = Restaurant.objects.create(
+            owner=cls.owner, name='Tamarind', address='Nyali', city='Mombasa', country='KE', phone_number='1'
+        )
+
+    def review(self, restaurant, rating, diner=0):
+        return RestaurantReview.objects.create(user=self.diners[diner], restaurant=restaurant, rating=rating, review='Ok')
+
+    def assertAggregatesMatchRebuild(self):
+        stored = list(Restaurant.objects.order_by('pk').values_list(*RATING_FIELDS))
+        Restaurant.objects.rebuild_ratings()
+        self.assertEqual(stored, list(Restaurant.objects.order_by('pk').values_list(*RATING_FIELDS)))
+
+    def test_aggregates_follow_every_change(self):
+        first, second = self.nairobi[:2]
+        review = self.review(first, 5)
+        self.review(first, 2, diner=1)
+        self.assertAggregatesMatchRebuild()
+        first.refresh_from_db()
+        self.assertEqual((first.rating_count, first.rating_average, first.rating_histogram[5]), (2, 3.5, 1))
+
+        review.rating = 4
+        review.save()
+        self.assertAggregatesMatchRebuild()
+
+        review.restaurant = second
+        review.save()
+        self.assertAggregatesMatchRebuild()
+        second.refresh_from_db()
+        self.assertEqual((second.rating_count, second.rating_4_count), (1, 1))
+
+        review.delete()
+        self.assertAggregatesMatchRebuild()
+        self.review(second, 3)
+        self.review(second, 1, diner=2)
+        RestaurantReview.objects.filter(restaurant=second).delete()
+        self.assertAggregatesMatchRebuild()
+        second.refresh_from_db()
+        self.assertEqual((second.rating_count, second.rating_sum, second.rating_average), (0, 0, 0.0))
+
+    def test_city_listing_ordered_by_rating(self):
+        nyama, habesha, talisman = self.nairobi
+        self.review(habesha, 5)
+        self.review(talisman, 4)
+        self.review(talisman, 4, diner=1)
+        self.review(nyama, 4)
+        self.review(self.mombasa, 5)
+        response = APIClient().get('/api/restaurants/?ordering=rating&city=Nairobi')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['name'] for r in response.data['results']], ['Habesha', 'Talisman', 'Nyama Mama'])
+        self.assertEqual(APIClient().get('/api/restaurants/?ordering=stars').status_code, 400)
+
+    def test_reviews_are_paginated_newest_first(self):
+        reviews = [self.review(self.mombasa, rating, diner=rating % 3) for rating in (1, 2, 3, 4, 5)]
+        client = APIClient()
+        seen = []
+        url = f'/api/restaurants/{self.mombasa.pk}/reviews/?page_size=2'
+        while url:
+            response = client.get(url)
+            seen += [review['id'] for review in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, [review.pk for review in reversed(reviews)])
@@ -0,0 +1,49 @@
+from datetime import timedelta
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+from foodie_app import revocation
+from foodie_app.models import User
+
+
+class RevocationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='diner', email='diner@example.com', password='pw')
+
+    def setUp(self):
+        # The revocation list is per process; start every test from the table
+        revocation._state = None
+        self.addCleanup(setattr, revocation, '_state', None)
+
+    def login(self):
+        return APIClient().post('/api/token/', {'email': 'diner@example.com', 'password': 'pw'}, format='json').data
+
+    def get(self, access):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return client.get('/api/reservations/').status_code
+
+    def test_logout_all_spares_tokens_issued_right_after(self):
+        before = self.login()
+        self.assertIsInstance(AccessToken(before['access'])['iat'], float)
+        self.assertEqual(self.get(before['access']), 200)
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {before['access']}")
+        self.assertEqual(client.post('/api/token/logout-all/').status_code, 204)
+        after = self.login()
+
+        self.assertEqual(self.get(before['access']), 401)
+        self.assertEqual(APIClient().post('/api/token/refresh/', {'refresh': before['refresh']}, format='json').status_code, 401)
+        self.assertEqual(self.get(after['access']), 200)
+
+    def test_whole_second_iat_is_revoked_within_the_cutoff_second(self):
+        now = timezone.now().replace(microsecond=500000)
+        token = AccessToken.for_user(self.user)
+        token['iat'] = int(now.timestamp())
+        revocation._current().cutoffs[self.user.pk] = now.timestamp()
+        self.assertTrue(revocation.is_revoked(token))
+        token['iat'] = (now + timedelta(milliseconds=1)).timestamp()
+        self.assertFalse(revocation.is_revoked(token))
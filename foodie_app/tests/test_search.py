@@ -0,0 +1,46 @@
+from decimal import Decimal
+from unittest import skipIf
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+from foodie_app.models import Food, Restaurant, User
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user(username='owner', email='owner@example.com', password='pw')
+        cls.pizzeria = Restaurant.objects.create(
+            owner=owner, name='Pizza Inn', address='Moi Ave', city='Nairobi', country='KE', phone_number='1',
+            description='Wood fired ovens',
+        )
+        cls.grill = Restaurant.objects.create(
+            owner=owner, name='Carnivore', address='Langata', city='Nairobi', country='KE', phone_number='1',
+            description='Grilled meats and pizza on Sundays',
+        )
+        Food.objects.create(name='Margherita Pizza', category='main_course', restaurant=cls.pizzeria, price=Decimal('8'))
+        Food.objects.create(name='Mango Juice', category='beverage', restaurant=cls.grill, price=Decimal('2'))
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_name_matches_rank_first(self):
+        response = self.client.get('/api/search/?q=pizza')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([r['name'] for r in response.data['restaurants']], ['Pizza Inn', 'Carnivore'])
+        self.assertEqual([f['name'] for f in response.data['foods']], ['Margherita Pizza'])
+
+    def test_type_and_limit(self):
+        response = self.client.get('/api/search/?q=pizza&type=restaurants&limit=1')
+        self.assertEqual(list(response.data), ['restaurants'])
+        self.assertEqual([r['name'] for r in response.data['restaurants']], ['Pizza Inn'])
+
+    def test_invalid_parameters(self):
+        for query in ('', 'q=pizza&type=drinks', 'q=pizza&limit=many', 'q=pizza&limit=0'):
+            with self.subTest(query=query):
+                self.assertEqual(self.client.get(f'/api/search/?{query}').status_code, 400)
+
+    @skipIf(connection.vendor == 'postgresql', "PostgreSQL matches words and trigrams, not substrings")
+    def test_sqlite_fallback_matches_substrings(self):
+        response = self.client.get('/api/search/?q=ANGO&type=foods')
+        self.assertEqual([f['name'] for f in response.data['foods']], ['Mango Juice'])
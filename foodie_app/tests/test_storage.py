@@ -0,0 +1,28 @@
+import shutil
+import tempfile
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+from foodie_app.storage import ContentAddressedStorage
+
+DIGEST = 'ab' * 32
+
+
+class ContentAddressedStorageTests(SimpleTestCase):
+    def setUp(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        self.storage = ContentAddressedStorage(location=location)
+
+    def test_hashed_names_are_kept(self):
+        for name in (f'post_images/{DIGEST}.jpg', f'renditions/post_images/{DIGEST}/thumbnail.jpg'):
+            with self.subTest(name=name):
+                self.assertEqual(self.storage.save(name, ContentFile(name.encode())), name)
+                self.assertEqual(self.storage.save(name, ContentFile(name.encode())), name)
+                self.assertEqual(self.storage.reference_count(name), 1)
+
+    def test_other_names_are_never_overwritten(self):
+        first = self.storage.save('story_images/menu.txt', ContentFile(b'lunch'))
+        second = self.storage.save('story_images/menu.txt', ContentFile(b'dinner'))
+        self.assertNotEqual(first, second)
+        with self.storage.open(first) as stored:
+            self.assertEqual(stored.read(), b'lunch')
@@ -0,0 +1,90 @@
+import shutil
+import tempfile
+from datetime import timedelta
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from foodie_app.models import Profile, Story, User
+from foodie_app.services.story_service import purge_expired_stories
+from foodie_app.tests.migration_case import MigrationTestCase
+
+
+class StoryTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='cook', email='cook@example.com', password='pw')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings = override_settings(MEDIA_ROOT=media_root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def expired(self, count):
+        return [
+            Story.objects.create(author=self.user, content=f'old {i}', expires_at=timezone.now() - timedelta(minutes=i + 1))
+            for i in range(count)
+        ]
+
+    def test_only_active_stories_are_served(self):
+        live = Story.objects.create(author=self.user, content='Samosa stand')
+        self.assertAlmostEqual(live.expires_at, live.created_at + timedelta(hours=24), delta=timedelta(seconds=1))
+        old = self.expired(1)[0]
+        self.assertEqual(list(Story.objects.active()), [live])
+        self.assertEqual([story['id'] for story in self.client.get('/api/stories/').data['results']], [live.pk])
+        self.assertEqual(self.client.get(f'/api/stories/{old.pk}/').status_code, 404)
+
+    def test_stories_are_paginated_newest_first(self):
+        stories = [Story.objects.create(author=self.user, content=str(i)) for i in range(5)]
+        seen = []
+        url = '/api/stories/?page_size=2'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [story['id'] for story in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, [story.pk for story in reversed(stories)])
+
+    def test_purge_deletes_in_batches_with_links_and_files(self):
+        live = Story.objects.create(author=self.user, content='Samosa stand')
+        old = self.expired(5)
+        old[0].image.save('stand.jpg', ContentFile(b'not really a jpeg'))
+        image = old[0].image.name
+        storage = Story._meta.get_field('image').storage
+        profile = Profile.objects.get(user=self.user)
+        profile.stories.add(live, *old)
+
+        # Three batches, the last one short
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.assertEqual(purge_expired_stories(batch_size=2), 5)
+        self.assertEqual(len(callbacks), 3)
+        self.assertEqual(list(Story.objects.all()), [live])
+        self.assertEqual(list(profile.stories.all()), [live])
+        # Files go only once the deletions commit
+        self.assertTrue(storage.exists(image))
+        for callback in callbacks:
+            callback()
+        self.assertFalse(storage.exists(image))
+
+
+class StoryExpiryMigrationTests(MigrationTestCase):
+    migrate_from = '0020_home_feed'
+    migrate_to = '0021_story_expiry'
+
+    def setUpBeforeMigration(self, apps):
+        User = apps.get_model('foodie_app', 'User')
+        Story = apps.get_model('foodie_app', 'Story')
+        user = User.objects.create(username='cook', email='cook@example.com')
+        self.expires_at = timezone.now() + timedelta(hours=3)
+        self.unset = Story.objects.create(author=user, content='No expiry')
+        self.set = Story.objects.create(author=user, content='Expiry', expires_at=self.expires_at)
+
+    def test_stories_without_expiry_expire_a_day_after_creation(self):
+        Story = self.migrate().get_model('foodie_app', 'Story')
+        unset = Story.objects.get(pk=self.unset.pk)
+        self.assertEqual(unset.expires_at, unset.created_at + timedelta(hours=24))
+        self.assertEqual(Story.objects.get(pk=self.set.pk).expires_at, self.expires_at)
@@ -1,26 +1,40 @@
 from django.urls import path
-from .views import User_views, Post_views, Story_views, restaurant_views, order_views, cart_views, food_views, accomodation_views, reservation_views
-
-from rest_framework_simplejwt.views import TokenRefreshView
+from .views import User_views, Post_views, Story_views, restaurant_views, order_views, cart_views, food_views, accomodation_views, reservation_views, search_views, feed_views, like_views, comment_views
 
 urlpatterns = [
     path('token/', User_views.MyTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('token/refresh/', User_views.MyTokenRefreshView.as_view(), name='token_refresh'),
+    path('token/logout/', User_views.LogoutView.as_view(), name='token_logout'),
+    path('token/logout-all/', User_views.LogoutAllView.as_view(), name='token_logout_all'),
     path('register/', User_views.RegisterView.as_view(), name='auth_register'),
     path('templates/u/profile.html/', User_views.ProfileRetrieveUpdateDestroyView.as_view(), name='user_profile'),
     path('templates/u/profile.html/update/', User_views.ProfileRetrieveUpdateDestroyView.as_view(), name='update_profile'),
+    path('follows/', User_views.following_status, name='following-status'),
     path('profile/<str:username>/', User_views.ProfileDetailView.as_view(), name='profile-detail'),
+    path('profile/<str:username>/follow/', User_views.FollowView.as_view(), name='profile-follow'),
+    path('profile/<str:username>/posts/', User_views.ProfilePostListView.as_view(), name='profile-posts'),
+    path('profile/<str:username>/followers/', User_views.ProfileFollowerListView.as_view(), name='profile-followers'),
+    path('profile/<str:username>/following/', User_views.ProfileFollowingListView.as_view(), name='profile-following'),
     path('test/', User_views.testEndPoint, name='test'),
     path('', User_views.getRoutes),
+    path('feed/', feed_views.HomeFeedView.as_view(), name='home-feed'),
     path('posts/', Post_views.PostListCreateView.as_view(), name='post-list-create'),
     path('posts/<int:pk>/', Post_views.PostRetrieveUpdateDestroyView.as_view(), name='post-detail'),
+    path('posts/<int:pk>/like/', like_views.PostLikeToggleView.as_view(), name='post-like'),
+    path('posts/<int:pk>/comments/', comment_views.PostCommentListCreateView.as_view(), name='post-comments'),
     path('stories/', Story_views.StoryListCreate.as_view(), name='stories-list-create'),
     path('stories/<int:pk>/', Story_views.StoryRetrieveUpdateDestroyView.as_view(), name='story-detail'),
+    path('stories/<int:pk>/like/', like_views.StoryLikeToggleView.as_view(), name='story-like'),
+    path('stories/<int:pk>/comments/', comment_views.StoryCommentListCreateView.as_view(), name='story-comments'),
+    path('comments/<int:pk>/', comment_views.CommentRetrieveUpdateDestroyView.as_view(), name='comment-detail'),
     path('restaurants/', restaurant_views.RestaurantListView.as_view(), name='restaurant_list'),
     path('restaurants/create/', restaurant_views.RestaurantCreateView.as_view(), name='restaurant_list'),
     path('restaurants/<int:pk>/', restaurant_views.RestaurantDetailView.as_view(), name='restaurant_detail'),
     path('restaurants/<int:pk>/update/', restaurant_views.RestaurantUpdateView.as_view(), name='restaurant-update'),
     path('restaurants/<int:pk>/delete/', restaurant_views.RestaurantDeleteView.as_view(), name='restaurant-delete'),
+    path('restaurants/<int:pk>/reviews/', restaurant_views.RestaurantReviewListCreateView.as_view(), name='restaurant-review-list-create'),
+    path('reviews/<int:pk>/', restaurant_views.RestaurantReviewDetailView.as_view(), name='restaurant-review-detail'),
+    path('search/', search_views.SearchView.as_view(), name='search'),
     path('food/', food_views.FoodListView.as_view(), name='food-list'),
     path('food/create/', food_views.FoodCreateView.as_view(), name='food-create'),
     path('food/<int:pk>/', food_views.FoodDetailView.as_view(), name='food-detail'),
@@ -35,13 +49,17 @@ urlpatterns = [
     path('cart/delete/<int:pk>/', cart_views.CartDeleteView.as_view(), name='remove-from-cart'),
     path('accommodation/create/', accomodation_views.AccommodationCreateView.as_view(), name='accommodation-create'),
     path('accommodation/', accomodation_views.AccommodationListView.as_view(), name='accommodation-list'),
+    path('accommodation/available/', accomodation_views.AccommodationAvailabilityView.as_view(), name='accommodation-availability'),
     path('accommodation/<int:pk>/', accomodation_views.AccommodationDetailView.as_view(), name='accommodation-detail'),
+    path('accommodation/<int:pk>/quote/', accomodation_views.AccommodationQuoteView.as_view(), name='accommodation-quote'),
+    path('accommodation/<int:pk>/rates/', accomodation_views.AccommodationRateView.as_view(), name='accommodation-rates'),
     path('accommodation/<int:pk>/update/', accomodation_views.AccommodationUpdateView.as_view(), name='accommodation-update'),
     path('accommodation/<int:pk>/delete/', accomodation_views.AccommodationDeleteView.as_view(), name='accommodation-delete'),
     path('bookings/', accomodation_views.BookingListCreateView.as_view(), name='booking-list-create'),
     path('bookings/<int:pk>/', accomodation_views.BookingRetrieveUpdateDestroyView.as_view(), name='booking-detail'),
     path('reservations/', reservation_views.ReservationListCreateAPIView.as_view(), name='reservation-list-create'),
-    path('reservations/<int:pk>/', reservation_views.ReservationRetrieveUpdateDestroyAPIView.as_view(), name='reservation-detail')
+    path('reservations/<int:pk>/', reservation_views.ReservationRetrieveUpdateDestroyAPIView.as_view(), name='reservation-detail'),
+    path('restaurants/<int:pk>/availability/', reservation_views.ReservationAvailabilityView.as_view(), name='reservation-availability'),
 ]
  # followers
 # reviews
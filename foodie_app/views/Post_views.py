@@ -7,13 +7,13 @@ class PostListCreateView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Post.objects.filter(author=self.request.user)
+        return Post.objects.with_like_counts().filter(author=self.request.user)
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
 class PostRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Post.objects.all()
+    queryset = Post.objects.with_like_counts()
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticated]
     
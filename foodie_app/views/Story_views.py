@@ -1,20 +1,27 @@
 from rest_framework import generics, permissions
+from foodie_app.async_views import AsyncListCreateAPIView
 from foodie_app.models import Story
+from foodie_app.pagination import StoryCursorPagination
 from foodie_app.serializer import StorySerializer
 
-class StoryListCreate(generics.ListCreateAPIView):
-    queryset = Story.objects.all()
+class StoryListCreate(AsyncListCreateAPIView):
     serializer_class = StorySerializer
     permission_classes = (permissions.IsAuthenticated,)
+    pagination_class = StoryCursorPagination
+
+    def get_queryset(self):
+        return Story.objects.active().with_like_counts()
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
 
 
 class StoryRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Story.objects.all()
     serializer_class = StorySerializer
     permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return Story.objects.active().with_like_counts()
     
     def get_object(self):
         post = super().get_object()
@@ -1,10 +1,20 @@
 from django.shortcuts import render, get_object_or_404
-from foodie_app.models import User, Profile
-from foodie_app.serializer import MyTokenObtainPairSerializer, RegisterSerializer, ProfileSerializer
-from rest_framework.exceptions import PermissionDenied, NotFound
+from foodie_app.async_views import AsyncRetrieveAPIView
+from foodie_app.models import User, Profile, Post
+from foodie_app.pagination import PostCursorPagination, ProfileCursorPagination
+from foodie_app.services.follow_service import follow, following_ids, unfollow
+from foodie_app.serializer import (
+    MyTokenObtainPairSerializer, MyTokenRefreshSerializer, RegisterSerializer, ProfileSerializer, ProfileSummarySerializer, PostSerializer,
+)
+from foodie_app.revocation import revoke_token, revoke_user_tokens
+from rest_framework.exceptions import PermissionDenied, NotFound, ValidationError
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
-from rest_framework_simplejwt.views import TokenObtainPairView
+from rest_framework.views import APIView
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from rest_framework import generics, permissions
 from django.views.generic import DetailView
 from rest_framework.permissions import IsAuthenticated
@@ -15,6 +25,38 @@ logger = logging.getLogger(__name__)
 
 class MyTokenObtainPairView(TokenObtainPairView):
     serializer_class = MyTokenObtainPairSerializer
+
+
+class MyTokenRefreshView(TokenRefreshView):
+    serializer_class = MyTokenRefreshSerializer
+
+
+class LogoutView(APIView):
+    """POST revokes the access token used and the ``refresh`` token given, if any."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        tokens = [request.auth] if request.auth is not None else []
+        if request.data.get('refresh'):
+            try:
+                refresh = RefreshToken(request.data['refresh'])
+            except TokenError as e:
+                raise ValidationError({'refresh': str(e)})
+            if refresh.get(jwt_settings.USER_ID_CLAIM) != request.user.pk:
+                raise PermissionDenied("This refresh token belongs to another user.")
+            tokens.append(refresh)
+        for token in tokens:
+            revoke_token(token)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class LogoutAllView(APIView):
+    """POST revokes every token issued to the user so far, on every device."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        revoke_user_tokens(request.user.pk)
+        return Response(status=status.HTTP_204_NO_CONTENT)
     
 
 class RegisterView(generics.CreateAPIView):
@@ -54,13 +96,88 @@ class ProfileRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
             raise PermissionDenied("User not authenticated")
         
         try:
-            profile = Profile.objects.get(user=user)
+            profile = Profile.objects.with_summary().get(user=user)
             logger.info(f"Profile retrieved for user {user.username}")
             return profile
         except Profile.DoesNotExist:
             logger.error(f"Profile not found for user {user.username}")
             raise NotFound("Profile not found")
-class ProfileDetailView(generics.RetrieveAPIView):
-    queryset = Profile.objects.all()
+class ProfileDetailView(AsyncRetrieveAPIView):
+    queryset = Profile.objects.with_summary()
     serializer_class = ProfileSerializer
-    lookup_field = 'username'
\ No newline at end of file
+    lookup_field = 'username'
+
+
+class ProfileRelatedListView(generics.ListAPIView):
+    """Base for the paginated lists hanging off ``profile/<username>/``."""
+    permission_classes = [IsAuthenticated]
+
+    def get_profile(self):
+        return get_object_or_404(Profile.objects.only('id', 'user_id'), username=self.kwargs['username'])
+
+
+class ProfilePostListView(ProfileRelatedListView):
+    serializer_class = PostSerializer
+    pagination_class = PostCursorPagination
+
+    def get_queryset(self):
+        return Post.objects.with_like_counts().filter(author_id=self.get_profile().user_id)
+
+
+class ProfileListView(ProfileRelatedListView):
+    serializer_class = ProfileSummarySerializer
+    pagination_class = ProfileCursorPagination
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many'):
+            profile_ids = [profile.pk for profile in args[0]]
+            kwargs['context'] = {**self.get_serializer_context(), 'following_ids': following_ids(self.request.user, profile_ids)}
+        return super().get_serializer(*args, **kwargs)
+
+
+class ProfileFollowerListView(ProfileListView):
+    def get_queryset(self):
+        return Profile.objects.filter(following=self.get_profile())
+
+
+class ProfileFollowingListView(ProfileListView):
+    def get_queryset(self):
+        return Profile.objects.filter(follower_profiles=self.get_profile())
+
+
+class FollowView(APIView):
+    """POST follows the profile, DELETE unfollows it."""
+    permission_classes = [IsAuthenticated]
+
+    def _respond(self, followee, changed, following):
+        followee.refresh_from_db(fields=['followers_count'])
+        return Response(
+            {'following': following, 'followers_count': followee.followers_count},
+            status=status.HTTP_201_CREATED if changed and following else status.HTTP_200_OK,
+        )
+
+    def _profiles(self, username):
+        followee = get_object_or_404(Profile.objects.only('id'), username=username)
+        follower = get_object_or_404(Profile.objects.only('id'), user=self.request.user)
+        return follower, followee
+
+    def post(self, request, username):
+        follower, followee = self._profiles(username)
+        return self._respond(followee, follow(follower, followee), True)
+
+    def delete(self, request, username):
+        follower, followee = self._profiles(username)
+        return self._respond(followee, unfollow(follower, followee), False)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def following_status(request):
+    """``?ids=1,2,3`` -> the ids among them that the requesting user follows."""
+    try:
+        profile_ids = [int(profile_id) for profile_id in request.query_params.get('ids', '').split(',') if profile_id]
+    except ValueError:
+        return Response({"ids": "Profile ids must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+    if len(profile_ids) > 200:
+        return Response({"ids": "At most 200 profile ids can be checked at once."}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({'following': sorted(following_ids(request.user, profile_ids))})
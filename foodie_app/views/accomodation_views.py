@@ -1,7 +1,17 @@
-from rest_framework import generics, permissions
-from rest_framework.exceptions import PermissionDenied
-from foodie_app.models import Accommodation
-from foodie_app.serializer import AccommodationSerializer
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from foodie_app.models import Accommodation, Booking
+from foodie_app.pagination import AccommodationCursorPagination
+from foodie_app.permissions import CanManageRestaurant, check_can_manage_restaurant
+from foodie_app.serializer import (
+    AccommodationRateSerializer, AccommodationSerializer, BookingSerializer, RateRangeSerializer,
+)
+from foodie_app.services.booking_service import available_accommodations, book, update_booking, validate_stay
+from foodie_app.services.pricing_service import clear_rates, nightly_rates, set_rates
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,14 +22,13 @@ class AccommodationCreateView(generics.CreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def perform_create(self, serializer):
-        user = self.request.user
         # Ensure the restaurant is retrieved correctly
         restaurant = serializer.validated_data.get('restaurant')
         if not restaurant:
             raise PermissionDenied("Restaurant must be provided for accommodation creation.")
-        if not (user == restaurant.owner or user in restaurant.managers.all()):
-            logger.warning(f"Unauthorized creation attempt by user: {user.username} for restaurant: {restaurant.id}")
-            raise PermissionDenied("You do not have permission to create accommodations for this restaurant.")
+        check_can_manage_restaurant(
+            self.request, restaurant.id, "You do not have permission to create accommodations for this restaurant."
+        )
         serializer.save()
         logger.info(f"Accommodation created successfully for restaurant: {restaurant.id}")
 # class AccommodationCreateView(generics.CreateAPIView):
@@ -49,50 +58,130 @@ class AccommodationDetailView(generics.RetrieveAPIView):
 class AccommodationUpdateView(generics.UpdateAPIView):
     queryset = Accommodation.objects.all()
     serializer_class = AccommodationSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [CanManageRestaurant]
 
     def perform_update(self, serializer):
-        user = self.request.user
-        accommodation = self.get_object()
-        if not (user == accommodation.restaurant.owner or user in accommodation.restaurant.managers.all()):
-            logger.warning(f"Unauthorized update attempt by user: {user.username} on accommodation: {accommodation.id}")
-            raise PermissionDenied("You do not have permission to update this accommodation.")
+        accommodation = serializer.instance
+        restaurant = serializer.validated_data.get('restaurant', accommodation.restaurant_id)
+        restaurant_id = getattr(restaurant, 'id', restaurant)
+        if restaurant_id != accommodation.restaurant_id:
+            check_can_manage_restaurant(
+                self.request, restaurant_id, "You do not have permission to move this accommodation to that restaurant."
+            )
         serializer.save()
         logger.info(f"Accommodation updated successfully: {accommodation.id}")
 
 class AccommodationDeleteView(generics.DestroyAPIView):
     queryset = Accommodation.objects.all()
     serializer_class = AccommodationSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [CanManageRestaurant]
 
     def perform_destroy(self, instance):
-        user = self.request.user
-        if not (user == instance.restaurant.owner or user in instance.restaurant.managers.all()):
-            logger.warning(f"Unauthorized delete attempt by user: {user.username} on accommodation: {instance.id}")
-            raise PermissionDenied("You do not have permission to delete this accommodation.")
         instance.delete()
         logger.info(f"Accommodation deleted successfully: {instance.id}")
 
-# views.py
+def _stay(request):
+    """The ``check_in`` and ``check_out`` query parameters, as datetimes."""
+    stay = []
+    for param in ('check_in', 'check_out'):
+        try:
+            stay.append(serializers.DateTimeField().to_internal_value(request.query_params.get(param, '')))
+        except ValidationError as e:
+            raise ValidationError({param: e.detail})
+    return stay
+
+
+class AccommodationAvailabilityView(generics.ListAPIView):
+    """``GET accommodation/available/?city=&check_in=&check_out=``: accommodations free for the whole stay."""
+    serializer_class = AccommodationSerializer
+    permission_classes = [permissions.AllowAny]
+    pagination_class = AccommodationCursorPagination
+
+    def get_queryset(self):
+        city = self.request.query_params.get('city')
+        if not city:
+            raise ValidationError({"city": "This parameter is required."})
+        return available_accommodations(city, *_stay(self.request))
+
+
+class AccommodationQuoteView(APIView):
+    """``GET accommodation/<pk>/quote/?check_in=&check_out=``: the stay's total and nightly prices."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, pk):
+        accommodation = get_object_or_404(Accommodation, pk=pk)
+        check_in_date, check_out_date = _stay(request)
+        validate_stay(check_in_date, check_out_date)
+        nights = nightly_rates(accommodation, check_in_date, check_out_date)
+        return Response({
+            'accommodation': accommodation.pk,
+            'check_in_date': check_in_date,
+            'check_out_date': check_out_date,
+            'nights': [{'date': night, 'price_per_night': price} for night, price in nights],
+            'total_price': sum(price for _, price in nights),
+        })
+
+
+class AccommodationRateView(APIView):
+    """
+    ``accommodation/<pk>/rates/``: list (``?start_date=&end_date=``), set
+    (POST a date range) and clear (DELETE with ``?start_date=&end_date=``)
+    the nightly rate overrides of an accommodation.
+    """
+    permission_classes = [CanManageRestaurant]
+
+    def get_object(self, pk):
+        accommodation = get_object_or_404(Accommodation, pk=pk)
+        self.check_object_permissions(self.request, accommodation)
+        return accommodation
+
+    def _range(self, request):
+        serializer = RateRangeSerializer(data=request.query_params, partial=True)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data.get('start_date'), serializer.validated_data.get('end_date')
+
+    def get(self, request, pk):
+        rates = self.get_object(pk).rates.order_by('date')
+        start_date, end_date = self._range(request)
+        if start_date:
+            rates = rates.filter(date__gte=start_date)
+        if end_date:
+            rates = rates.filter(date__lte=end_date)
+        return Response(AccommodationRateSerializer(rates, many=True).data)
+
+    def post(self, request, pk):
+        accommodation = self.get_object(pk)
+        serializer = RateRangeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        count = set_rates(accommodation, **serializer.validated_data)
+        return Response({'rates_set': count}, status=status.HTTP_201_CREATED)
+
+    def delete(self, request, pk):
+        accommodation = self.get_object(pk)
+        start_date, end_date = self._range(request)
+        if not (start_date and end_date):
+            raise ValidationError({"start_date": "start_date and end_date are required."})
+        clear_rates(accommodation, start_date, end_date)
+        return Response(status=status.HTTP_204_NO_CONTENT)
 
-from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
-from foodie_app.models import Booking
-from foodie_app.serializer import BookingSerializer
 
 class BookingListCreateView(generics.ListCreateAPIView):
-    queryset = Booking.objects.all()
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_queryset(self):
+        # Newest stay first, matching the (user, -check_in_date) index
+        return Booking.objects.filter(user=self.request.user).order_by('-check_in_date')
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.instance = book(self.request.user, **serializer.validated_data)
 
 class BookingRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Booking.objects.all()
     serializer_class = BookingSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         return Booking.objects.filter(user=self.request.user)
 
+    def perform_update(self, serializer):
+        update_booking(serializer.instance, **serializer.validated_data)
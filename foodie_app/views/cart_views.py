@@ -1,55 +1,26 @@
+from django.db import transaction
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import permissions, status
-from foodie_app.models import Cart, CartItem, Food
+from rest_framework.exceptions import NotFound
+from foodie_app.models import Cart
 from foodie_app.serializer import CartSerializer
+from foodie_app.services.cart_service import get_cart, parse_cart_lines, remove_cart_item, upsert_cart_items
 from django.shortcuts import get_object_or_404
 
 class CartCreateOrUpdateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
-        cart_items_data = request.data.get('cart_items', [])
+        lines = parse_cart_lines(request.data.get('cart_items', []))
 
-        if not isinstance(cart_items_data, list):
-            return Response({"detail": "Cart items must be a list."}, status=status.HTTP_400_BAD_REQUEST)
+        # A rejected sync must not leave a new, empty cart behind
+        with transaction.atomic():
+            cart, created = Cart.objects.get_or_create(user=request.user)
 
-        if not cart_items_data:
-            return Response({"detail": "At least one cart item is required."}, status=status.HTTP_400_BAD_REQUEST)
+            # Upsert every cart item in a single statement
+            cart = upsert_cart_items(cart, lines)
 
-        # Get or create a cart for the user
-        cart, created = Cart.objects.get_or_create(user=request.user)
-
-        # Handle cart items
-        for item in cart_items_data:
-            food_id = item.get('food_id')
-            quantity = item.get('quantity')
-
-            if not food_id or not quantity:
-                return Response({"detail": "Each cart item must include food_id and quantity."}, status=status.HTTP_400_BAD_REQUEST)
-
-            # Retrieve the food item
-            food = get_object_or_404(Food, id=food_id)
-
-            if quantity <= 0:
-                return Response({"detail": "Quantity must be a positive integer."}, status=status.HTTP_400_BAD_REQUEST)
-
-            # Calculate price
-            price = food.price
-
-            # Create or update the cart item
-            CartItem.objects.update_or_create(
-                cart=cart,
-                food=food,
-                defaults={'quantity': quantity, 'price': price}
-            )
-
-        # Update total price
-        total_price = sum(item.quantity * item.price for item in cart.items.all())
-        cart.total_price = total_price
-        cart.save()
-
-        # Serialize and return the cart
         cart_serializer = CartSerializer(cart)
         return Response(cart_serializer.data, status=status.HTTP_201_CREATED)
 
@@ -58,48 +29,21 @@ class CartRetrieveView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request):
-        cart = get_object_or_404(Cart, user=request.user)
+        try:
+            cart = get_cart(user=request.user)
+        except Cart.DoesNotExist:
+            raise NotFound("Cart not found.")
         serializer = CartSerializer(cart)
         return Response(serializer.data)
 
 class CartUpdateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def put(self, request):
-        cart_items_data = request.data.get('cart_items', [])
-
-        if not isinstance(cart_items_data, list):
-            return Response({"detail": "Cart items must be a list."}, status=status.HTTP_400_BAD_REQUEST)
-
-        if not cart_items_data:
-            return Response({"detail": "At least one cart item is required."}, status=status.HTTP_400_BAD_REQUEST)
+    def put(self, request, *args, **kwargs):
+        lines = parse_cart_lines(request.data.get('cart_items', []))
 
         cart = get_object_or_404(Cart, user=request.user)
-        total_price = 0
-
-        for item in cart_items_data:
-            food_id = item.get('food_id')
-            quantity = item.get('quantity')
-
-            if not food_id or not quantity:
-                return Response({"detail": "Each cart item must include food_id and quantity."}, status=status.HTTP_400_BAD_REQUEST)
-
-            food = get_object_or_404(Food, id=food_id)
-
-            if quantity <= 0:
-                return Response({"detail": "Quantity must be a positive integer."}, status=status.HTTP_400_BAD_REQUEST)
-
-            price = food.price
-            total_price += price * quantity
-
-            CartItem.objects.update_or_create(
-                cart=cart,
-                food=food,
-                defaults={'quantity': quantity, 'price': price}
-            )
-
-        cart.total_price = total_price
-        cart.save()
+        cart = upsert_cart_items(cart, lines)
 
         cart_serializer = CartSerializer(cart)
         return Response(cart_serializer.data, status=status.HTTP_200_OK)
@@ -107,7 +51,7 @@ class CartUpdateView(APIView):
 class CartDeleteView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
-    def delete(self, request):
+    def delete(self, request, pk):
         cart = get_object_or_404(Cart, user=request.user)
-        cart.cartitem_set.all().delete()  # Remove all cart items
+        remove_cart_item(cart, pk)
         return Response(status=status.HTTP_204_NO_CONTENT)
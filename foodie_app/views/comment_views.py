@@ -0,0 +1,51 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import generics, permissions
+from foodie_app.models import Comments, Post, Story
+from foodie_app.pagination import CommentCursorPagination
+from foodie_app.serializer import CommentSerializer
+
+
+class CommentListCreateView(generics.ListCreateAPIView):
+    """Comment thread of the post or story named by ``target_field``."""
+    serializer_class = CommentSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CommentCursorPagination
+    target_field = None
+
+    def get_target_queryset(self):
+        raise NotImplementedError
+
+    def get_target(self):
+        return get_object_or_404(self.get_target_queryset().only('id'), pk=self.kwargs['pk'])
+
+    def get_queryset(self):
+        return Comments.objects.filter(**{self.target_field: self.get_target()})
+
+    def perform_create(self, serializer):
+        serializer.save(author=self.request.user, **{self.target_field: self.get_target()})
+
+
+class PostCommentListCreateView(CommentListCreateView):
+    target_field = 'post'
+
+    def get_target_queryset(self):
+        return Post.objects.all()
+
+
+class StoryCommentListCreateView(CommentListCreateView):
+    target_field = 'story'
+
+    def get_target_queryset(self):
+        return Story.objects.active()
+
+
+class CommentRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
+    queryset = Comments.objects.all()
+    serializer_class = CommentSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self):
+        comment = super().get_object()
+        if self.request.method not in permissions.SAFE_METHODS and comment.author_id != self.request.user.pk:
+            self.permission_denied(self.request)
+        return comment
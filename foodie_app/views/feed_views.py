@@ -0,0 +1,31 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.utils.urls import replace_query_param
+from foodie_app.serializer import PostSerializer
+from foodie_app.services.feed_service import get_feed_page
+
+
+class HomeFeedView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    page_size = 20
+    max_page_size = 100
+
+    def get(self, request):
+        try:
+            page_size = min(int(request.query_params.get('page_size', self.page_size)), self.max_page_size)
+        except ValueError:
+            raise ValidationError({"page_size": "Page size must be an integer."})
+        if page_size <= 0:
+            raise ValidationError({"page_size": "Page size must be a positive integer."})
+
+        posts, next_cursor = get_feed_page(request.user, request.query_params.get('cursor'), page_size)
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+
+        return Response({
+            'next': next_url,
+            'results': PostSerializer(posts, many=True, context={'request': request}).data,
+        })
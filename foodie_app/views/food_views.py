@@ -1,44 +1,101 @@
+from decimal import Decimal, InvalidOperation
 from rest_framework import generics, permissions
-from rest_framework.exceptions import PermissionDenied
-from foodie_app.models import Food
+from rest_framework.exceptions import ValidationError
+from foodie_app.async_views import AsyncListAPIView
+from foodie_app.menu_cache import ALL_MENUS, AsyncMenuCacheMixin, MenuCacheMixin, bump_food_versions, food_scope, menu_scope
+from foodie_app.models import Food, FOOD_CATEGORY_CHOICES
+from foodie_app.pagination import FoodCatalogPagination
+from foodie_app.permissions import CanManageRestaurant, check_can_manage_restaurant
 from foodie_app.serializer import FoodSerializer
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def _is_id(value):
+    # str.isdigit() alone accepts digits such as '²' that int() rejects
+    return value.isascii() and value.isdigit()
+
+
 class FoodCreateView(generics.CreateAPIView):
     queryset = Food.objects.all()
     serializer_class = FoodSerializer
     permission_classes = [permissions.IsAuthenticated]
     
-    def perform_update(self, serializer):
-        user = self.request.user
-        food = self.get_object()
-        if not (user == food.restaurant.owner or user in food.restaurant.managers.all()):
-            raise PermissionDenied("You do not have permission to update this food item.")
+    def perform_create(self, serializer):
+        restaurant = serializer.validated_data['restaurant']
+        check_can_manage_restaurant(
+            self.request, restaurant.id, "You do not have permission to add food items to this restaurant."
+        )
         serializer.save()
 
-class FoodListView(generics.ListAPIView):
-    queryset = Food.objects.all()
+class FoodListView(AsyncMenuCacheMixin, AsyncListAPIView):
     serializer_class = FoodSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = FoodCatalogPagination
+
+    def get_cache_scope(self):
+        restaurant = self.request.query_params.get('restaurant')
+        if restaurant is not None and _is_id(restaurant):
+            return menu_scope(int(restaurant))
+        return ALL_MENUS
+
+    def get_queryset(self):
+        params = self.request.query_params
+        errors = {}
+
+        restaurant = params.get('restaurant')
+        if restaurant is not None and not _is_id(restaurant):
+            errors['restaurant'] = "Restaurant must be an integer id."
+
+        category = params.get('category')
+        if category is not None and category not in dict(FOOD_CATEGORY_CHOICES):
+            errors['category'] = f"Category must be one of: {', '.join(dict(FOOD_CATEGORY_CHOICES))}."
 
-class FoodDetailView(generics.RetrieveAPIView):
+        prices = {}
+        for param in ('min_price', 'max_price'):
+            if params.get(param) is None:
+                continue
+            try:
+                prices[param] = Decimal(params[param])
+            except InvalidOperation:
+                errors[param] = "Price must be a decimal number."
+                continue
+            if not prices[param].is_finite():
+                errors[param] = "Price must be a decimal number."
+
+        if errors:
+            raise ValidationError(errors)
+
+        return Food.objects.catalog(
+            restaurant=int(restaurant) if restaurant is not None else None,
+            category=category,
+            **prices
+        )
+
+class FoodDetailView(MenuCacheMixin, generics.RetrieveAPIView):
     queryset = Food.objects.all()
     serializer_class = FoodSerializer
     permission_classes = [permissions.AllowAny]
+
+    def get_cache_scope(self):
+        return food_scope(self.kwargs['pk'])
+
 class FoodUpdateView(generics.UpdateAPIView):
     queryset = Food.objects.all()
     serializer_class = FoodSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [CanManageRestaurant]
 
     def perform_update(self, serializer):
-        user = self.request.user
-        food = self.get_object()
-        if not (user == food.restaurant.owner or user in food.restaurant.managers.all()):
-            logger.warning(f"Unauthorized update attempt by user: {user.username} on food item: {food.id}")
-            raise PermissionDenied("You do not have permission to update this food item.")
-        serializer.save()
+        previous_restaurant_id = serializer.instance.restaurant_id
+        restaurant = serializer.validated_data.get('restaurant')
+        if restaurant is not None and restaurant.id != previous_restaurant_id:
+            check_can_manage_restaurant(
+                self.request, restaurant.id, "You do not have permission to move food items to this restaurant."
+            )
+        food = serializer.save()
+        # The food may have moved to another restaurant, so bump the old menu too
+        bump_food_versions(food, previous_restaurant_id)
         logger.info(f"Food item updated successfully: {food.id}")
 
 # class FoodUpdateView(generics.UpdateAPIView):
@@ -62,12 +119,8 @@ class FoodUpdateView(generics.UpdateAPIView):
 class FoodDeleteView(generics.DestroyAPIView):
     queryset = Food.objects.all()
     serializer_class = FoodSerializer
-    permission_classes = [permissions.IsAuthenticated]
+    permission_classes = [CanManageRestaurant]
 
     def perform_destroy(self, instance):
-        user = self.request.user
-        if not (user == instance.restaurant.owner or user in instance.restaurant.managers.all()):
-            logger.warning(f"Unauthorized delete attempt by user: {user.username} on food item: {instance.id}")
-            raise PermissionDenied("You do not have permission to delete this food item.")
         instance.delete()
         logger.info(f"Food item deleted successfully: {instance.id}")
\ No newline at end of file
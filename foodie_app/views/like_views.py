@@ -0,0 +1,29 @@
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from foodie_app.models import Post, Story
+from foodie_app.services.like_service import toggle_like
+
+
+class LikeToggleView(APIView):
+    """POST likes the object, or unlikes it if the user already liked it."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        raise NotImplementedError
+
+    def post(self, request, pk):
+        obj = get_object_or_404(self.get_queryset(), pk=pk)
+        liked, likes = toggle_like(request.user, obj)
+        return Response({'liked': liked, 'likes': likes}, status=status.HTTP_200_OK)
+
+
+class PostLikeToggleView(LikeToggleView):
+    def get_queryset(self):
+        return Post.objects.only('id', 'likes')
+
+
+class StoryLikeToggleView(LikeToggleView):
+    def get_queryset(self):
+        return Story.objects.active().only('id', 'likes')
@@ -0,0 +1,20 @@
+from django.conf import settings
+from django.http import Http404
+from django.views.static import serve
+from foodie_app.storage import BLOB_DIR, is_hashed_name
+
+
+def serve_media(request, path):
+    """
+    Serve ``MEDIA_ROOT`` files during development, with the cache headers the
+    production web server should send: content-addressed names are immutable,
+    so they get far-future cache headers; legacy names are only cached briefly.
+    """
+    if path.startswith(f'{BLOB_DIR}/'):
+        raise Http404
+    response = serve(request, path, document_root=settings.MEDIA_ROOT)
+    if is_hashed_name(path):
+        response['Cache-Control'] = f'public, max-age={settings.MEDIA_CACHE_MAX_AGE}, immutable'
+    else:
+        response['Cache-Control'] = 'public, max-age=3600'
+    return response
@@ -1,66 +1,33 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework import permissions, status
-from foodie_app.models import Order, Food, OrderItem
+from rest_framework import generics, permissions, status
+from foodie_app.models import Order
+from foodie_app.pagination import OrderCursorPagination
+from foodie_app.query_budget import QueryBudgetMixin
 from foodie_app.serializer import OrderSerializer
+from foodie_app.services.order_service import parse_order_lines, place_order
 from django.shortcuts import get_object_or_404
 
 class OrderCreateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
-        # Get the list of order items from the request data
-        order_items_data = request.data.get('order_items', [])
+        # Validate the order items before touching the database
+        lines = parse_order_lines(request.data.get('order_items', []))
 
-        # Validate that order_items_data is a list
-        if not isinstance(order_items_data, list):
-            return Response({"detail": "Order items must be a list."}, status=status.HTTP_400_BAD_REQUEST)
-        
-        # Ensure there is at least  one order item
-        if not order_items_data:
-            return Response({"detail": "At least one order item is required."}, status=status.HTTP_400_BAD_REQUEST)
-
-        # Initialize total price
-        total_price = 0
-        
-        # Create a new Order instance but do not save yet
         order_serializer = OrderSerializer(data=request.data)
         if order_serializer.is_valid():
-            # Calculate total price
-            for item in order_items_data:
-                food_id = item.get('food_id')
-                quantity = item.get('quantity')
-
-                # Validate food existence
-                food = get_object_or_404(Food, id=food_id)
-
-                # Validate quantity
-                if quantity <= 0:
-                    return Response({"detail": "Quantity must be a positive integer."}, status=status.HTTP_400_BAD_REQUEST)
-
-                # Calculate price
-                price = food.price
-                total_price += price * quantity
-
-            # Save the order with the total price
-            order = order_serializer.save(user=request.user, total_price=total_price)
-
-            # Create OrderItem instances
-            for item in order_items_data:
-                food_id = item.get('food_id')
-                quantity = item.get('quantity')
-                food = get_object_or_404(Food, id=food_id)
-                price = food.price
-                
-                OrderItem.objects.create(
-                    order=order,
-                    food=food,
-                    quantity=quantity,
-                    price=price
-                )
-            
-            # Return the serialized order data
-            return Response(order_serializer.data, status=status.HTTP_201_CREATED)
+            # Resolve foods, create the order and its items in one transaction
+            order = place_order(
+                request.user,
+                order_serializer.validated_data.pop('restaurant'),
+                lines,
+                **order_serializer.validated_data
+            )
+
+            # Re-read the order with its restaurant, items and foods in two queries
+            order = Order.objects.with_items().get(pk=order.pk)
+            return Response(OrderSerializer(order).data, status=status.HTTP_201_CREATED)
 
         return Response(order_serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -69,12 +36,12 @@ class OrderRetrieveUpdateDestroyView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, order_id):
-        order = get_object_or_404(Order, id=order_id, user=request.user)
+        order = get_object_or_404(Order.objects.with_items(), id=order_id, user=request.user)
         serializer = OrderSerializer(order)
         return Response(serializer.data)
 
     def put(self, request, order_id):
-        order = get_object_or_404(Order, id=order_id, user=request.user)
+        order = get_object_or_404(Order.objects.with_items(), id=order_id, user=request.user)
         serializer = OrderSerializer(order, data=request.data)
         if serializer.is_valid():
             serializer.save()
@@ -87,11 +54,13 @@ class OrderRetrieveUpdateDestroyView(APIView):
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
-class OrderListView(APIView):
+class OrderListView(QueryBudgetMixin, generics.ListAPIView):
+    serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = OrderCursorPagination
+    # User lookup, one page of orders with restaurants, their items with foods
+    query_budget = 3
 
-    def get(self, request):
-        # Retrieve all orders related to the currently logged-in user
-        orders = Order.objects.filter(user=request.user)
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data)
+    def get_queryset(self):
+        # Retrieve the orders related to the currently logged-in user, newest first
+        return Order.objects.filter(user=self.request.user).with_items()
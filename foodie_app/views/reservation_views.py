@@ -1,8 +1,14 @@
+from datetime import date
 from rest_framework import generics, permissions
 from rest_framework.authentication import TokenAuthentication
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from foodie_app.models import Reservation
 from foodie_app.serializer import ReservationSerializer
-from rest_framework.exceptions import PermissionDenied
+from foodie_app.services.reservation_service import (
+    available_slots, cancel_reservation, reserve, update_reservation,
+)
+from rest_framework.exceptions import PermissionDenied, ValidationError
 
 class ReservationListCreateAPIView(generics.ListCreateAPIView):
     serializer_class = ReservationSerializer
@@ -17,9 +23,10 @@ class ReservationListCreateAPIView(generics.ListCreateAPIView):
 
     def perform_create(self, serializer):
         """
-        Save the user as the author of the reservation.
+        Book the seats in the requested slot and save the user as the author
+        of the reservation.
         """
-        serializer.save(user=self.request.user)
+        serializer.instance = reserve(self.request.user, **serializer.validated_data)
 
 class ReservationRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ReservationSerializer
@@ -40,3 +47,22 @@ class ReservationRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIV
         if obj.user != self.request.user:
             raise PermissionDenied("You do not have permission to access this reservation.")
         return obj
+
+    def perform_update(self, serializer):
+        update_reservation(serializer.instance, **serializer.validated_data)
+
+    def perform_destroy(self, instance):
+        cancel_reservation(instance)
+
+
+class ReservationAvailabilityView(APIView):
+    """``GET restaurants/<pk>/availability/?date=YYYY-MM-DD[&type=...]``: open slots of the day."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            day = date.fromisoformat(request.query_params.get('date', ''))
+        except ValueError:
+            raise ValidationError({"date": "Use the YYYY-MM-DD format."})
+        slots = available_slots(pk, day, request.query_params.get('type'))
+        return Response({'date': day, 'slots': slots})
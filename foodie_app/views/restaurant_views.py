@@ -1,23 +1,49 @@
-from rest_framework import generics, permissions, status
-from rest_framework.exceptions import PermissionDenied
-from rest_framework.response import Response
+from rest_framework import generics, permissions
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
-from foodie_app.models import Restaurant, Manager
-from foodie_app.serializer import RestaurantSerializer, ManagerSerializer
+from foodie_app.async_views import AsyncListAPIView, AsyncRetrieveAPIView
+from foodie_app.menu_cache import AsyncMenuCacheMixin, restaurant_scope
+from foodie_app.models import Restaurant, RestaurantReview
+from foodie_app.pagination import RestaurantCursorPagination, ReviewCursorPagination
+from foodie_app.permissions import CanManageRestaurant
+from foodie_app.serializer import RestaurantSerializer, RestaurantReviewSerializer, ManagerSerializer
 import logging
 
 logger = logging.getLogger(__name__)
 
-class RestaurantListView(generics.ListAPIView):
-    queryset = Restaurant.objects.all()
+RESTAURANT_ORDERINGS = {
+    'id': ('id',),
+    'name': ('name', 'id'),
+    # Matches the (city, -rating_average, -rating_count, id) index
+    'rating': ('-rating_average', '-rating_count', 'id'),
+}
+
+class RestaurantListView(AsyncListAPIView):
     serializer_class = RestaurantSerializer
     permission_classes = [permissions.AllowAny]
+    pagination_class = RestaurantCursorPagination
+
+    def get_ordering(self):
+        ordering = self.request.query_params.get('ordering', 'id')
+        if ordering not in RESTAURANT_ORDERINGS:
+            raise ValidationError({"ordering": f"Ordering must be one of: {', '.join(RESTAURANT_ORDERINGS)}."})
+        return RESTAURANT_ORDERINGS[ordering]
+
+    def get_queryset(self):
+        restaurants = Restaurant.objects.all()
+        city = self.request.query_params.get('city')
+        if city:
+            restaurants = restaurants.filter(city=city)
+        return restaurants
 
-class RestaurantDetailView(generics.RetrieveAPIView):
+class RestaurantDetailView(AsyncMenuCacheMixin, AsyncRetrieveAPIView):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
     permission_classes = [permissions.AllowAny]
 
+    def get_cache_scope(self):
+        return restaurant_scope(self.kwargs['pk'])
+
 class RestaurantCreateView(generics.CreateAPIView):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
@@ -36,24 +62,12 @@ class RestaurantCreateView(generics.CreateAPIView):
 class RestaurantUpdateView(generics.UpdateAPIView):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
-    permission_classes = [IsAuthenticated]
-
-    def put(self, request, *args, **kwargs):
-        restaurant = self.get_object()
-        if request.user != restaurant.owner and not Manager.objects.filter(user=request.user, restaurant=restaurant).exists():
-            return Response({"detail": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN)
-        return self.update(request, *args, **kwargs)
+    permission_classes = [CanManageRestaurant]
 
 class RestaurantDeleteView(generics.DestroyAPIView):
     queryset = Restaurant.objects.all()
     serializer_class = RestaurantSerializer
-    permission_classes = [IsAuthenticated]
-
-    def delete(self, request, *args, **kwargs):
-        restaurant = self.get_object()
-        if request.user != restaurant.owner and not Manager.objects.filter(user=request.user, restaurant=restaurant).exists():
-            return Response({"detail": "You do not have permission to perform this action."}, status=status.HTTP_403_FORBIDDEN)
-        return self.destroy(request, *args, **kwargs)
+    permission_classes = [CanManageRestaurant]
 
 class ManagerCreateView(generics.CreateAPIView):
     serializer_class = ManagerSerializer
@@ -64,3 +78,26 @@ class ManagerCreateView(generics.CreateAPIView):
         if self.request.user != restaurant.owner:
             raise PermissionDenied("You can only add managers to restaurants you own.")
         serializer.save()
+
+class RestaurantReviewListCreateView(generics.ListCreateAPIView):
+    serializer_class = RestaurantReviewSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = ReviewCursorPagination
+
+    def get_queryset(self):
+        return RestaurantReview.objects.filter(restaurant_id=self.kwargs['pk'])
+
+    def perform_create(self, serializer):
+        restaurant = generics.get_object_or_404(Restaurant, pk=self.kwargs['pk'])
+        serializer.save(user=self.request.user, restaurant=restaurant)
+
+class RestaurantReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
+    queryset = RestaurantReview.objects.all()
+    serializer_class = RestaurantReviewSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_object(self):
+        review = super().get_object()
+        if review.user_id != self.request.user.id:
+            self.permission_denied(self.request)
+        return review
@@ -0,0 +1,41 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import permissions
+from rest_framework.exceptions import ValidationError
+from foodie_app.models import Food, Restaurant
+from foodie_app.serializer import FoodSerializer, RestaurantSerializer
+from foodie_app.services.search_service import search
+
+SEARCH_TYPES = {
+    'restaurants': (Restaurant, RestaurantSerializer),
+    'foods': (Food, FoodSerializer),
+}
+
+
+class SearchView(APIView):
+    permission_classes = [permissions.AllowAny]
+    max_limit = 50
+
+    def get(self, request):
+        term = request.query_params.get('q', '').strip()
+        if not term:
+            raise ValidationError({"q": "A search term is required."})
+
+        search_type = request.query_params.get('type', 'all')
+        if search_type != 'all' and search_type not in SEARCH_TYPES:
+            raise ValidationError({"type": f"Type must be one of: all, {', '.join(SEARCH_TYPES)}."})
+
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+        except ValueError:
+            raise ValidationError({"limit": "Limit must be an integer."})
+        if limit <= 0:
+            raise ValidationError({"limit": "Limit must be a positive integer."})
+
+        results = {}
+        for name, (model, serializer_class) in SEARCH_TYPES.items():
+            if search_type in ('all', name):
+                results[name] = serializer_class(
+                    search(model, term, limit), many=True, context={'request': request}
+                ).data
+        return Response(results)